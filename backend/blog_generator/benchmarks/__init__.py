@@ -0,0 +1,3 @@
+"""
+Benchmarks for the vector store and retrieval components.
+"""
@@ -0,0 +1,131 @@
+"""
+Quantized storage benchmark.
+Compares float16 and int8 search matrices (with and without full-precision
+re-ranking) against the float32 baseline on a stored collection, reporting
+resident memory and recall@k.
+
+Usage (from backend/):
+    python -m blog_generator.benchmarks.quantization_benchmark --db vector_db
+    python -m blog_generator.benchmarks.quantization_benchmark --synthetic 20000
+"""
+from typing import Dict, List, Sequence
+from pathlib import Path
+import argparse
+import json
+import logging
+import tempfile
+import time
+
+import numpy as np
+
+from ..retrieval.numpy_backend import NumpyClient
+
+logger = logging.getLogger(__name__)
+
+CONFIGURATIONS = [
+    ("float32", 0),
+    ("float16", 0),
+    ("float16", 4),
+    ("int8", 0),
+    ("int8", 4),
+]
+
+def recall_at_k(results: Sequence[Sequence[str]], truth: Sequence[Sequence[str]]) -> float:
+    """Mean fraction of true top-k ids recovered per query"""
+    if not truth:
+        return 0.0
+    return float(np.mean([
+        len(set(found) & set(expected)) / max(len(expected), 1)
+        for found, expected in zip(results, truth)
+    ]))
+
+def load_collection_embeddings(db_path: Path, collection_name: str) -> np.ndarray:
+    """Read all embeddings of a persisted Chroma collection"""
+    import chromadb
+    from chromadb.config import Settings
+
+    client = chromadb.PersistentClient(path=str(db_path), settings=Settings(anonymized_telemetry=False))
+    records = client.get_collection(collection_name).get(include=["embeddings"])
+    return np.asarray(records["embeddings"], dtype=np.float32)
+
+def synthetic_embeddings(count: int, dim: int = 1536, clusters: int = 64, seed: int = 0) -> np.ndarray:
+    """Clustered random vectors shaped like ada-002 embeddings"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=count)
+    return centers[labels] + rng.normal(scale=0.6, size=(count, dim)).astype(np.float32)
+
+def run_benchmark(embeddings: np.ndarray, k: int = 10, query_count: int = 200,
+                  seed: int = 0) -> List[Dict[str, float]]:
+    """Measure memory and recall@k for each storage configuration
+
+    Queries are stored vectors with small noise added, so every query has
+    meaningful near neighbours in the collection.
+    """
+    rng = np.random.default_rng(seed)
+    ids = [str(i) for i in range(len(embeddings))]
+    sample = rng.choice(len(embeddings), size=min(query_count, len(embeddings)), replace=False)
+    noise_scale = 0.05 * float(np.abs(embeddings).mean())
+    queries = embeddings[sample] + rng.normal(scale=noise_scale, size=embeddings[sample].shape).astype(np.float32)
+
+    rows = []
+    truth = None
+    baseline_bytes = None
+    for storage, rerank_factor in CONFIGURATIONS:
+        with tempfile.TemporaryDirectory() as directory:
+            client = NumpyClient(directory, storage=storage, rerank_factor=rerank_factor)
+            collection = client.get_or_create_collection("benchmark")
+            collection.add(ids=ids, embeddings=embeddings)
+
+            start = time.perf_counter()
+            results = collection.query(query_embeddings=queries, n_results=k)["ids"]
+            elapsed = time.perf_counter() - start
+
+            memory = collection.memory_usage()
+            if truth is None:
+                truth, baseline_bytes = results, memory["search_bytes"]
+            rows.append({
+                "storage": storage,
+                "rerank_factor": rerank_factor,
+                "search_bytes": memory["search_bytes"],
+                "memory_saved": 1.0 - memory["search_bytes"] / baseline_bytes,
+                f"recall@{k}": recall_at_k(results, truth),
+                "ms_per_query": 1000 * elapsed / len(queries)
+            })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=str(Path(__file__).parent.parent / "vector_db"),
+                        help="Persisted Chroma directory")
+    parser.add_argument("--collection", default="research_sections")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Benchmark N synthetic vectors instead of a stored collection")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        embeddings = synthetic_embeddings(args.synthetic)
+        source = f"synthetic ({args.synthetic} vectors)"
+    else:
+        embeddings = load_collection_embeddings(Path(args.db), args.collection)
+        source = f"{args.collection} in {args.db}"
+    if len(embeddings) == 0:
+        raise SystemExit(f"No embeddings found in {source}")
+
+    rows = run_benchmark(embeddings, k=args.k, query_count=args.queries)
+
+    print(f"\nQuantization benchmark: {source}, dim={embeddings.shape[1]}, k={args.k}")
+    print(f"{'storage':<8} {'rerank':>6} {'MB':>9} {'saved':>7} {'recall':>7} {'ms/query':>9}")
+    for row in rows:
+        print(f"{row['storage']:<8} {row['rerank_factor']:>6} {row['search_bytes'] / 1e6:>9.2f} "
+              f"{row['memory_saved']:>7.1%} {row[f'recall@{args.k}']:>7.3f} {row['ms_per_query']:>9.3f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"source": source, "k": args.k, "results": rows}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+VectorStore benchmark suite.
+Measures ingest throughput, query latency percentiles, memory per 10k
+vectors and recall@k against exact search, for each backend, embedder and
+collection size. Runs offline: the "hashing" embedder is a deterministic
+feature-hashing stand-in, and "minilm" uses a locally cached
+SentenceTransformer (skipped when it cannot be loaded).
+
+Results are written as JSON keyed by (backend, embedder, size) so two runs
+can be diffed with --compare.
+
+Usage (from backend/):
+    python -m blog_generator.benchmarks.vector_store_benchmark --sizes 1000 10000 --json bench.json
+    python -m blog_generator.benchmarks.vector_store_benchmark --compare bench.json --json new.json
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+from pathlib import Path
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import zlib
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from ..retrieval import MODEL_REGISTRY
+from ..retrieval.sparse_index import tokenize
+from ..vector_store import Document, VectorStore
+from .quantization_benchmark import recall_at_k
+
+logger = logging.getLogger(__name__)
+
+HASHING_MODEL = "benchmark-hashing-384"
+MINILM_MODEL = "all-MiniLM-L6-v2"
+EMBEDDERS = {"hashing": HASHING_MODEL, "minilm": MINILM_MODEL}
+BACKENDS = ("numpy", "chroma")
+
+# Metrics where a larger value is an improvement
+HIGHER_IS_BETTER = {"ingest_docs_per_second", "recall_at_k"}
+
+_TOPICS = ["metaphor", "meter", "grief", "ocean", "memory", "light", "city", "silence",
+           "winter", "machine", "garden", "mother", "war", "river", "prayer", "glass"]
+_FILLER = ["the", "a", "of", "and", "in", "poem", "line", "image", "voice", "turn",
+           "stanza", "speaker", "reader", "form", "sound", "close", "reading", "theme"]
+
+class HashingEmbedder:
+    """Deterministic feature-hashing embedder with the SentenceTransformer encode interface"""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, texts: Sequence[str], batch_size: Optional[int] = None, **kwargs) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                digest = zlib.crc32(token.encode("utf-8"))
+                vectors[row, digest % self.dim] += 1.0 if digest & 0x10000 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+def synthetic_corpus(count: int, seed: int = 0) -> List[Document]:
+    """Section-like documents mixing a few topic words with filler"""
+    rng = np.random.default_rng(seed)
+    documents = []
+    for i in range(count):
+        topics = rng.choice(_TOPICS, size=3, replace=False)
+        words = list(rng.choice(topics, size=12)) + list(rng.choice(_FILLER, size=28))
+        rng.shuffle(words)
+        documents.append(Document(
+            content=" ".join(words),
+            metadata={"section_type": ("technical", "core_analysis", "subtextual")[i % 3]},
+            id=f"doc{i}"
+        ))
+    return documents
+
+def synthetic_queries(documents: Sequence[Document], count: int, seed: int = 0) -> List[str]:
+    """Queries built by dropping words from sampled documents"""
+    rng = np.random.default_rng(seed + 1)
+    queries = []
+    for index in rng.choice(len(documents), size=min(count, len(documents)), replace=False):
+        words = documents[index].content.split()
+        keep = rng.random(len(words)) > 0.3
+        queries.append(" ".join(word for word, kept in zip(words, keep) if kept))
+    return queries
+
+def exact_top_k(embeddings: np.ndarray, queries: np.ndarray, ids: Sequence[str], k: int) -> List[List[str]]:
+    """Ground-truth cosine top-k by brute force"""
+    def normalize(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    scores = normalize(queries) @ normalize(embeddings).T
+    top = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    return [[ids[i] for i in row] for row in top]
+
+def resident_bytes() -> int:
+    """Current resident set size, falling back to the peak where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def load_embedder(name: str) -> bool:
+    """Make an embedder available to VectorStore, returning False if it cannot be loaded offline"""
+    if name == "hashing":
+        MODEL_REGISTRY.register(HASHING_MODEL, HashingEmbedder(), SentenceTransformer)
+        return True
+    try:
+        MODEL_REGISTRY.get(EMBEDDERS[name], SentenceTransformer)
+    except Exception as e:
+        logger.warning(f"Skipping embedder {name}: {e}")
+        return False
+    return True
+
+def benchmark_configuration(backend: str, embedder: str, size: int, k: int = 10,
+                            query_count: int = 200, seed: int = 0) -> Dict[str, float]:
+    """Ingest a synthetic corpus into a fresh store and measure it
+
+    Returns:
+        One result row: throughput, latency percentiles (ms), memory and recall@k
+    """
+    documents = synthetic_corpus(size, seed)
+    queries = synthetic_queries(documents, query_count, seed)
+    with tempfile.TemporaryDirectory() as directory:
+        store = VectorStore(persist_directory=directory, model_name=EMBEDDERS[embedder], backend=backend,
+                            query_cache_size=0, keyword_index=False)
+        try:
+            rss_before = resident_bytes()
+            ingest = store.add_documents_bulk(documents)
+            rss_delta = max(resident_bytes() - rss_before, 0)
+
+            query_embeddings = store.embed(queries)
+            truth = exact_top_k(store.embed([doc.content for doc in documents]), query_embeddings,
+                                [doc.id for doc in documents], k)
+            store.query_many(queries[:5], k=k)
+
+            latencies, found = [], []
+            for query in queries:
+                start = time.perf_counter()
+                hits = store.query_many([query], k=k)[0]
+                latencies.append(1000 * (time.perf_counter() - start))
+                found.append([hit["id"] for hit in hits])
+
+            index_bytes = None
+            if backend == "numpy":
+                index_bytes = store.research_collection.memory_usage()["search_bytes"]
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            return {
+                "backend": backend,
+                "embedder": embedder,
+                "size": size,
+                "dim": int(query_embeddings.shape[1]),
+                "ingest_docs_per_second": ingest["docs_per_second"],
+                "query_p50_ms": float(p50),
+                "query_p95_ms": float(p95),
+                "query_p99_ms": float(p99),
+                "rss_bytes_per_10k": rss_delta * 10_000 / size,
+                "index_bytes_per_10k": index_bytes * 10_000 / size if index_bytes is not None else None,
+                "recall_at_k": recall_at_k(found, truth),
+                "k": k
+            }
+        finally:
+            store.close()
+
+def run_benchmark(sizes: Sequence[int] = (1000, 10000), backends: Sequence[str] = BACKENDS,
+                  embedders: Sequence[str] = ("hashing", "minilm"), k: int = 10,
+                  query_count: int = 200, seed: int = 0) -> Dict:
+    """Benchmark every (backend, embedder, size) combination
+
+    Returns:
+        Machine-readable report with environment details and one row per configuration
+    """
+    rows, skipped = [], []
+    for embedder in embedders:
+        if not load_embedder(embedder):
+            skipped.append(embedder)
+            continue
+        for backend in backends:
+            for size in sizes:
+                logger.info(f"Benchmarking {backend}/{embedder} with {size} documents")
+                rows.append(benchmark_configuration(backend, embedder, size, k, query_count, seed))
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "config": {"sizes": list(sizes), "k": k, "queries": query_count, "seed": seed},
+        "skipped_embedders": skipped,
+        "results": rows
+    }
+
+def compare_results(baseline: Dict, current: Dict, tolerance: float = 0.1) -> List[Dict]:
+    """Diff two reports, flagging metrics that got worse by more than tolerance
+
+    Returns:
+        One entry per shared (backend, embedder, size, metric) with the
+        relative change and whether it is a regression
+    """
+    def keyed(report) -> Dict[Tuple, Dict]:
+        return {(row["backend"], row["embedder"], row["size"]): row for row in report["results"]}
+
+    before, after = keyed(baseline), keyed(current)
+    changes = []
+    for key in sorted(before.keys() & after.keys()):
+        for metric, old in before[key].items():
+            new = after[key].get(metric)
+            if metric in ("backend", "embedder", "size", "dim", "k") or old is None or new is None or old == 0:
+                continue
+            change = (new - old) / abs(old)
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            changes.append({
+                "backend": key[0],
+                "embedder": key[1],
+                "size": key[2],
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change": change,
+                "regression": worse > tolerance
+            })
+    return changes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--embedders", nargs="+", choices=sorted(EMBEDDERS), default=["hashing", "minilm"])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON report to diff against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Relative change counted as a regression")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.sizes, args.backends, args.embedders, args.k, args.queries)
+
+    print(f"\nVectorStore benchmark, k={args.k}, {args.queries} queries")
+    print(f"{'backend':<7} {'embedder':<8} {'size':>7} {'docs/s':>9} {'p50 ms':>7} {'p95 ms':>7} "
+          f"{'p99 ms':>7} {'MB/10k':>7} {'recall':>7}")
+    for row in report["results"]:
+        memory = row["index_bytes_per_10k"] or row["rss_bytes_per_10k"]
+        print(f"{row['backend']:<7} {row['embedder']:<8} {row['size']:>7} {row['ingest_docs_per_second']:>9.0f} "
+              f"{row['query_p50_ms']:>7.2f} {row['query_p95_ms']:>7.2f} {row['query_p99_ms']:>7.2f} "
+              f"{memory / 1e6:>7.1f} {row['recall_at_k']:>7.3f}")
+    for embedder in report["skipped_embedders"]:
+        print(f"Skipped embedder {embedder}: model not available offline")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            changes = compare_results(json.load(f), report, args.tolerance)
+        regressions = [change for change in changes if change["regression"]]
+        for change in regressions:
+            print(f"REGRESSION {change['backend']}/{change['embedder']}/{change['size']} {change['metric']}: "
+                  f"{change['baseline']:.4g} -> {change['current']:.4g} ({change['change']:+.1%})")
+        print(f"{len(regressions)} regressions across {len(changes)} compared metrics")
+        if regressions:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,12 @@ from enum import Enum
 import json
 import dotenv
 import asyncio
+import time
 import openai
-import google.generativeai as genai
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
+
+from .pipeline.gemini import gemini_adapter
+from .pipeline.rate_limiter import estimate_tokens, rate_limiter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,17 +41,18 @@ class LLMOrchestrator:
     def __init__(self):
         """Initialize the LLM orchestrator."""
         try:
-            self.openai_client = openai.OpenAI()
-            self.claude_client = Anthropic()
+            # Async clients so concurrent sections share the event loop instead of blocking it;
+            # SDK retries are off because the shared rate limiter owns retries
+            self.openai_client = openai.AsyncOpenAI(max_retries=0)
+            self.claude_client = AsyncAnthropic(max_retries=0)
+            self.rate_limiter = rate_limiter
             
-            # Initialize Gemini with API key
-            gemini_api_key = os.getenv("GEMINI_API_KEY")
-            if gemini_api_key:
-                genai.configure(api_key=gemini_api_key)
-                self.gemini_client = genai.GenerativeModel('gemini-pro')
+            # Gemini goes through the shared adapter, which caches the model and applies the rate limits
+            if os.getenv("GEMINI_API_KEY"):
+                self.gemini = gemini_adapter
             else:
                 logger.warning("GEMINI_API_KEY not set - Gemini generation will be unavailable")
-                self.gemini_client = None
+                self.gemini = None
                 
         except Exception as e:
             logger.error(f"Error initializing LLM clients: {str(e)}")
@@ -71,12 +75,16 @@ Example: "Recent research by Smith and Johnson (2023) found that AI systems trai
                 {"role": "user", "content": f"Context:\n{context}\n\nPrompt:\n{prompt}"}
             ]
             
-            response = await asyncio.to_thread(
-                self.openai_client.chat.completions.create,
-                model="gpt-4-turbo-preview",
-                messages=messages,
-                temperature=0.7,
-                max_tokens=2000
+            response = await self.rate_limiter.call(
+                "openai",
+                "gpt-4-turbo-preview",
+                lambda: self.openai_client.chat.completions.create(
+                    model="gpt-4-turbo-preview",
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=2000
+                ),
+                tokens=estimate_tokens(system_prompt, messages[1]["content"], max_tokens=2000)
             )
             
             content = response.choices[0].message.content
@@ -98,16 +106,21 @@ When referencing research or studies:
 Example: "Recent research by Smith and Johnson (2023) found that AI systems trained on diverse datasets showed 40% less bias in decision-making tasks. This suggests that..."
 """
             
-            response = await asyncio.to_thread(
-                self.claude_client.messages.create,
-                model="claude-3-opus-20240229",
-                max_tokens=2000,
-                system=system_prompt,
-                messages=[{
-                    "role": "user",
-                    "content": f"Context:\n{context}\n\nPrompt:\n{prompt}"
-                }],
-                temperature=0.7
+            user_content = f"Context:\n{context}\n\nPrompt:\n{prompt}"
+            response = await self.rate_limiter.call(
+                "anthropic",
+                "claude-3-opus-20240229",
+                lambda: self.claude_client.messages.create(
+                    model="claude-3-opus-20240229",
+                    max_tokens=2000,
+                    system=system_prompt,
+                    messages=[{
+                        "role": "user",
+                        "content": user_content
+                    }],
+                    temperature=0.7
+                ),
+                tokens=estimate_tokens(system_prompt, user_content, max_tokens=2000)
             )
             
             content = response.content[0].text
@@ -119,14 +132,9 @@ Example: "Recent research by Smith and Johnson (2023) found that AI systems trai
     async def generate_with_gemini(self, prompt: str, context: str) -> str:
         """Generate content using Gemini"""
         try:
-            # Configure Gemini with API key
-            api_key = os.getenv("GEMINI_API_KEY")
-            if not api_key:
+            if self.gemini is None:
                 raise ValueError("GEMINI_API_KEY environment variable not set")
             
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel('gemini-pro')
-            
             system_prompt = """You are a professional blog writer with expertise in technology and AI. 
 Write in a conversational, engaging tone while incorporating research citations.
 When referencing research or studies:
@@ -138,15 +146,11 @@ Example: "Recent research by Smith and Johnson (2023) found that AI systems trai
 """
             
             prompt_text = f"{system_prompt}\n\nContext:\n{context}\n\nPrompt:\n{prompt}"
-            response = await asyncio.to_thread(
-                model.generate_content,
-                prompt_text
-            )
+            content = await self.gemini.generate(prompt_text, 'gemini-pro')
             
-            if not response.text:
+            if not content:
                 raise ValueError("Empty response from Gemini")
                 
-            content = response.text
             return f"{content}\n\n_(Generated by Gemini)_"
         except Exception as e:
             logger.error(f"Gemini error: {str(e)}")
@@ -173,9 +177,15 @@ Example: "Recent research by Smith and Johnson (2023) found that AI systems trai
         return ""
 
 class BlogGenerator:
-    def __init__(self):
-        """Initialize the blog generator with configuration."""
+    def __init__(self, max_concurrency: int = 4):
+        """Initialize the blog generator with configuration.
+        
+        Args:
+            max_concurrency: Maximum section generations in flight at once,
+                shared by every post this generator is producing
+        """
         self.orchestrator = LLMOrchestrator()
+        self._section_semaphore = asyncio.Semaphore(max_concurrency)
         self.output_dir = Path(__file__).parent / 'processed_text'
         self.output_dir.mkdir(exist_ok=True)
 
@@ -218,15 +228,18 @@ class BlogGenerator:
         llm_type = self._get_llm_type(model_name)
         
         try:
-            # Get relevant context from RAGFlow
-            context = await self.orchestrator.get_context(prompt, dataset_ids)
-            
-            # Generate content with context
-            content = await self.orchestrator.generate_blog_section(
-                llm_type=llm_type,
-                prompt=prompt,
-                context=context
-            )
+            async with self._section_semaphore:
+                logger.info(f"Generating section: {section_name}")
+                
+                # Get relevant context from RAGFlow
+                context = await self.orchestrator.get_context(prompt, dataset_ids)
+                
+                # Generate content with context
+                content = await self.orchestrator.generate_blog_section(
+                    llm_type=llm_type,
+                    prompt=prompt,
+                    context=context
+                )
             
             return content
             
@@ -251,19 +264,23 @@ class BlogGenerator:
             else:
                 metadata = {"title": "", "date": datetime.now().isoformat()}
             
-            # Generate content for each section
-            generated_content = {}
-            for section in metadata.get('sections', []):
-                section_name = section.get('name', 'Untitled')
-                logger.info(f"Generating section: {section_name}")
-                
-                content = await self.generate_section(
-                    section_name,
+            # Sections are independent, so generate them concurrently and keep template order
+            sections = metadata.get('sections', [])
+            start = time.perf_counter()
+            contents = await asyncio.gather(*[
+                self.generate_section(
+                    section.get('name', 'Untitled'),
                     section.get('prompt', ''),
                     section.get('model', 'GPT-4'),
                     dataset_ids=[]  # We'll implement this with RAGFlow later
                 )
-                generated_content[section_name] = content
+                for section in sections
+            ])
+            generated_content = {
+                section.get('name', 'Untitled'): content
+                for section, content in zip(sections, contents)
+            }
+            logger.info(f"Generated {len(sections)} sections in {time.perf_counter() - start:.2f}s")
             
             # Generate output filename with timestamp
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -305,6 +322,10 @@ class BlogGenerator:
             logger.error(f"Error generating blog post: {str(e)}")
             return None
 
+    async def generate_blog_posts(self, template_paths: List[str]) -> List[Optional[Path]]:
+        """Generate several posts concurrently, sharing the section concurrency limit."""
+        return await asyncio.gather(*[self.generate_blog_post(path) for path in template_paths])
+
 async def main():
     """Main entry point for blog generation."""
     if len(sys.argv) < 2:
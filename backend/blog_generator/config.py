@@ -91,9 +91,20 @@ SECTION_CONFIGS = {
 # Vector store configurations
 VECTOR_STORE_CONFIG = {
     "embedding_model": "text-embedding-ada-002",
+    "backend": "chroma",  # "chroma" or "numpy" (exact search for small corpora)
+    "storage_dtype": "float32",  # numpy backend only: "float32", "float16" or "int8"
+    "rerank_factor": 4,  # full-precision re-rank shortlist size per result when quantized
+    "keyword_index": True,  # maintain a BM25 index for hybrid_search
+    "near_duplicate_threshold": 0.9,  # MinHash Jaccard at which sections are skipped as duplicates
+    "query_cache_size": 1024,  # cached query results, invalidated per collection on writes
+    "shard_by_section_type": False,  # one research collection per section_type with routed queries
     "similarity_threshold": 0.7,
     "chunk_size": 1000,
-    "chunk_overlap": 200
+    "chunk_overlap": 200,
+    "chunk_unit": "chars",  # "chars" or "tokens"
+    "embedding_batch_size": 64,
+    "write_batch_size": 1000,
+    "max_concurrency": 4
 }
 
 # Quality metric weights
@@ -0,0 +1,219 @@
+"""
+Re-embed a VectorStore collection with a new embedding model without downtime.
+
+EmbeddingMigration copies a collection into a shadow collection built with
+the target model, one batch at a time. The shadow is its own progress
+record: ids already present there are skipped, so an interrupted job
+resumes where it stopped when it is constructed and run again. Queries keep
+reading the source collection (with the source model) until the shadow has
+caught up, then VectorStore.switch_collection points the logical name at
+the shadow in a single step under the store's write lock.
+
+While a migration object exists, the store mirrors source writes and
+deletes into the shadow, so records edited after they were copied (e.g.
+PoemIndexer's delete-and-re-add of a changed poem) are not served stale.
+Edits made while no migration was running are found by comparing documents
+when the job resumes.
+
+Usage (from backend/):
+    python -m blog_generator.embedding_migration research_sections all-mpnet-base-v2
+"""
+from typing import Any, Dict, List, Optional
+import argparse
+import json
+import logging
+import re
+import threading
+import time
+
+from .retrieval import ShardedCollection
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+def shadow_collection_name(collection_name: str, model_name: str) -> str:
+    """Physical name of the collection holding collection_name re-embedded with model_name"""
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "-", model_name).strip("-._")
+    return f"{collection_name}--{slug}"
+
+class EmbeddingMigration:
+    """Resumable, batched re-embedding of one collection into a shadow collection"""
+
+    def __init__(
+        self,
+        store: VectorStore,
+        collection_name: str,
+        model_name: str,
+        batch_size: Optional[int] = None,
+        shadow_name: Optional[str] = None
+    ):
+        """Open or create the shadow collection
+
+        Args:
+            store: Store serving the collection
+            collection_name: Logical collection to migrate, e.g. research_sections
+            model_name: Target embedding model
+            batch_size: Records re-embedded per batch, defaults to the store's embedding_batch_size
+            shadow_name: Shadow collection name, defaults to "<collection>--<model>"
+        """
+        self.store = store
+        self.collection_name = collection_name
+        self.model_name = model_name
+        self.batch_size = batch_size or store.embedding_batch_size
+        self.source = store._get_collection(collection_name)
+        if isinstance(self.source, ShardedCollection):
+            raise ValueError("Sharded collections cannot be migrated")
+        self.shadow_name = shadow_name or shadow_collection_name(collection_name, model_name)
+        if self.shadow_name == self.source.name:
+            raise ValueError(f"{collection_name} is already served by {self.shadow_name}")
+        self.shadow = store.client.get_or_create_collection(
+            name=self.shadow_name,
+            metadata={**(self.source.metadata or {}), "embedding_model": model_name,
+                      "migrated_from": self.source.name}
+        )
+        # Near-duplicate signatures follow the research collection to its new name
+        self._copy_signatures = store.near_duplicates is not None and self.source is store.research_collection
+        # Source writes and deletes from here on, including edits of already
+        # migrated ids, reach the shadow directly
+        store.mirror_writes(self.source.name, self.shadow, model_name)
+        self.progress: Dict[str, Any] = {
+            "collection": collection_name,
+            "source": self.source.name,
+            "shadow": self.shadow_name,
+            "model": model_name,
+            "status": "pending",
+            "migrated": 0,
+            "remaining": None
+        }
+        self.error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def pending_ids(self) -> List[str]:
+        """Source ids not yet present in the shadow"""
+        migrated = set(self.shadow.get(include=[])["ids"])
+        return [record_id for record_id in self.source.get(include=[])["ids"] if record_id not in migrated]
+
+    def stale_ids(self) -> List[str]:
+        """Migrated ids whose source document no longer matches the shadow copy"""
+        migrated = self.shadow.get(include=["documents"])
+        if not len(migrated["ids"]):
+            return []
+        copies = dict(zip(migrated["ids"], migrated["documents"]))
+        source = self.source.get(ids=list(copies), include=["documents"])
+        return [record_id for record_id, document in zip(source["ids"], source["documents"])
+                if copies[record_id] != document]
+
+    def copy_pending(self, limit: Optional[int] = None) -> int:
+        """Re-embed pending records batch by batch
+
+        Args:
+            limit: Stop after this many records
+
+        Returns:
+            Number of records copied into the shadow
+        """
+        pending = self.pending_ids()
+        if limit is not None:
+            pending = pending[:limit]
+        copied = 0
+        for begin in range(0, len(pending), self.batch_size):
+            if self._stop.is_set():
+                break
+            records = self.source.get(ids=pending[begin:begin + self.batch_size],
+                                      include=["documents", "metadatas"])
+            ids, documents = list(records["ids"]), list(records["documents"])
+            embeddings = self.store.embed_batch(documents, self.model_name)
+            self.store._add_records(self.shadow, ids, embeddings, documents, list(records["metadatas"]))
+            if self._copy_signatures:
+                near_duplicates = self.store.near_duplicates
+                near_duplicates.add(self.shadow_name, ids, [near_duplicates.signature(text) for text in documents])
+            copied += len(ids)
+            self.progress["migrated"] += len(ids)
+            self.progress["remaining"] = len(pending) - copied
+            logger.info(f"Migrated {self.progress['migrated']} records of {self.collection_name}, "
+                        f"{self.progress['remaining']} remaining")
+        return copied
+
+    def run(self, switch: bool = True) -> Dict[str, Any]:
+        """Copy every pending batch, then switch reads and writes to the shadow
+
+        Args:
+            switch: Point the logical collection at the shadow once it has caught up
+
+        Returns:
+            Progress dictionary; status is "completed", "copied" (switch=False)
+            or "stopped" if stop() interrupted the job
+        """
+        start = time.perf_counter()
+        self.progress["status"] = "running"
+        # Copies of records edited while no migration was mirroring are redone
+        stale = self.stale_ids()
+        if stale:
+            logger.info(f"Re-copying {len(stale)} records of {self.collection_name} edited since the last run")
+            self.store.delete_documents(stale, collection_name=self.shadow_name)
+        # Each pass picks up records written to the source during the previous one
+        while not self._stop.is_set() and self.copy_pending():
+            pass
+        if self._stop.is_set():
+            self.progress["status"] = "stopped"
+            return self.progress
+        if switch:
+            with self.store._collection_lock:
+                # Writes are held while the last records land, so nothing is lost at the switch
+                self.copy_pending()
+                source_ids = set(self.source.get(include=[])["ids"])
+                removed = [record_id for record_id in self.shadow.get(include=[])["ids"]
+                           if record_id not in source_ids]
+                self.store.delete_documents(removed, collection_name=self.shadow_name)
+                self.store.switch_collection(self.collection_name, self.shadow_name, self.model_name)
+        self.progress["status"] = "completed" if switch else "copied"
+        self.progress["seconds"] = time.perf_counter() - start
+        logger.info(f"Migration of {self.collection_name} to {self.model_name} {self.progress['status']} "
+                    f"in {self.progress['seconds']:.2f}s")
+        return self.progress
+
+    def start(self, switch: bool = True) -> "EmbeddingMigration":
+        """Run the migration on a background thread"""
+        def target():
+            try:
+                self.run(switch=switch)
+            except BaseException as e:
+                self.error = e
+                self.progress["status"] = "failed"
+                logger.error(f"Migration of {self.collection_name} failed: {e}")
+
+        self._thread = threading.Thread(target=target, name=f"migrate-{self.collection_name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Interrupt after the current batch; run() or start() again to resume"""
+        self._stop.set()
+        self.wait()
+        self._stop.clear()
+
+    def wait(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for a background migration, re-raising its error"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.progress
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-embed a collection with a new embedding model")
+    parser.add_argument("collection", help="Logical collection name, e.g. research_sections")
+    parser.add_argument("model", help="Target embedding model")
+    parser.add_argument("--db", default="vector_db", help="Vector store persist directory")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--no-switch", action="store_true", help="Copy only; keep serving the source")
+    args = parser.parse_args()
+
+    store = VectorStore(persist_directory=args.db)
+    migration = EmbeddingMigration(store, args.collection, args.model, batch_size=args.batch_size)
+    print(json.dumps(migration.run(switch=not args.no_switch), indent=2))
+    store.close()
+
+if __name__ == "__main__":
+    main()
@@ -8,11 +8,13 @@ from typing import List, Dict, Any, Optional
 from enum import Enum
 from dataclasses import dataclass
 import asyncio
-import google.generativeai as genai
 from anthropic import Anthropic
 import openai
 import logging
 
+from .pipeline.gemini import GeminiAdapter
+from .pipeline.rate_limiter import estimate_tokens, rate_limiter
+
 logger = logging.getLogger(__name__)
 
 class LLMType(Enum):
@@ -39,16 +41,22 @@ class LLMOrchestrator:
         Args:
             llm_configs: Dict containing API keys and configurations for each LLM
         """
-        # Initialize OpenAI
-        openai.api_key = llm_configs.get("openai", {}).get("api_key")
+        # Initialize OpenAI (SDK retries off: the rate limiter owns retries)
+        self.openai_client = openai.OpenAI(
+            api_key=llm_configs.get("openai", {}).get("api_key"),
+            max_retries=0
+        )
         self.openai_config = LLMConfig(**llm_configs.get("openai", {}).get("config", {}))
         
-        # Initialize Anthropic
-        self.anthropic_client = Anthropic(api_key=llm_configs.get("anthropic", {}).get("api_key"))
+        # Initialize Anthropic (SDK retries off: the rate limiter owns retries)
+        self.anthropic_client = Anthropic(
+            api_key=llm_configs.get("anthropic", {}).get("api_key"),
+            max_retries=0
+        )
         self.anthropic_config = LLMConfig(**llm_configs.get("anthropic", {}).get("config", {}))
         
         # Initialize Gemini
-        genai.configure(api_key=llm_configs.get("google", {}).get("api_key"))
+        self.gemini = GeminiAdapter(api_key=llm_configs.get("google", {}).get("api_key"))
         self.gemini_config = LLMConfig(**llm_configs.get("google", {}).get("config", {}))
 
     async def generate_with_chatgpt(self, prompt: str, context: str) -> str:
@@ -60,12 +68,17 @@ class LLMOrchestrator:
                 {"role": "user", "content": f"Context:\n{context}\n\nPrompt:\n{prompt}"}
             ]
             
-            response = await asyncio.to_thread(
-                openai.chat.completions.create,
-                model=config.model_name,
-                messages=messages,
-                temperature=config.temperature,
-                max_tokens=config.max_tokens
+            response = await rate_limiter.call(
+                "openai",
+                config.model_name,
+                lambda: asyncio.to_thread(
+                    self.openai_client.chat.completions.create,
+                    model=config.model_name,
+                    messages=messages,
+                    temperature=config.temperature,
+                    max_tokens=config.max_tokens
+                ),
+                tokens=estimate_tokens(*(m["content"] for m in messages), max_tokens=config.max_tokens)
             )
             
             content = response.choices[0].message.content
@@ -89,12 +102,17 @@ class LLMOrchestrator:
                 }
             ]
             
-            response = await asyncio.to_thread(
-                self.anthropic_client.messages.create,
-                model=config.model_name,
-                messages=messages,
-                temperature=config.temperature,
-                max_tokens=config.max_tokens
+            response = await rate_limiter.call(
+                "anthropic",
+                config.model_name,
+                lambda: asyncio.to_thread(
+                    self.anthropic_client.messages.create,
+                    model=config.model_name,
+                    messages=messages,
+                    temperature=config.temperature,
+                    max_tokens=config.max_tokens
+                ),
+                tokens=estimate_tokens(*(m["content"] for m in messages), max_tokens=config.max_tokens)
             )
             
             content = response.content[0].text
@@ -107,21 +125,15 @@ class LLMOrchestrator:
         """Generate content using Gemini"""
         config = self.gemini_config
         try:
-            model = genai.GenerativeModel(
-                model_name=config.model_name,
+            prompt_text = f"Context:\n{context}\n\nPrompt:\n{prompt}"
+            content = await self.gemini.generate(
+                prompt_text,
+                config.model_name,
                 generation_config={
                     "temperature": config.temperature,
                     "max_output_tokens": config.max_tokens
                 }
             )
-            
-            prompt_text = f"Context:\n{context}\n\nPrompt:\n{prompt}"
-            response = await asyncio.to_thread(
-                model.generate_content,
-                prompt_text
-            )
-            
-            content = response.text
             return f"{content}\n\n_(Generated by Gemini)_"
         except Exception as e:
             logger.error(f"Gemini error: {str(e)}")
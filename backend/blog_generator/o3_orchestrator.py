@@ -138,6 +138,9 @@ async def main():
             f.write(results["o3_query"])
             
         logger.info(f"O3 query generation complete. Results saved to {output_file}")
+        for key, stats in orchestrator.llm_orchestrator.get_latency_stats().items():
+            logger.info(f"Latency {key}: n={stats['count']} p50={stats['p50']:.2f}s "
+                        f"p95={stats['p95']:.2f}s p99={stats['p99']:.2f}s")
         
     except Exception as e:
         logger.error(f"Error in main: {str(e)}")
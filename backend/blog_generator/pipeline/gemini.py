@@ -0,0 +1,74 @@
+"""
+Shared async adapter for Gemini.
+GenerativeModel objects are built once per (model, generation config) and
+reused, and every call goes through generate_content_async so Gemini
+requests never block the event loop.
+"""
+from typing import Any, Dict, Optional, Tuple
+import json
+import logging
+import os
+import threading
+
+import google.generativeai as genai
+
+from .rate_limiter import RateLimiter, estimate_tokens, rate_limiter as shared_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+class GeminiAdapter:
+    """Non-blocking Gemini completions with cached model objects"""
+
+    def __init__(self, api_key: Optional[str] = None, rate_limiter: Optional[RateLimiter] = None):
+        """
+        Args:
+            api_key: Gemini API key, defaults to $GEMINI_API_KEY when the first model is built
+            rate_limiter: Per-model request/token limits, defaults to the pipeline's shared limiter
+        """
+        self.api_key = api_key
+        self.rate_limiter = rate_limiter or shared_rate_limiter
+        self._models: Dict[Tuple[str, str], Any] = {}
+        self._configured = False
+        self._lock = threading.Lock()
+
+    def model(self, model_name: str = "gemini-pro",
+              generation_config: Optional[Dict[str, Any]] = None):
+        """Cached GenerativeModel for a model name and generation config"""
+        key = (model_name, json.dumps(generation_config or {}, sort_keys=True))
+        model = self._models.get(key)
+        if model is None:
+            with self._lock:
+                if not self._configured:
+                    genai.configure(api_key=self.api_key or os.getenv("GEMINI_API_KEY"))
+                    self._configured = True
+                model = self._models.get(key)
+                if model is None:
+                    model = genai.GenerativeModel(model_name, generation_config=generation_config)
+                    self._models[key] = model
+        return model
+
+    async def generate(self, prompt: str, model_name: str = "gemini-pro",
+                       generation_config: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Generate a completion without blocking the event loop.
+
+        Args:
+            prompt: The prompt to send
+            model_name: Gemini model name
+            generation_config: Optional temperature, max_output_tokens, ...
+
+        Returns:
+            Model response text
+        """
+        model = self.model(model_name, generation_config)
+        max_tokens = (generation_config or {}).get("max_output_tokens", 0)
+        response = await self.rate_limiter.call(
+            "gemini",
+            model_name,
+            lambda: model.generate_content_async(prompt),
+            tokens=estimate_tokens(prompt, max_tokens=max_tokens)
+        )
+        return response.text
+
+# Shared by every Gemini caller in the process
+gemini_adapter = GeminiAdapter()
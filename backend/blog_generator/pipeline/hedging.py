@@ -0,0 +1,149 @@
+"""
+Latency histograms and hedged requests for latency-critical LLM calls.
+A hedged call starts the primary model, and if it has not answered within
+its hedge delay (its observed p95) starts the next model as well. The first
+valid response wins and the slower requests are cancelled, so one slow
+provider no longer sets the tail latency of the whole step.
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+from bisect import bisect_left
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Bucket upper bounds in seconds, growing by sqrt(2) from 50ms to ~10 minutes
+BUCKET_BOUNDS = tuple(0.05 * 2 ** (i / 2) for i in range(28))
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with interpolated quantiles"""
+
+    def __init__(self, bounds: Sequence[float] = BUCKET_BOUNDS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one observation"""
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Latency below which a fraction q of observations fall, None when empty"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                # Interpolate within the bucket, never past the largest observation
+                return min(self.max, lower + (upper - lower) * (rank - seen) / bucket_count)
+            seen += bucket_count
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Count, mean, p50/p95/p99 and non-empty buckets keyed by upper bound"""
+        buckets = {}
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                label = f"{self.bounds[index]:.3g}" if index < len(self.bounds) else "+Inf"
+                buckets[label] = bucket_count
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max if self.count else None,
+            "buckets": buckets
+        }
+
+class LatencyRecorder:
+    """Named latency histograms, e.g. one per model and one per hedged call site"""
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def histogram(self, key: str) -> Optional[LatencyHistogram]:
+        return self._histograms.get(key)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of every histogram"""
+        with self._lock:
+            return {key: histogram.snapshot() for key, histogram in self._histograms.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+async def hedged(candidates: Sequence[Tuple[str, Callable[[], Awaitable[T]]]],
+                 hedge_delay: Callable[[str], float]) -> Tuple[str, T]:
+    """
+    Race candidates, starting each one after the previous one's hedge delay.
+
+    A candidate that fails starts the next one immediately. The first
+    successful result is returned and every other request is cancelled.
+
+    Args:
+        candidates: (name, zero-argument coroutine function) pairs in preference order
+        hedge_delay: Seconds to give a started candidate before hedging to the next
+
+    Returns:
+        Tuple of (winning candidate name, its result)
+
+    Raises:
+        The last candidate's error if every candidate fails
+    """
+    if not candidates:
+        raise ValueError("No candidates to race")
+    remaining = list(candidates)
+    pending: Dict[asyncio.Task, str] = {}
+    errors: List[BaseException] = []
+
+    def launch() -> float:
+        name, request = remaining.pop(0)
+        pending[asyncio.ensure_future(request())] = name
+        return hedge_delay(name)
+
+    try:
+        delay = launch()
+        while pending:
+            done, _ = await asyncio.wait(pending, timeout=delay if remaining else None,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                logger.debug(f"Hedging to {remaining[0][0]} after {delay:.2f}s")
+                delay = launch()
+                continue
+            for task in done:
+                name = pending.pop(task)
+                if task.exception() is None:
+                    return name, task.result()
+                errors.append(task.exception())
+                logger.warning(f"Hedged candidate {name} failed: {task.exception()}")
+            if remaining:
+                delay = launch()
+        raise errors[-1]
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+# Shared by every pipeline LLM caller in the process
+latency_recorder = LatencyRecorder()
@@ -2,39 +2,77 @@
 LLM orchestrator for managing model calls and contributions.
 """
 import asyncio
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Sequence, Tuple, Union
 import logging
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 import os
 from openai import AsyncOpenAI
 from anthropic import AsyncAnthropic
-import google.generativeai as genai
 import json
 
+from .gemini import gemini_adapter
+from .hedging import LatencyRecorder, hedged, latency_recorder as shared_latency_recorder
+from .rate_limiter import RateLimiter, estimate_tokens, rate_limiter as shared_rate_limiter
+from .response_cache import ResponseCache, request_digest
+
 # Load environment variables
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
 logger = logging.getLogger(__name__)
 
+# Hedge after this long until a model has enough samples for a p95
+DEFAULT_HEDGE_DELAY = 10.0
+HEDGE_MIN_SAMPLES = 20
+# Never hedge sooner than this, however fast a model has been
+MIN_HEDGE_DELAY = 1.0
+
 class LLMOrchestrator:
     """Manages LLM model calls and contributions."""
     
-    def __init__(self):
-        """Initialize LLM clients."""
-        # Initialize OpenAI client
+    def __init__(self, response_cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 latency_recorder: Optional[LatencyRecorder] = None,
+                 default_hedge_delay: float = DEFAULT_HEDGE_DELAY,
+                 min_hedge_delay: float = MIN_HEDGE_DELAY):
+        """
+        Initialize LLM clients.
+        
+        Args:
+            response_cache: Optional cache for completions. When omitted, a disk
+                cache is opened at $LLM_RESPONSE_CACHE if that variable is set
+                (TTL in seconds from $LLM_RESPONSE_CACHE_TTL); otherwise
+                completions are not cached.
+            rate_limiter: Per-model request/token limits with 429 backoff,
+                defaults to the limiter shared by the pipeline. Gemini calls
+                are limited by the shared Gemini adapter.
+            latency_recorder: Per-model completion latency histograms used to
+                pick hedge delays, defaults to the pipeline's shared recorder
+            default_hedge_delay: Hedge delay in seconds for models with fewer
+                than HEDGE_MIN_SAMPLES recorded completions
+            min_hedge_delay: Lower bound on the p95-based hedge delay
+        """
+        self.rate_limiter = rate_limiter or shared_rate_limiter
+        self.latency = latency_recorder or shared_latency_recorder
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        
+        # Initialize OpenAI client (SDK retries off: the rate limiter owns retries)
         self.openai_client = AsyncOpenAI(
-            api_key=os.getenv('OPENAI_API_KEY')
+            api_key=os.getenv('OPENAI_API_KEY'),
+            max_retries=0
         )
         
-        # Initialize Anthropic client
+        # Initialize Anthropic client (SDK retries off: the rate limiter owns retries)
         self.anthropic_client = AsyncAnthropic(
-            api_key=os.getenv('ANTHROPIC_API_KEY')
+            api_key=os.getenv('ANTHROPIC_API_KEY'),
+            max_retries=0
         )
         
-        # Initialize Gemini
-        genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
+        # Shared Gemini adapter with cached model objects
+        self.gemini = gemini_adapter
         
         self.model_configs = {
             "gpt4": {
@@ -57,6 +95,16 @@ class LLMOrchestrator:
             }
         }
 
+        # Opt-in response cache; LLM_RESPONSE_CACHE_BYPASS=1 forces fresh completions
+        if response_cache is None and os.getenv('LLM_RESPONSE_CACHE'):
+            ttl = os.getenv('LLM_RESPONSE_CACHE_TTL')
+            response_cache = ResponseCache(
+                os.getenv('LLM_RESPONSE_CACHE'),
+                ttl_seconds=float(ttl) if ttl else 7 * 24 * 3600
+            )
+        self.response_cache = response_cache
+        self.bypass_cache = os.getenv('LLM_RESPONSE_CACHE_BYPASS', '').lower() in ('1', 'true', 'yes')
+
         # Log API key status
         logger.info("Checking API keys...")
         logger.info(f"OpenAI API key: {'Found' if os.getenv('OPENAI_API_KEY') else 'Not found'}")
@@ -67,59 +115,198 @@ class LLMOrchestrator:
                            model: str,
                            prompt: str,
                            system_prompt: Optional[str] = None,
-                           temperature: Optional[float] = None) -> str:
+                           temperature: Optional[float] = None,
+                           bypass_cache: bool = False,
+                           validate: Optional[Callable[[str], Any]] = None) -> str:
         """
         Get completion from specified model.
         
+        Identical requests are answered from the response cache when one is
+        configured. With validate, only responses it accepts are cached, and a
+        cached response it rejects is fetched again.
+        
         Args:
             model: Model identifier (gpt4, claude, gemini)
             prompt: The prompt to send
             system_prompt: Optional system prompt
             temperature: Optional temperature override
+            bypass_cache: Skip the cache lookup and refresh the cached response
+            validate: Optional check that raises on an unusable response
             
         Returns:
             Model response text
         """
-        try:
-            config = self.model_configs[model]
-            temp = temperature if temperature is not None else config["temperature"]
+        response, _ = await self._validated_completion(model, prompt, system_prompt, temperature,
+                                                       bypass_cache=bypass_cache, validate=validate)
+        return response
+
+    async def _validated_completion(self,
+                                    model: str,
+                                    prompt: str,
+                                    system_prompt: Optional[str] = None,
+                                    temperature: Optional[float] = None,
+                                    bypass_cache: bool = False,
+                                    validate: Optional[Callable[[str], Any]] = None) -> Tuple[str, Any]:
+        """
+        Get a completion as in get_completion, validating it exactly once.
+        
+        Returns:
+            Tuple of (response text, validate's result or the text without validate)
+        """
+        config = self.model_configs[model]
+        temp = temperature if temperature is not None else config["temperature"]
+        check = validate if validate is not None else (lambda response: response)
+        if self.response_cache is None:
+            response = await self._request_completion(model, config, prompt, system_prompt, temp)
+            return response, check(response)
+        
+        namespace = f"{model}:{config['name']}"
+        key = request_digest(
+            system_prompt=system_prompt,
+            prompt=prompt,
+            temperature=temp,
+            max_tokens=config["max_tokens"]
+        )
+        if not (bypass_cache or self.bypass_cache):
+            cached = await asyncio.to_thread(self.response_cache.get, namespace, key)
+            if cached is not None:
+                try:
+                    result = check(cached)
+                    logger.debug(f"Response cache hit for {namespace}")
+                    return cached, result
+                except Exception:
+                    logger.debug(f"Cached response for {namespace} rejected, fetching again")
+        
+        response = await self._request_completion(model, config, prompt, system_prompt, temp)
+        result = check(response)
+        await asyncio.to_thread(self.response_cache.put, namespace, key, response)
+        return response, result
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache hit/miss statistics, empty when caching is off."""
+        return self.response_cache.stats() if self.response_cache is not None else {}
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get latency histograms per model and per raced call."""
+        return self.latency.stats()
+
+    def hedge_delay(self, model: str) -> float:
+        """Seconds to wait on a model before hedging: its p95 attempt latency, floored."""
+        histogram = self.latency.histogram(f"{model}:{self.model_configs[model]['name']}")
+        if histogram is None or histogram.count < HEDGE_MIN_SAMPLES:
+            return self.default_hedge_delay
+        return max(self.min_hedge_delay, histogram.quantile(0.95))
+
+    async def get_raced_completion(self,
+                                   models: Sequence[str],
+                                   prompt: str,
+                                   system_prompt: Optional[str] = None,
+                                   temperature: Optional[float] = None,
+                                   validate: Optional[Callable[[str], Any]] = None) -> Tuple[str, Any]:
+        """
+        Get a completion from whichever model answers first.
+        
+        The first model is asked immediately; each next model is asked once
+        the previous one has run past its p95 latency or failed. The first
+        valid response wins and the other requests are cancelled.
+        
+        Args:
+            models: Model identifiers in preference order, e.g. ["claude", "gpt4"]
+            prompt: The prompt to send
+            system_prompt: Optional system prompt
+            temperature: Optional temperature override
+            validate: Optional parser applied to each response; raising marks
+                the response invalid and moves on to the next model
             
+        Returns:
+            Tuple of (winning model, response text or validate's result)
+        """
+        def request(model: str):
+            async def complete():
+                _, result = await self._validated_completion(model, prompt, system_prompt, temperature,
+                                                             validate=validate)
+                return result
+            return complete
+        
+        start = time.perf_counter()
+        winner, result = await hedged([(model, request(model)) for model in models], self.hedge_delay)
+        self.latency.record(f"race:{'+'.join(models)}", time.perf_counter() - start)
+        logger.debug(f"Raced completion won by {winner}")
+        return winner, result
+
+    async def _request_completion(self,
+                                  model: str,
+                                  config: Dict[str, Any],
+                                  prompt: str,
+                                  system_prompt: Optional[str],
+                                  temp: float) -> str:
+        """Send one completion request to the provider and record its latency."""
+        start = time.perf_counter()
+        # Failed and cancelled (hedged-out) attempts are recorded too: they are
+        # the slow tail, and leaving them out drags the p95 hedge delay down
+        try:
+            return await self._send_completion(model, config, prompt, system_prompt, temp)
+        finally:
+            self.latency.record(f"{model}:{config['name']}", time.perf_counter() - start)
+
+    async def _send_completion(self,
+                               model: str,
+                               config: Dict[str, Any],
+                               prompt: str,
+                               system_prompt: Optional[str],
+                               temp: float) -> str:
+        """Send one completion request to the provider."""
+        try:
             if model == "gpt4":
                 messages = []
                 if system_prompt:
                     messages.append({"role": "system", "content": system_prompt})
                 messages.append({"role": "user", "content": prompt})
                 
-                response = await self.openai_client.chat.completions.create(
-                    model=config["name"],
-                    messages=messages,
-                    temperature=temp
+                response = await self.rate_limiter.call(
+                    "openai",
+                    config["name"],
+                    lambda: self.openai_client.chat.completions.create(
+                        model=config["name"],
+                        messages=messages,
+                        temperature=temp
+                    ),
+                    tokens=estimate_tokens(system_prompt, prompt, max_tokens=config["max_tokens"])
                 )
-                return response.choices[0].message.content
+                text = response.choices[0].message.content
                 
             elif model == "claude":
                 messages = [{"role": "user", "content": prompt}]
                 if system_prompt:
                     messages[0]["content"] = f"{system_prompt}\n\n{prompt}"
                 
-                response = await self.anthropic_client.messages.create(
-                    model=config["name"],
-                    messages=messages,
-                    max_tokens=config["max_tokens"]
+                response = await self.rate_limiter.call(
+                    "anthropic",
+                    config["name"],
+                    lambda: self.anthropic_client.messages.create(
+                        model=config["name"],
+                        messages=messages,
+                        max_tokens=config["max_tokens"]
+                    ),
+                    tokens=estimate_tokens(messages[0]["content"], max_tokens=config["max_tokens"])
                 )
-                return response.content[0].text
+                text = response.content[0].text
                 
             else:  # gemini
-                model = genai.GenerativeModel(config["name"])
-                response = await model.generate_content(prompt)
-                return response.text
+                text = await self.gemini.generate(
+                    prompt,
+                    config["name"],
+                    generation_config={"temperature": temp, "max_output_tokens": config["max_tokens"]}
+                )
+            
+            return text
                 
         except Exception as e:
             logger.error(f"Error getting completion from {model}: {str(e)}")
             raise
 
     async def get_structured_completion(self,
-                                     model: str,
+                                     model: Union[str, Sequence[str]],
                                      prompt: str,
                                      output_structure: Dict[str, Any],
                                      system_prompt: Optional[str] = None) -> Dict[str, Any]:
@@ -127,7 +314,8 @@ class LLMOrchestrator:
         Get structured completion from model.
         
         Args:
-            model: Model identifier
+            model: Model identifier, or several in preference order to race them
+                (see get_raced_completion); invalid JSON hands over to the next model
             prompt: The prompt to send
             output_structure: Expected output structure with examples
             system_prompt: Optional system prompt
@@ -147,40 +335,54 @@ Ensure all fields are present and properly formatted.
 Return ONLY the JSON, no other text.
 """
 
-            # Get completion
-            response_text = await self.get_completion(
+            if not isinstance(model, str):
+                _, result = await self.get_raced_completion(
+                    model,
+                    structured_prompt,
+                    system_prompt=system_prompt,
+                    temperature=0.3,
+                    validate=lambda text: self._parse_structured(text, output_structure)
+                )
+                return result
+            
+            # Get completion, parsed once by validation
+            _, result = await self._validated_completion(
                 model=model,
                 prompt=structured_prompt,
                 system_prompt=system_prompt,
-                temperature=0.3  # Lower temperature for structured output
+                temperature=0.3,  # Lower temperature for structured output
+                validate=lambda text: self._parse_structured(text, output_structure)
             )
-            
-            # Clean response text
-            response_text = response_text.strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-            
-            # Parse JSON response
-            try:
-                result = json.loads(response_text)
-            except json.JSONDecodeError:
-                logger.error(f"Invalid JSON response: {response_text}")
-                raise ValueError("Model did not return valid JSON")
-            
-            # Validate structure
-            for key in output_structure:
-                if key not in result:
-                    raise ValueError(f"Missing required field: {key}")
-            
             return result
             
         except Exception as e:
             logger.error(f"Error getting structured completion: {str(e)}")
             raise
 
+    def _parse_structured(self, response_text: str, output_structure: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse a JSON response and check it has every field of output_structure."""
+        # Clean response text
+        response_text = response_text.strip()
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        response_text = response_text.strip()
+        
+        # Parse JSON response
+        try:
+            result = json.loads(response_text)
+        except json.JSONDecodeError:
+            logger.error(f"Invalid JSON response: {response_text}")
+            raise ValueError("Model did not return valid JSON")
+        
+        # Validate structure
+        for key in output_structure:
+            if key not in result:
+                raise ValueError(f"Missing required field: {key}")
+        
+        return result
+
     async def get_parallel_completions(self,
                                      prompts: Dict[str, str],
                                      system_prompt: Optional[str] = None) -> Dict[str, str]:
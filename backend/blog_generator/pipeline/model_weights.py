@@ -49,9 +49,9 @@ Provide a JSON response with these scores (0-1):
             Tuple of (selected_model, scores_dict)
         """
         try:
-            # Get analysis from GPT-4
+            # Get analysis from GPT-4, hedged to Claude if GPT-4 runs past its p95
             analysis = await self.llm_orchestrator.get_structured_completion(
-                model="gpt4",
+                model=["gpt4", "claude"],
                 prompt=self.analysis_prompt.format(topic=topic),
                 output_structure={
                     "technical_score": 0.5,
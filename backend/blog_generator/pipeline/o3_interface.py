@@ -4,20 +4,22 @@ O3 interface and prompt optimization for deep research queries.
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 import json
 import logging
 from openai import AsyncOpenAI
-from anthropic import AsyncAnthropic
-import google.generativeai as genai
 
 from .data_models import ResearchQuestion, ResearchPrompt, ResearchType
+from .llm_orchestrator import LLMOrchestrator
+from .rate_limiter import estimate_tokens, rate_limiter
 
 logger = logging.getLogger(__name__)
 
-# Initialize clients
-openai_client = AsyncOpenAI()
-anthropic_client = AsyncAnthropic()
-genai.configure()
+# Created on first use so importing the pipeline needs no credentials
+# (SDK retries off: the rate limiter owns retries)
+@lru_cache(maxsize=None)
+def openai_client() -> AsyncOpenAI:
+    return AsyncOpenAI(max_retries=0)
 
 # O3 Capability Template
 O3_CAPABILITY_TEMPLATE = """
@@ -81,6 +83,7 @@ class O3PromptGenerator:
     """Generates optimized prompts for O3 deep research system."""
     
     def __init__(self):
+        self.llm_orchestrator = LLMOrchestrator()
         self.optimization_prompt = """
 You are an expert in optimizing research queries for O3, an advanced agentic research system.
 Given a research prompt and its context, optimize it for maximum effectiveness.
@@ -121,17 +124,23 @@ Provide a JSON response with:
         """
         try:
             # Get optimization from GPT-4
-            response = await openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert in research query optimization."},
-                    {"role": "user", "content": self.optimization_prompt.format(
-                        topic=research_prompt.topic,
-                        context=research_prompt.context,
-                        questions="\n".join(f"- {q.question_text}" for q in research_prompt.questions)
-                    )}
-                ],
-                temperature=0.3
+            prompt = self.optimization_prompt.format(
+                topic=research_prompt.topic,
+                context=research_prompt.context,
+                questions="\n".join(f"- {q.question_text}" for q in research_prompt.questions)
+            )
+            response = await rate_limiter.call(
+                "openai",
+                "gpt-4",
+                lambda: openai_client().chat.completions.create(
+                    model="gpt-4",
+                    messages=[
+                        {"role": "system", "content": "You are an expert in research query optimization."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.3
+                ),
+                tokens=estimate_tokens(prompt)
             )
             
             # Parse optimization
@@ -170,13 +179,8 @@ Provide a JSON response with:
     async def format_query(self, query: O3Query) -> str:
         """Format O3Query into a comprehensive research prompt."""
         try:
-            # Get formatting from Claude
-            response = await anthropic_client.messages.create(
-                model="claude-3-opus-20240229",
-                max_tokens=2000,
-                messages=[{
-                    "role": "user",
-                    "content": f"""
+            # Get formatting from Claude, hedged to GPT-4 if Claude runs past its p95
+            prompt = f"""
 Format this research query for O3 deep research system.
 Make it clear, structured, and optimized for comprehensive research.
 
@@ -199,10 +203,8 @@ Output Format:
 
 Format it in a way that maximizes research effectiveness while maintaining clarity.
 """
-                }]
-            )
-            
-            formatted_query = response.content[0].text.strip()
+            _, formatted_query = await self.llm_orchestrator.get_raced_completion(["claude", "gpt4"], prompt)
+            formatted_query = formatted_query.strip()
             
             # Add O3 capability explanation
             final_query = O3_CAPABILITY_TEMPLATE + "\n\n" + formatted_query
@@ -0,0 +1,303 @@
+"""
+Client-side rate limiting for LLM providers.
+Each (provider, model) pair gets a requests-per-minute and a
+tokens-per-minute token bucket. Rate-limit headers from the provider tighten
+the buckets to the server's view, and 429 responses pause every caller of
+that model for the Retry-After period (or a jittered exponential backoff)
+so concurrent requests don't pile into a retry storm.
+"""
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple, TypeVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Per-minute ceilings keyed by provider or "provider:model" (model keys win).
+# Override with $LLM_RATE_LIMITS, e.g. '{"openai:gpt-4": {"rpm": 5000, "tpm": 300000}}'
+DEFAULT_RATE_LIMITS = {
+    "openai": {"rpm": 500, "tpm": 30_000},
+    "anthropic": {"rpm": 50, "tpm": 40_000},
+    "gemini": {"rpm": 60, "tpm": 32_000}
+}
+
+# 429 pauses the bucket; the others are transient server errors worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504, 529}
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+def estimate_tokens(*texts: Optional[str], max_tokens: int = 0) -> int:
+    """Rough token cost of a request: ~4 characters per prompt token plus the completion budget"""
+    return sum(len(text) for text in texts if text) // 4 + max_tokens
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Seconds until a rate-limit window resets
+
+    Accepts plain seconds ("12"), Go-style durations as sent by OpenAI
+    ("6m0s", "1.5s", "20ms") and RFC 3339 timestamps as sent by Anthropic.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        return sum(float(number) * _DURATION_SECONDS[unit] for number, unit in parts)
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if reset_at.tzinfo is None:
+        reset_at = reset_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+
+def retry_after_seconds(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Delay requested by retry-after-ms or Retry-After (seconds or HTTP date)"""
+    if not headers:
+        return None
+    headers = {key.lower(): value for key, value in headers.items()}
+    if "retry-after-ms" in headers:
+        try:
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def error_status(error: BaseException) -> Optional[int]:
+    """HTTP status of a provider SDK error (OpenAI/Anthropic status_code, Google code)"""
+    for attribute in ("status_code", "code"):
+        status = getattr(error, attribute, None)
+        if isinstance(status, int):
+            return int(status)
+    return None
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate
+
+    Reservations may drive the level negative; the caller then waits until
+    the debt is repaid, which serves callers in arrival order without a lock
+    held across awaits.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = 60.0):
+        """
+        Args:
+            per_minute: Sustained rate
+            burst_seconds: Seconds of rate that may be spent back-to-back
+        """
+        self.burst_seconds = burst_seconds
+        self.set_rate(per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def set_rate(self, per_minute: float) -> None:
+        """Change the sustained rate (and capacity) of the bucket"""
+        self.per_minute = float(per_minute)
+        self.rate = self.per_minute / 60.0
+        self.capacity = max(1.0, self.rate * self.burst_seconds)
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take amount from the bucket and return the seconds to wait before using it"""
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        return -self.level / self.rate if self.level < 0 else 0.0
+
+    def limit_to(self, remaining: float, now: float) -> None:
+        """Cap the level at what the server reports as remaining"""
+        self._refill(now)
+        self.level = min(self.level, remaining)
+
+class RateLimiter:
+    """Shared requests/tokens-per-minute limits with adaptive 429 backoff"""
+
+    def __init__(self,
+                 limits: Optional[Dict[str, Dict[str, float]]] = None,
+                 max_retries: int = 5,
+                 base_delay: float = 1.0,
+                 max_delay: float = 60.0):
+        """
+        Args:
+            limits: Ceilings keyed by provider or "provider:model", each with
+                "rpm", "tpm" and optionally "burst_seconds"; merged over
+                DEFAULT_RATE_LIMITS
+            max_retries: Retries after a 429 or transient server error
+            base_delay: First backoff step in seconds when no Retry-After is sent
+            max_delay: Upper bound on a single backoff
+        """
+        self.limits = {**DEFAULT_RATE_LIMITS, **(limits or {})}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._paused_until: Dict[str, float] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """Limiter using $LLM_RATE_LIMITS (JSON) over the defaults"""
+        overrides = os.getenv("LLM_RATE_LIMITS")
+        return cls(limits=json.loads(overrides) if overrides else None)
+
+    def _key(self, provider: str, model: str) -> str:
+        return f"{provider}:{model}"
+
+    def _state(self, key: str) -> Tuple[TokenBucket, TokenBucket]:
+        """Buckets for a key (caller holds the lock)"""
+        buckets = self._buckets.get(key)
+        if buckets is None:
+            provider = key.split(":", 1)[0]
+            limit = self.limits.get(key) or self.limits.get(provider) or {"rpm": 60, "tpm": 60_000}
+            burst = limit.get("burst_seconds", 60.0)
+            buckets = (TokenBucket(limit["rpm"], burst), TokenBucket(limit["tpm"], burst))
+            self._buckets[key] = buckets
+            self._stats[key] = {"requests": 0, "throttled": 0, "retries": 0, "waited_seconds": 0.0}
+        return buckets
+
+    async def acquire(self, provider: str, model: str, tokens: int = 0) -> float:
+        """Wait until one request of the given token cost fits within the limits
+
+        Returns:
+            Seconds spent waiting
+        """
+        key = self._key(provider, model)
+        with self._lock:
+            requests, token_bucket = self._state(key)
+            now = time.monotonic()
+            wait = max(requests.reserve(1, now),
+                       token_bucket.reserve(tokens, now) if tokens else 0.0,
+                       self._paused_until.get(key, 0.0) - now)
+        waited = 0.0
+        while wait > 0:
+            await asyncio.sleep(wait)
+            waited += wait
+            # A 429 seen by another caller while we slept pauses us too
+            with self._lock:
+                wait = self._paused_until.get(key, 0.0) - time.monotonic()
+        with self._lock:
+            self._stats[key]["requests"] += 1
+            self._stats[key]["waited_seconds"] += waited
+        return waited
+
+    def pause(self, provider: str, model: str, seconds: float) -> None:
+        """Hold every request to a model for the given number of seconds"""
+        key = self._key(provider, model)
+        with self._lock:
+            self._state(key)
+            self._paused_until[key] = max(self._paused_until.get(key, 0.0), time.monotonic() + seconds)
+
+    def observe_headers(self, provider: str, model: str, headers: Optional[Mapping[str, str]]) -> None:
+        """Align the buckets with OpenAI x-ratelimit-* or anthropic-ratelimit-* headers"""
+        if not headers:
+            return
+        headers = {key.lower(): value for key, value in headers.items()}
+        key = self._key(provider, model)
+        pause = 0.0
+        with self._lock:
+            now = time.monotonic()
+            for bucket, kind in zip(self._state(key), ("requests", "tokens")):
+                limit = headers.get(f"x-ratelimit-limit-{kind}") or headers.get(f"anthropic-ratelimit-{kind}-limit")
+                remaining = (headers.get(f"x-ratelimit-remaining-{kind}")
+                             or headers.get(f"anthropic-ratelimit-{kind}-remaining"))
+                reset = parse_reset(headers.get(f"x-ratelimit-reset-{kind}")
+                                    or headers.get(f"anthropic-ratelimit-{kind}-reset"))
+                try:
+                    if limit is not None and float(limit) != bucket.per_minute:
+                        bucket.set_rate(float(limit))
+                    if remaining is not None:
+                        bucket.limit_to(float(remaining), now)
+                        if float(remaining) <= 0 and reset:
+                            pause = max(pause, reset)
+                except ValueError:
+                    logger.debug(f"Ignoring malformed {kind} rate-limit headers for {key}")
+        if pause:
+            self.pause(provider, model, pause)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def call(self,
+                   provider: str,
+                   model: str,
+                   request: Callable[[], Awaitable[T]],
+                   tokens: int = 0,
+                   max_retries: Optional[int] = None) -> T:
+        """
+        Run a provider request within the limits, retrying rate-limit and
+        transient server errors.
+
+        Args:
+            provider: Provider name (openai, anthropic, gemini)
+            model: Provider model name
+            request: Zero-argument coroutine function issuing the request
+            tokens: Estimated token cost, see estimate_tokens
+            max_retries: Override the limiter's retry count
+
+        Returns:
+            The request's result
+        """
+        retries = self.max_retries if max_retries is None else max_retries
+        key = self._key(provider, model)
+        attempt = 0
+        while True:
+            await self.acquire(provider, model, tokens)
+            try:
+                return await request()
+            except Exception as e:
+                status = error_status(e)
+                if status not in RETRY_STATUS_CODES or attempt >= retries:
+                    raise
+                headers = getattr(getattr(e, "response", None), "headers", None)
+                self.observe_headers(provider, model, headers)
+                retry_after = retry_after_seconds(headers)
+                # Jitter on top of Retry-After keeps paused callers from resuming in lockstep
+                delay = (min(self.max_delay, retry_after) + random.uniform(0, self.base_delay)
+                         if retry_after is not None else self.backoff(attempt))
+                attempt += 1
+                logger.warning(f"{key} returned {status}, retry {attempt}/{retries} in {delay:.2f}s")
+                with self._lock:
+                    self._stats[key]["retries"] += 1
+                    if status == 429:
+                        self._stats[key]["throttled"] += 1
+                if status == 429:
+                    # The next acquire() waits out the pause along with every other caller
+                    self.pause(provider, model, delay)
+                else:
+                    await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Requests, retries, 429s and time spent waiting per provider:model"""
+        with self._lock:
+            return {key: dict(counters) for key, counters in self._stats.items()}
+
+# Shared by every pipeline LLM caller in the process
+rate_limiter = RateLimiter.from_env()
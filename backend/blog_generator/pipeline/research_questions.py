@@ -3,22 +3,29 @@ Research question generation based on selected model's expertise.
 """
 from typing import List, Dict
 from datetime import datetime
+from functools import lru_cache
 import logging
 import json
 import asyncio
 import openai
 from openai import AsyncOpenAI
 from anthropic import AsyncAnthropic
-import google.generativeai as genai
 
 from .data_models import ResearchQuestion, ResearchType, ModelType
+from .gemini import gemini_adapter
+from .rate_limiter import estimate_tokens, rate_limiter
 
 logger = logging.getLogger(__name__)
 
-# Load API keys from environment
-openai_client = AsyncOpenAI()
-anthropic_client = AsyncAnthropic()
-genai.configure()
+# Clients read their API keys from the environment on first use, so importing
+# the pipeline needs no credentials (SDK retries off: the rate limiter owns retries)
+@lru_cache(maxsize=None)
+def openai_client() -> AsyncOpenAI:
+    return AsyncOpenAI(max_retries=0)
+
+@lru_cache(maxsize=None)
+def anthropic_client() -> AsyncAnthropic:
+    return AsyncAnthropic(max_retries=0)
 
 class ResearchQuestionGenerator:
     def __init__(self):
@@ -133,13 +140,18 @@ Format each question on a new line, starting with "- ".
     async def _generate_with_gpt4(self, prompt: str) -> List[str]:
         """Generate questions using GPT-4."""
         try:
-            response = await openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert research question generator."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7
+            response = await rate_limiter.call(
+                "openai",
+                "gpt-4",
+                lambda: openai_client().chat.completions.create(
+                    model="gpt-4",
+                    messages=[
+                        {"role": "system", "content": "You are an expert research question generator."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7
+                ),
+                tokens=estimate_tokens(prompt)
             )
             questions = response.choices[0].message.content.strip().split("\n")
             return [q for q in questions if q.strip()]
@@ -150,10 +162,15 @@ Format each question on a new line, starting with "- ".
     async def _generate_with_claude(self, prompt: str) -> List[str]:
         """Generate questions using Claude."""
         try:
-            response = await anthropic_client.messages.create(
-                model="claude-3-opus-20240229",
-                max_tokens=1000,
-                messages=[{"role": "user", "content": prompt}]
+            response = await rate_limiter.call(
+                "anthropic",
+                "claude-3-opus-20240229",
+                lambda: anthropic_client().messages.create(
+                    model="claude-3-opus-20240229",
+                    max_tokens=1000,
+                    messages=[{"role": "user", "content": prompt}]
+                ),
+                tokens=estimate_tokens(prompt, max_tokens=1000)
             )
             questions = response.content[0].text.strip().split("\n")
             return [q for q in questions if q.strip()]
@@ -164,9 +181,8 @@ Format each question on a new line, starting with "- ".
     async def _generate_with_gemini(self, prompt: str) -> List[str]:
         """Generate questions using Gemini."""
         try:
-            model = genai.GenerativeModel('gemini-pro')
-            response = model.generate_content(prompt)  # Using sync version for now
-            questions = response.text.strip().split("\n")
+            text = await gemini_adapter.generate(prompt, 'gemini-pro')
+            questions = text.strip().split("\n")
             return [q for q in questions if q.strip()]
         except Exception as e:
             logger.error(f"Gemini generation error: {str(e)}")
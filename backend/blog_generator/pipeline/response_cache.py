@@ -0,0 +1,169 @@
+"""
+Disk-backed cache for LLM completions.
+Responses are stored in SQLite per model namespace, keyed by a hash of the
+full request, expire after a TTL and are evicted least-recently-used once
+the cache is full.
+"""
+from typing import Any, Dict, Optional
+from pathlib import Path
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+def request_digest(**request: Any) -> str:
+    """Content address of a completion request"""
+    payload = json.dumps(request, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """SQLite-backed completion cache keyed by (namespace, request hash)"""
+
+    def __init__(self, path: str = ":memory:", ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                 max_entries: int = 10_000):
+        """Open or create the cache
+
+        Args:
+            path: SQLite file path, or ":memory:" for a process-local cache
+            ttl_seconds: Age after which a response is no longer served; None keeps responses forever
+            max_entries: Maximum number of responses kept before LRU eviction
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                namespace TEXT NOT NULL,
+                request_hash TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (namespace, request_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, namespace: str, request_hash: str) -> Optional[str]:
+        """Look up a cached response
+
+        Args:
+            namespace: Model namespace, e.g. "gpt4:gpt-4"
+            request_hash: Digest from request_digest
+
+        Returns:
+            The cached response, or None if missing or older than the TTL
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE namespace = ? AND request_hash = ?",
+                (namespace, request_hash)
+            ).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE namespace = ? AND request_hash = ?",
+                    (namespace, request_hash)
+                )
+                self._size -= 1
+                row = None
+            elif row is not None:
+                self._conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE namespace = ? AND request_hash = ?",
+                    (now, namespace, request_hash)
+                )
+            self._conn.commit()
+            counters = self._counters.setdefault(namespace, {"hits": 0, "misses": 0})
+            counters["hits" if row is not None else "misses"] += 1
+        return row[0] if row is not None else None
+
+    def put(self, namespace: str, request_hash: str, response: str) -> None:
+        """Store a response, replacing any earlier one for the same request"""
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM responses WHERE namespace = ? AND request_hash = ?",
+                (namespace, request_hash)
+            ).fetchone() is not None
+            self._conn.execute(
+                """
+                INSERT INTO responses (namespace, request_hash, response, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (namespace, request_hash) DO UPDATE SET
+                    response = excluded.response,
+                    created_at = excluded.created_at,
+                    last_access = excluded.last_access
+                """,
+                (namespace, request_hash, response, now, now)
+            )
+            if not exists:
+                self._size += 1
+            if self._size > self.max_entries:
+                self._evict(self._size - self.max_entries)
+            self._conn.commit()
+
+    def _evict(self, count: int) -> None:
+        """Drop expired entries, then the least-recently-used ones (caller holds the lock)"""
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self._size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            count = self._size - self.max_entries
+        if count > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE rowid IN "
+                "(SELECT rowid FROM responses ORDER BY last_access ASC LIMIT ?)",
+                (count,)
+            )
+            self._size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        logger.debug(f"Evicted LLM responses from cache, {self._size} remain")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters overall and per namespace, and current size"""
+        with self._lock:
+            namespaces = {name: dict(counters) for name, counters in self._counters.items()}
+        hits = sum(counters["hits"] for counters in namespaces.values())
+        misses = sum(counters["misses"] for counters in namespaces.values())
+        for counters in namespaces.values():
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "entries": self._size,
+            "max_entries": self.max_entries,
+            "namespaces": namespaces
+        }
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Remove cached responses for one namespace, or all of them and reset counters"""
+        with self._lock:
+            if namespace is None:
+                self._conn.execute("DELETE FROM responses")
+                self._counters.clear()
+            else:
+                self._conn.execute("DELETE FROM responses WHERE namespace = ?", (namespace,))
+                self._counters.pop(namespace, None)
+            self._conn.commit()
+            self._size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,202 @@
+"""
+Incremental indexer keeping a VectorStore collection in sync with the poem
+corpus (frontend/public/poems/Poems/*.md).
+
+A JSON manifest records (path, mtime, size, sha256, chunk ids) per poem.
+Unchanged files are skipped on a stat check alone; only added or edited
+poems are re-embedded, and chunks of removed poems are deleted.
+
+Usage (from backend/):
+    python -m blog_generator.poem_indexer
+"""
+from typing import Dict, List, Optional, Tuple, Union
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+
+from .vector_store import Document, VectorStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POEMS_DIR = Path(__file__).resolve().parents[2] / "frontend" / "public" / "poems" / "Poems"
+
+def split_frontmatter(text: str) -> Tuple[Dict[str, str], str]:
+    """Split a poem file into flat frontmatter fields and body
+
+    Args:
+        text: Raw markdown file contents
+
+    Returns:
+        (frontmatter fields with surrounding quotes stripped, body)
+    """
+    if not text.startswith("---"):
+        return {}, text
+    end = text.find("\n---", 3)
+    if end == -1:
+        return {}, text
+    fields = {}
+    for line in text[3:end].splitlines():
+        key, sep, value = line.partition(":")
+        if sep and key.strip():
+            fields[key.strip()] = value.strip().strip('"').strip("'")
+    body = text[end + 4:].lstrip("\r\n")
+    return fields, body
+
+class PoemIndexer:
+    """Incrementally sync a directory of markdown poems into a collection"""
+
+    def __init__(
+        self,
+        store: VectorStore,
+        poems_dir: Union[str, Path] = DEFAULT_POEMS_DIR,
+        collection_name: str = "poems",
+        manifest_path: Optional[Union[str, Path]] = None,
+        pattern: str = "*.md"
+    ):
+        """Initialize the indexer
+
+        Args:
+            store: Vector store holding the poem collection
+            poems_dir: Directory of poem markdown files
+            collection_name: Collection the poems are indexed into
+            manifest_path: Manifest JSON file, defaults to
+                <persist_directory>/<collection_name>_manifest.json
+            pattern: Glob selecting poem files
+        """
+        self.store = store
+        self.poems_dir = Path(poems_dir)
+        self.collection_name = collection_name
+        self.pattern = pattern
+        if manifest_path is None:
+            base = store.persist_path or Path.cwd()
+            manifest_path = base / f"{collection_name}_manifest.json"
+        self.manifest_path = Path(manifest_path)
+        self.manifest = self._load_manifest()
+        store.client.get_or_create_collection(collection_name)
+
+    def sync(self) -> Dict[str, float]:
+        """Bring the collection in line with the poems directory
+
+        Returns:
+            Counts of added, updated, removed and unchanged poems, chunks
+            embedded and elapsed seconds
+        """
+        start = time.perf_counter()
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0, "chunks": 0}
+        seen = set()
+        stale_ids: List[str] = []
+        documents: List[Document] = []
+        changed = False
+
+        for path in sorted(self.poems_dir.glob(self.pattern)):
+            key = path.name
+            seen.add(key)
+            stat = path.stat()
+            entry = self.manifest.get(key)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                stats["unchanged"] += 1
+                continue
+
+            text = path.read_text(encoding="utf-8")
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            if entry and entry["sha256"] == digest:
+                # Touched but not edited: refresh the stat fields only
+                entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                stats["unchanged"] += 1
+                changed = True
+                continue
+
+            poem_documents = self._poem_documents(key, text)
+            if entry:
+                stale_ids.extend(entry["ids"])
+                stats["updated"] += 1
+            else:
+                stats["added"] += 1
+            documents.extend(poem_documents)
+            self.manifest[key] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": digest,
+                "ids": [document.id for document in poem_documents]
+            }
+            changed = True
+
+        for key in [key for key in self.manifest if key not in seen]:
+            stale_ids.extend(self.manifest.pop(key)["ids"])
+            stats["removed"] += 1
+            changed = True
+
+        # Chunk ids are reused when an edited poem is re-added, so delete first
+        self.store.delete_documents(stale_ids, collection_name=self.collection_name)
+        if documents:
+            self.store.add_documents_bulk(documents, collection_name=self.collection_name)
+        if changed:
+            self._save_manifest()
+
+        stats["chunks"] = len(documents)
+        stats["seconds"] = time.perf_counter() - start
+        logger.info(
+            f"Poem sync: {stats['added']} added, {stats['updated']} updated, {stats['removed']} removed, "
+            f"{stats['unchanged']} unchanged in {stats['seconds']:.3f}s"
+        )
+        return stats
+
+    def rebuild(self) -> Dict[str, float]:
+        """Drop every indexed poem and index the directory from scratch"""
+        stale_ids = [doc_id for entry in self.manifest.values() for doc_id in entry["ids"]]
+        self.store.delete_documents(stale_ids, collection_name=self.collection_name)
+        self.manifest = {}
+        return self.sync()
+
+    def _poem_documents(self, key: str, text: str) -> List[Document]:
+        """Chunk one poem body into documents carrying its frontmatter"""
+        fields, body = split_frontmatter(text)
+        metadata = {
+            "title": Path(key).stem,
+            "published": fields.get("published", ""),
+            "description": fields.get("description", "")
+        }
+        return [
+            Document(
+                content=chunk.text,
+                metadata={**metadata, **chunk.to_metadata()},
+                id=f"{chunk.source}#{chunk.index}"
+            )
+            for chunk in self.store.chunker.chunk_text(body, source=key)
+        ]
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        """Read the manifest, or start empty"""
+        if not self.manifest_path.exists():
+            return {}
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self) -> None:
+        """Write the manifest atomically"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally index the poem corpus")
+    parser.add_argument("--poems", default=str(DEFAULT_POEMS_DIR), help="Poem markdown directory")
+    parser.add_argument("--db", default="vector_db", help="Vector store persist directory")
+    parser.add_argument("--collection", default="poems")
+    parser.add_argument("--rebuild", action="store_true", help="Re-embed every poem")
+    args = parser.parse_args()
+
+    store = VectorStore(persist_directory=args.db)
+    indexer = PoemIndexer(store, args.poems, collection_name=args.collection)
+    stats = indexer.rebuild() if args.rebuild else indexer.sync()
+    print(json.dumps(stats, indent=2))
+    store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+Retrieval components backing the vector store.
+"""
+from .embedding_cache import EmbeddingCache, embedding_namespace
+from .chunking import Chunk, TextChunker, regex_token_spans
+from .filters import matches_where
+from .numpy_backend import NumpyClient, NumpyCollection
+from .sparse_index import BM25Index
+from .near_duplicates import MinHasher, NearDuplicateIndex
+from .snapshot import Snapshot, read_snapshot, write_snapshot
+from .result_cache import QueryResultCache
+from .encoder_pool import EncoderPool, load_sentence_transformer
+from .section_metrics import SectionMetricsStore
+from .sharding import ShardedCollection
+from .model_registry import MODEL_REGISTRY, ModelRegistry
+
+__all__ = ['EmbeddingCache', 'embedding_namespace', 'Chunk', 'TextChunker', 'regex_token_spans',
+           'matches_where', 'NumpyClient', 'NumpyCollection', 'BM25Index', 'MinHasher', 'NearDuplicateIndex',
+           'EncoderPool', 'load_sentence_transformer', 'Snapshot', 'read_snapshot', 'write_snapshot',
+           'QueryResultCache', 'SectionMetricsStore', 'ShardedCollection',
+           'MODEL_REGISTRY', 'ModelRegistry']
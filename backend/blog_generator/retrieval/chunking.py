@@ -0,0 +1,178 @@
+"""
+Streaming text chunker with source offset provenance.
+Splits text into overlapping windows measured in characters or tokens while
+reading files incrementally, so large transcripts never sit fully in memory.
+"""
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from dataclasses import dataclass
+from pathlib import Path
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Tokenizer contract: text -> list of (start, end) character spans
+Tokenizer = Callable[[str], List[Tuple[int, int]]]
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+def regex_token_spans(text: str) -> List[Tuple[int, int]]:
+    """Approximate subword tokenization: words and punctuation marks"""
+    return [match.span() for match in _TOKEN_PATTERN.finditer(text)]
+
+@dataclass
+class Chunk:
+    """A window of a source text with its character offsets"""
+    text: str
+    source: str
+    index: int
+    start: int
+    end: int
+
+    def to_metadata(self) -> Dict[str, str]:
+        """Provenance metadata for storing the chunk"""
+        return {
+            "source": self.source,
+            "chunk_index": str(self.index),
+            "start_offset": str(self.start),
+            "end_offset": str(self.end)
+        }
+
+class TextChunker:
+    """Yields overlapping chunks lazily from strings, files and directories"""
+
+    def __init__(self,
+                 chunk_size: int = 1000,
+                 chunk_overlap: int = 200,
+                 unit: str = "chars",
+                 tokenizer: Optional[Tokenizer] = None,
+                 read_size: int = 64 * 1024):
+        """Configure the chunker
+
+        Args:
+            chunk_size: Maximum chunk length in units
+            chunk_overlap: Units shared between consecutive chunks
+            unit: "chars" or "tokens"
+            tokenizer: Span tokenizer used in token mode, defaults to regex_token_spans
+            read_size: Characters read from a file per block
+        """
+        if unit not in ("chars", "tokens"):
+            raise ValueError(f"unit must be 'chars' or 'tokens', got {unit}")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap must be non-negative and smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.unit = unit
+        self.tokenizer = tokenizer or regex_token_spans
+        self.read_size = read_size
+
+    def chunk_text(self, text: str, source: str = "") -> Iterator[Chunk]:
+        """Chunk an in-memory string"""
+        return self._chunk_blocks([text], source)
+
+    def chunk_file(self, path: Union[str, Path], encoding: str = "utf-8") -> Iterator[Chunk]:
+        """Chunk a file, reading it in read_size blocks
+
+        Offsets are character positions in the decoded file.
+        """
+        path = Path(path)
+
+        def blocks():
+            # newline="" keeps offsets aligned with the file contents
+            with open(path, "r", encoding=encoding, newline="") as f:
+                while True:
+                    block = f.read(self.read_size)
+                    if not block:
+                        return
+                    yield block
+
+        return self._chunk_blocks(blocks(), str(path))
+
+    def chunk_directory(self, directory: Union[str, Path], pattern: str = "*.md") -> Iterator[Chunk]:
+        """Chunk every file matching pattern under directory, one file at a time"""
+        for path in sorted(Path(directory).rglob(pattern)):
+            if path.is_file():
+                yield from self.chunk_file(path)
+
+    def _chunk_blocks(self, blocks: Iterable[str], source: str) -> Iterator[Chunk]:
+        if self.unit == "tokens":
+            return self._token_chunks(iter(blocks), source)
+        return self._char_chunks(iter(blocks), source)
+
+    def _char_chunks(self, blocks: Iterator[str], source: str) -> Iterator[Chunk]:
+        """Character windows, preferring to end on whitespace"""
+        buffer = ""
+        offset = 0  # absolute position of buffer[0]
+        pos = 0
+        index = 0
+        eof = False
+
+        while True:
+            while not eof and len(buffer) - pos <= self.chunk_size:
+                block = next(blocks, None)
+                if block is None:
+                    eof = True
+                else:
+                    buffer += block
+            if pos >= len(buffer):
+                return
+
+            end = min(pos + self.chunk_size, len(buffer))
+            if end < len(buffer):
+                end = self._break_point(buffer, pos, end)
+            yield Chunk(buffer[pos:end], source, index, offset + pos, offset + end)
+            index += 1
+            if end >= len(buffer):
+                return
+
+            pos = end - self.chunk_overlap if end - self.chunk_overlap > pos else end
+            # Drop consumed text so memory stays bounded by chunk and block size
+            if pos > self.read_size:
+                buffer = buffer[pos:]
+                offset += pos
+                pos = 0
+
+    @staticmethod
+    def _break_point(buffer: str, start: int, end: int) -> int:
+        """Last whitespace in the second half of the window, or end"""
+        half = start + (end - start) // 2
+        for separator in ("\n\n", "\n", " "):
+            cut = buffer.rfind(separator, half, end)
+            if cut != -1:
+                return cut + len(separator)
+        return end
+
+    def _token_chunks(self, blocks: Iterator[str], source: str) -> Iterator[Chunk]:
+        """Token windows; chunk text spans from first to last token"""
+        buffer = ""
+        offset = 0
+        spans: List[Tuple[int, int]] = []
+        index = 0
+        eof = False
+        step = self.chunk_size - self.chunk_overlap
+
+        while True:
+            # The final span may be cut by a block boundary, so keep one spare
+            while not eof and len(spans) <= self.chunk_size:
+                block = next(blocks, None)
+                if block is None:
+                    eof = True
+                    break
+                retokenize_from = spans.pop()[0] if spans else 0
+                buffer += block
+                spans.extend((s + retokenize_from, e + retokenize_from)
+                             for s, e in self.tokenizer(buffer[retokenize_from:]))
+            if not spans:
+                return
+
+            window = spans[:self.chunk_size]
+            start, end = window[0][0], window[-1][1]
+            yield Chunk(buffer[start:end], source, index, offset + start, offset + end)
+            index += 1
+            if len(spans) <= self.chunk_size:
+                return
+
+            drop = spans[step][0]
+            spans = [(s - drop, e - drop) for s, e in spans[step:]]
+            buffer = buffer[drop:]
+            offset += drop
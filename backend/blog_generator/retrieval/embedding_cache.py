@@ -0,0 +1,167 @@
+"""
+Content-addressed, disk-backed cache for text embeddings.
+Vectors are stored as float32 blobs in SQLite and evicted least-recently-used.
+"""
+from typing import Dict, List, Optional, Any, Sequence
+from pathlib import Path
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def embedding_namespace(model_name: str, embedding_config: Optional[Dict[str, Any]] = None) -> str:
+    """Build the cache namespace for a model and its embedding configuration"""
+    payload = json.dumps(
+        {"model": model_name, "config": embedding_config or {}},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def text_digest(text: str) -> str:
+    """Content address of a text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache keyed by (namespace, sha256(text))"""
+
+    def __init__(self, path: str = ":memory:", max_entries: int = 100_000):
+        """Open or create the cache
+
+        Args:
+            path: SQLite file path, or ":memory:" for a process-local cache
+            max_entries: Maximum number of vectors kept before LRU eviction
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                namespace TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (namespace, text_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings (last_access)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, namespace: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Look up cached vectors for texts
+
+        Args:
+            namespace: Cache namespace from embedding_namespace
+            texts: Texts to look up
+
+        Returns:
+            List aligned with texts holding float32 vectors or None for misses
+        """
+        digests = [text_digest(text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            unique = list(dict.fromkeys(digests))
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE namespace = ? AND text_hash IN ({placeholders})",
+                    [namespace, *chunk]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype="<f4")
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE namespace = ? AND text_hash = ?",
+                    [(now, namespace, text_hash) for text_hash in found]
+                )
+                self._conn.commit()
+
+        results = [found.get(digest) for digest in digests]
+        hits = sum(vector is not None for vector in results)
+        self.hits += hits
+        self.misses += len(results) - hits
+        return results
+
+    def put_many(self, namespace: str, texts: Sequence[str], vectors: Sequence[np.ndarray]) -> None:
+        """Store vectors for texts, evicting least-recently-used entries if needed
+
+        Args:
+            namespace: Cache namespace from embedding_namespace
+            texts: Texts that were embedded
+            vectors: Embeddings aligned with texts
+        """
+        now = time.time()
+        rows = []
+        for text, vector in zip(texts, vectors):
+            array = np.asarray(vector, dtype="<f4")
+            rows.append((namespace, text_digest(text), array.shape[-1], array.tobytes(), now))
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (namespace, text_hash, dim, vector, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._size += self._conn.total_changes - before
+            if self._size > self.max_entries:
+                self._evict(self._size - self.max_entries)
+            self._conn.commit()
+
+    def _evict(self, count: int) -> None:
+        """Drop the count least-recently-used entries (caller holds the lock)"""
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE rowid IN "
+            "(SELECT rowid FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (count,)
+        )
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        logger.debug(f"Evicted {count} embeddings from cache, {self._size} remain")
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": self._size,
+            "max_entries": self.max_entries
+        }
+
+    def clear(self) -> None:
+        """Remove all cached vectors and reset counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,161 @@
+"""
+Multi-process SentenceTransformer encoding for large ingest jobs.
+
+Each worker process loads the model once. Texts are sorted by length and
+dealt out in batches so every batch pads to similar lengths, and workers
+write their vectors straight into a shared-memory output matrix instead of
+pickling them back to the parent.
+"""
+from typing import Callable, List, Optional, Sequence
+from multiprocessing import get_context, shared_memory
+import logging
+import os
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Per-process state set up by _init_worker
+_worker_model = None
+_worker_error: Optional[str] = None
+
+def load_sentence_transformer(model_name: str):
+    """Default worker loader; imports sentence-transformers inside the worker"""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+def _init_worker(model_name: str, loader: Callable[[str], object], threads: int) -> None:
+    """Load the model once per worker and cap its intra-op threads
+
+    A failing loader is recorded rather than raised: an initializer that
+    raises makes the pool respawn the worker forever, so tasks report the
+    error to the parent instead.
+    """
+    global _worker_model, _worker_error
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    try:
+        _worker_model = loader(model_name)
+    except Exception as e:
+        _worker_error = f"Failed to load {model_name} in encoder worker: {type(e).__name__}: {e}"
+
+def _check_worker() -> None:
+    """Raise the worker's model loading error, if any"""
+    if _worker_error is not None:
+        raise RuntimeError(_worker_error)
+
+def _worker_dimension() -> int:
+    """Embedding dimension of the worker's model"""
+    _check_worker()
+    return int(_worker_model.get_sentence_embedding_dimension())
+
+def _encode_into(shm_name: str, shape: tuple, positions: List[int], texts: List[str]) -> int:
+    """Encode one batch and write the rows into the shared output matrix"""
+    _check_worker()
+    vectors = np.asarray(_worker_model.encode(texts, batch_size=len(texts)), dtype=np.float32)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        output = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        output[positions] = vectors
+        del output
+    finally:
+        shm.close()
+    return len(texts)
+
+class EncoderPool:
+    """Process pool of SentenceTransformer workers"""
+
+    def __init__(
+        self,
+        model_name: str,
+        processes: Optional[int] = None,
+        batch_size: int = 64,
+        loader: Callable[[str], object] = load_sentence_transformer,
+        start_method: str = "spawn",
+        timeout: Optional[float] = 600.0
+    ):
+        """Start the workers and check that they loaded the model
+
+        Args:
+            model_name: SentenceTransformer model name
+            processes: Worker count, defaults to the number of CPUs
+            batch_size: Texts per worker task
+            loader: Picklable callable building the model inside a worker
+            start_method: multiprocessing start method; spawn avoids forking
+                a parent that already initialized torch
+            timeout: Seconds to wait for a worker result before giving up,
+                None waits forever
+
+        Raises:
+            RuntimeError: If the workers could not load the model
+            multiprocessing.TimeoutError: If the workers did not answer in time
+        """
+        cpus = os.cpu_count() or 1
+        self.model_name = model_name
+        self.processes = processes or cpus
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._pool = get_context(start_method).Pool(
+            self.processes,
+            initializer=_init_worker,
+            initargs=(model_name, loader, max(1, cpus // self.processes))
+        )
+        try:
+            self.dimension = self._pool.apply_async(_worker_dimension).get(timeout)
+        except BaseException:
+            self._pool.terminate()
+            self._pool.join()
+            raise
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Encode texts across the pool
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            2-D float32 array aligned with texts
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        start = time.perf_counter()
+        shape = (len(texts), self.dimension)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        tasks = [
+            (order[begin:begin + self.batch_size], [texts[i] for i in order[begin:begin + self.batch_size]])
+            for begin in range(0, len(order), self.batch_size)
+        ]
+
+        shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 4, 1))
+        try:
+            pending = [
+                self._pool.apply_async(_encode_into, (shm.name, shape, positions, batch))
+                for positions, batch in tasks
+            ]
+            for result in pending:
+                result.get(self.timeout)
+            output = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+            vectors = output.copy()
+            del output
+        finally:
+            shm.close()
+            shm.unlink()
+
+        elapsed = time.perf_counter() - start
+        logger.debug(f"Encoded {len(texts)} texts on {self.processes} processes in {elapsed:.2f}s")
+        return vectors
+
+    def close(self) -> None:
+        """Stop the workers"""
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self) -> "EncoderPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
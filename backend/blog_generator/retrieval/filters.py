@@ -0,0 +1,52 @@
+"""
+Evaluation of Chroma-style `where` metadata filters outside of Chroma.
+"""
+from typing import Any, Dict, Optional
+
+_COMPARISONS = {
+    "$eq": lambda value, target: value == target,
+    "$ne": lambda value, target: value != target,
+    "$gt": lambda value, target: value is not None and value > target,
+    "$gte": lambda value, target: value is not None and value >= target,
+    "$lt": lambda value, target: value is not None and value < target,
+    "$lte": lambda value, target: value is not None and value <= target,
+    "$in": lambda value, target: value in target,
+    "$nin": lambda value, target: value not in target,
+}
+
+def matches_where(metadata: Optional[Dict[str, Any]], where: Optional[Dict[str, Any]]) -> bool:
+    """Check whether metadata satisfies a Chroma `where` filter
+
+    Supports field equality, the $eq/$ne/$gt/$gte/$lt/$lte/$in/$nin operators
+    and $and/$or combinations.
+
+    Args:
+        metadata: Record metadata
+        where: Filter in Chroma syntax, or None to match everything
+
+    Returns:
+        True if the record matches
+    """
+    if not where:
+        return True
+    metadata = metadata or {}
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for operator, target in condition.items():
+                if operator not in _COMPARISONS:
+                    raise ValueError(f"Unsupported where operator: {operator}")
+                try:
+                    if not _COMPARISONS[operator](value, target):
+                        return False
+                except TypeError:
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
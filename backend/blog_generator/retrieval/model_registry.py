@@ -0,0 +1,81 @@
+"""
+Process-wide registry of embedding models.
+Models are loaded on first use and shared by every VectorStore in the
+process, so constructing a store never pays model start-up cost.
+"""
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ModelLoader = Callable[[str], Any]
+
+class ModelRegistry:
+    """Thread-safe lazy cache of loaded models keyed by loader and model name"""
+
+    def __init__(self):
+        self._models: Dict[Tuple[Hashable, str], Any] = {}
+        self._locks: Dict[Tuple[Hashable, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str, loader: ModelLoader) -> Any:
+        """Return the shared model, loading it on the first call
+
+        Concurrent first calls for the same model wait for a single load.
+
+        Args:
+            model_name: Model identifier passed to the loader
+            loader: Callable that builds the model, e.g. SentenceTransformer
+
+        Returns:
+            The loaded model
+        """
+        key = (loader, model_name)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            model = self._models.get(key)
+            if model is None:
+                start = time.perf_counter()
+                model = loader(model_name)
+                self._models[key] = model
+                logger.info(f"Loaded embedding model {model_name} in {time.perf_counter() - start:.2f}s")
+        return model
+
+    def register(self, model_name: str, model: Any, loader: ModelLoader) -> None:
+        """Install an already-built model, e.g. a deterministic stand-in for benchmarks
+
+        Args:
+            model_name: Model identifier stores will ask for
+            model: Object with the loader's model interface (encode, ...)
+            loader: Loader the model is registered under
+        """
+        with self._lock:
+            self._models[(loader, model_name)] = model
+
+    def is_loaded(self, model_name: str, loader: ModelLoader) -> bool:
+        """Whether a model has already been loaded"""
+        return (loader, model_name) in self._models
+
+    def loaded_models(self) -> List[str]:
+        """Names of the models currently held"""
+        return [model_name for _, model_name in self._models]
+
+    def evict(self, model_name: str) -> None:
+        """Drop every loaded instance of a model so its memory can be reclaimed"""
+        with self._lock:
+            for key in [key for key in self._models if key[1] == model_name]:
+                del self._models[key]
+
+    def clear(self) -> None:
+        """Drop all loaded models"""
+        with self._lock:
+            self._models.clear()
+
+# Shared by all VectorStore instances in the process
+MODEL_REGISTRY = ModelRegistry()
@@ -0,0 +1,204 @@
+"""
+MinHash signatures with LSH banding for near-duplicate detection.
+Signatures are persisted in SQLite; band buckets are rebuilt in memory per
+collection on first use, so a lookup costs one signature and a few dict hits.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+from pathlib import Path
+import logging
+import re
+import sqlite3
+import threading
+import zlib
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Largest prime below 2**32; keeps a * x + b inside uint64
+_PRIME = np.uint64(4294967291)
+
+_WHITESPACE = re.compile(r"\s+")
+
+class MinHasher:
+    """Character-shingle MinHash signatures"""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        """Initialize the permutations
+
+        Args:
+            num_perm: Signature length
+            shingle_size: Characters per shingle
+            seed: Permutation seed; signatures are only comparable for equal seeds
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> Set[str]:
+        """Whitespace-normalized, lowercased character shingles"""
+        text = _WHITESPACE.sub(" ", text.lower()).strip()
+        if len(text) <= self.shingle_size:
+            return {text}
+        return {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text as a uint32 vector"""
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in self.shingles(text)),
+            dtype=np.uint64
+        )
+        permuted = (hashes[:, None] * self._a[None, :] + self._b[None, :]) % _PRIME
+        return permuted.min(axis=0).astype(np.uint32)
+
+def estimate_jaccard(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(first == second))
+
+class NearDuplicateIndex:
+    """Persisted MinHash signatures with an in-memory LSH band index"""
+
+    def __init__(self, path: str = ":memory:", num_perm: int = 128, bands: int = 32):
+        """Open or create the index
+
+        With the defaults (32 bands of 4 rows) pairs above roughly 0.45
+        Jaccard become candidates.
+
+        Args:
+            path: SQLite file path, or ":memory:"
+            num_perm: Signature length, must be divisible by bands
+            bands: Number of LSH bands
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._lock = threading.Lock()
+        self._signatures: Dict[str, Dict[str, np.ndarray]] = {}
+        self._buckets: Dict[str, Dict[Tuple[int, bytes], Set[str]]] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS signatures (
+                collection TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                PRIMARY KEY (collection, doc_id)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text"""
+        return self.hasher.signature(text)
+
+    def add(self, collection: str, ids: List[str], signatures: List[np.ndarray]) -> None:
+        """Record signatures of stored documents"""
+        self._load(collection)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO signatures (collection, doc_id, signature) VALUES (?, ?, ?)",
+                [(collection, doc_id, signature.astype("<u4").tobytes())
+                 for doc_id, signature in zip(ids, signatures)]
+            )
+            self._conn.commit()
+            for doc_id, signature in zip(ids, signatures):
+                self._index(collection, doc_id, signature)
+
+    def delete(self, collection: str, ids: List[str]) -> None:
+        """Forget signatures of deleted documents"""
+        self._load(collection)
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM signatures WHERE collection = ? AND doc_id = ?",
+                [(collection, doc_id) for doc_id in ids]
+            )
+            self._conn.commit()
+            signatures = self._signatures[collection]
+            for doc_id in ids:
+                signature = signatures.pop(doc_id, None)
+                if signature is not None:
+                    for key in self._band_keys(signature):
+                        self._buckets[collection].get(key, set()).discard(doc_id)
+
+    def delete_collection(self, collection: str) -> None:
+        """Drop every signature of a collection"""
+        with self._lock:
+            self._conn.execute("DELETE FROM signatures WHERE collection = ?", (collection,))
+            self._conn.commit()
+            self._signatures.pop(collection, None)
+            self._buckets.pop(collection, None)
+
+    def candidates(self, collection: str, signature: np.ndarray) -> Set[str]:
+        """Ids sharing at least one LSH band with the signature"""
+        buckets = self._load(collection)
+        found = set()
+        for key in self._band_keys(signature):
+            found |= buckets.get(key, set())
+        return found
+
+    def best_match(self, collection: str, signature: np.ndarray) -> Tuple[Optional[str], float, int]:
+        """Closest stored document among the LSH candidates
+
+        Returns:
+            (doc_id or None, estimated Jaccard similarity, candidate count)
+        """
+        candidates = self.candidates(collection, signature)
+        signatures = self._signatures[collection]
+        best_id, best_score = None, 0.0
+        for doc_id in candidates:
+            score = estimate_jaccard(signature, signatures[doc_id])
+            if score > best_score:
+                best_id, best_score = doc_id, score
+        return best_id, best_score, len(candidates)
+
+    def ids(self, collection: str) -> Set[str]:
+        """Ids with a stored signature in a collection"""
+        self._load(collection)
+        with self._lock:
+            return set(self._signatures[collection])
+
+    def count(self, collection: str) -> int:
+        """Number of signatures stored for a collection"""
+        self._load(collection)
+        return len(self._signatures[collection])
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        """Bucket key of each band"""
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _index(self, collection: str, doc_id: str, signature: np.ndarray) -> None:
+        """Insert a signature into the in-memory structures (caller holds the lock)"""
+        self._signatures[collection][doc_id] = signature
+        buckets = self._buckets[collection]
+        for key in self._band_keys(signature):
+            buckets.setdefault(key, set()).add(doc_id)
+
+    def _load(self, collection: str) -> Dict[Tuple[int, bytes], Set[str]]:
+        """Band buckets of a collection, rebuilt from SQLite on first use"""
+        if collection not in self._buckets:
+            with self._lock:
+                if collection not in self._buckets:
+                    self._signatures[collection] = {}
+                    self._buckets[collection] = {}
+                    rows = self._conn.execute(
+                        "SELECT doc_id, signature FROM signatures WHERE collection = ?", (collection,)
+                    ).fetchall()
+                    for doc_id, blob in rows:
+                        self._index(collection, doc_id, np.frombuffer(blob, dtype="<u4").astype(np.uint32))
+        return self._buckets[collection]
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
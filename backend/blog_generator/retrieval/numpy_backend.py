@@ -0,0 +1,533 @@
+"""
+In-process exact-search backend for small corpora.
+Keeps pre-normalized float32 embeddings in one contiguous NumPy matrix and
+answers top-k with a single matmul plus argpartition. Exposes the subset of
+the Chroma client/collection API that VectorStore uses, so it can be swapped
+in through VECTOR_STORE_CONFIG["backend"].
+
+Collections can search a float16 or int8 copy of the matrix instead; the
+float32 originals then stay memory-mapped on disk and are only read to
+re-rank the top candidates.
+
+Snapshots (see snapshot.py) can be mounted as collections without copying:
+the matrix stays memory-mapped and records are decoded on access.
+
+Writes are appended to a journal next to embeddings.npy and records.json;
+the journal is folded into those files once it outgrows a fraction of the
+collection, and when the collection is next opened.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+from pathlib import Path
+import base64
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+from .filters import matches_where
+from .quantization import STORAGE_DTYPES, quantize, quantized_scores, storage_bytes
+from .snapshot import Snapshot
+
+logger = logging.getLogger(__name__)
+
+# Journaled rows before a compaction, at least this many or a quarter of the collection
+COMPACT_MIN_ROWS = 1024
+COMPACT_FRACTION = 0.25
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length, leaving zero rows untouched"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def _duplicate_ids(ids: Sequence[str]) -> set:
+    """Ids that occur more than once in ids"""
+    seen, duplicates = set(), set()
+    for record_id in ids:
+        if record_id in seen:
+            duplicates.add(record_id)
+        seen.add(record_id)
+    return duplicates
+
+class NumpyCollection:
+    """Exact cosine-distance collection backed by a float32 matrix"""
+
+    def __init__(self, name: str, metadata: Optional[Dict[str, Any]] = None,
+                 directory: Optional[Path] = None, storage: str = "float32",
+                 rerank_factor: int = 0):
+        """Create an empty collection or load one from directory
+
+        Args:
+            name: Collection name
+            metadata: Collection metadata
+            directory: Directory holding embeddings.npy and records.json, None for in-memory
+            storage: Search matrix dtype, "float32", "float16" or "int8"
+            rerank_factor: With quantized storage, re-rank k * rerank_factor candidates
+                at full precision (0 disables re-ranking)
+        """
+        if storage not in STORAGE_DTYPES:
+            raise ValueError(f"Unsupported storage dtype: {storage}, expected one of {STORAGE_DTYPES}")
+        self.name = name
+        self.storage = storage
+        self.rerank_factor = rerank_factor
+        self.metadata = metadata or {}
+        self.directory = directory
+        self._ids: List[str] = []
+        self._documents: List[Optional[str]] = []
+        self._metadatas: List[Optional[Dict[str, Any]]] = []
+        # Full-precision rows live in _matrix (memory-mapped once persisted) and,
+        # for quantized storage, _tail (rows added since the last compaction);
+        # _rows maps each record position to its row in _matrix followed by _tail
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._tail = np.empty((0, 0), dtype=np.float32)
+        self._rows = np.empty(0, dtype=np.int64)
+        self._search_matrix, self._scales = quantize(self._matrix, storage)
+        self._index: Dict[str, int] = {}
+        self._journal_rows = 0
+        self._lock = threading.RLock()
+        if directory is not None and (directory / "records.json").exists():
+            self._load()
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot, name: Optional[str] = None,
+                      storage: str = "float32", rerank_factor: int = 0) -> "NumpyCollection":
+        """Mount an opened snapshot as an in-memory collection
+
+        The embedding matrix stays memory-mapped (normalized snapshots are
+        used as-is) and documents/metadata are decoded lazily. The first
+        write copies the records into memory; writes are not persisted.
+
+        Args:
+            snapshot: Snapshot returned by read_snapshot
+            name: Collection name, defaults to the snapshot's
+            storage: Search matrix dtype
+            rerank_factor: Full-precision re-rank multiplier for quantized storage
+        """
+        collection = cls(name or snapshot.name, metadata=snapshot.metadata,
+                         storage=storage, rerank_factor=rerank_factor)
+        collection._ids = list(snapshot.ids)
+        collection._documents = snapshot.documents
+        collection._metadatas = snapshot.metadatas
+        collection._index = {record_id: i for i, record_id in enumerate(collection._ids)}
+        if collection._ids:
+            matrix = snapshot.embeddings
+            if not snapshot.manifest.get("normalized"):
+                matrix = _normalize(np.asarray(matrix, dtype=np.float32))
+            collection._matrix = matrix
+            collection._rows = np.arange(len(collection._ids), dtype=np.int64)
+            collection._build_search_matrix()
+        return collection
+
+    def count(self) -> int:
+        """Number of stored records"""
+        return len(self._ids)
+
+    def add(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]],
+            documents: Optional[Sequence[str]] = None,
+            metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None) -> List[str]:
+        """Add records, skipping ids that already exist (as Chroma does)
+
+        Returns:
+            Ids of the records added, in batch order
+
+        Raises:
+            ValueError: If an id appears more than once in the batch (Chroma
+                raises DuplicateIDError)
+        """
+        duplicates = _duplicate_ids(ids)
+        if duplicates:
+            raise ValueError(f"Duplicate ids in add to collection {self.name}: {sorted(duplicates)}")
+        with self._lock:
+            keep = [i for i, record_id in enumerate(ids) if record_id not in self._index]
+            if len(keep) < len(ids):
+                logger.warning(f"Skipping {len(ids) - len(keep)} existing ids in collection {self.name}")
+            self._journal_add(*self._append(ids, embeddings, documents, metadatas, keep))
+        return [ids[i] for i in keep]
+
+    def upsert(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]],
+               documents: Optional[Sequence[str]] = None,
+               metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None) -> None:
+        """Add records, replacing any with the same id; within a batch the last occurrence wins"""
+        last = {record_id: i for i, record_id in enumerate(ids)}
+        keep = sorted(last.values())
+        with self._lock:
+            existing = [record_id for record_id in last if record_id in self._index]
+            if existing:
+                self._remove(set(existing))
+                self._journal({"op": "delete", "ids": existing}, len(existing))
+            self._journal_add(*self._append(ids, embeddings, documents, metadatas, keep))
+
+    def query(self, query_embeddings: Sequence[Sequence[float]], n_results: int = 10,
+              where: Optional[Dict[str, Any]] = None,
+              include: Optional[List[str]] = None) -> Dict[str, List[List[Any]]]:
+        """Exact top-k by cosine distance (1 - cosine similarity)
+
+        Args:
+            query_embeddings: One or more query vectors
+            n_results: Results per query
+            where: Optional Chroma-style metadata filter
+
+        Returns:
+            Chroma-shaped results with ids, documents, metadatas and distances
+        """
+        queries = _normalize(np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32)))
+        with self._lock:
+            return self._query(queries, n_results, where)
+
+    def _query(self, queries: np.ndarray, n_results: int,
+               where: Optional[Dict[str, Any]]) -> Dict[str, List[List[Any]]]:
+        """Top-k for normalized queries (caller holds the lock)"""
+        rows = self._filter(where)
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+
+        if rows is None:
+            matrix, scales = self._search_matrix, self._scales
+        else:
+            matrix = self._search_matrix[rows]
+            scales = self._scales[rows] if self._scales is not None else None
+        k = min(n_results, matrix.shape[0])
+
+        if k == 0:
+            for key in results:
+                results[key] = [[] for _ in range(len(queries))]
+            return results
+
+        rerank = self.storage != "float32" and self.rerank_factor > 0
+        candidates_per_query = min(k * self.rerank_factor, matrix.shape[0]) if rerank else k
+        scores = quantized_scores(queries, matrix, scales)
+        for query, row_scores in zip(queries, scores):
+            top = self._top_k(row_scores, candidates_per_query)
+            positions = top if rows is None else rows[top]
+            top_scores = row_scores[top]
+            if rerank:
+                # Exact scores for the shortlist from the full-precision matrix
+                exact = self._full_precision(np.sort(positions)) @ query
+                order = np.argsort(np.argsort(positions))
+                top_scores = exact[order]
+                best = self._top_k(top_scores, k)
+                positions, top_scores = positions[best], top_scores[best]
+            results["ids"].append([self._ids[p] for p in positions])
+            results["documents"].append([self._documents[p] for p in positions])
+            results["metadatas"].append([self._metadatas[p] for p in positions])
+            results["distances"].append([float(1.0 - score) for score in top_scores])
+        return results
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Resident bytes of the search matrix and of any in-RAM full-precision copy"""
+        with self._lock:
+            full_precision = 0
+            if self.storage != "float32":
+                full_precision = self._tail.nbytes
+                if not isinstance(self._matrix, np.memmap):
+                    full_precision += self._matrix.nbytes
+            return {
+                "search_bytes": storage_bytes(self._search_matrix, self._scales),
+                "full_precision_bytes": full_precision,
+                "records": self.count()
+            }
+
+    def get(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None,
+            limit: Optional[int] = None, include: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Fetch records by id and/or metadata filter"""
+        with self._lock:
+            if ids is not None:
+                positions = [self._index[record_id] for record_id in ids if record_id in self._index]
+                if where:
+                    positions = [p for p in positions if matches_where(self._metadatas[p], where)]
+            else:
+                candidates = self._filter(where)
+                positions = list(range(self.count())) if candidates is None else candidates.tolist()
+            if limit is not None:
+                positions = positions[:limit]
+
+            if include is None:
+                include = ["documents", "metadatas"]
+            result = {"ids": [self._ids[p] for p in positions]}
+            if "documents" in include:
+                result["documents"] = [self._documents[p] for p in positions]
+            if "metadatas" in include:
+                result["metadatas"] = [self._metadatas[p] for p in positions]
+            if "embeddings" in include:
+                result["embeddings"] = self._full_precision(np.asarray(positions, dtype=np.int64))
+            return result
+
+    def delete(self, ids: Optional[Sequence[str]] = None,
+               where: Optional[Dict[str, Any]] = None) -> None:
+        """Delete records by id and/or metadata filter"""
+        with self._lock:
+            targets = self.get(ids=ids, where=where, include=[])["ids"]
+            if targets:
+                self._remove(set(targets))
+                self._journal({"op": "delete", "ids": targets}, len(targets))
+
+    def _full_precision(self, positions: np.ndarray) -> np.ndarray:
+        """Normalized float32 rows of the records at positions"""
+        rows = self._rows[positions]
+        base = self._matrix.shape[0]
+        if not len(self._tail):
+            return np.asarray(self._matrix[rows], dtype=np.float32)
+        if not base:
+            return self._tail[rows]
+        result = np.empty((len(rows), self._tail.shape[1]), dtype=np.float32)
+        in_base = rows < base
+        result[in_base] = self._matrix[rows[in_base]]
+        result[~in_base] = self._tail[rows[~in_base] - base]
+        return result
+
+    def _append(self, ids, embeddings, documents, metadatas, keep: List[int]):
+        """Add the kept records in memory, returning them for the journal"""
+        if not keep:
+            return [], np.empty((0, 0), dtype=np.float32), [], []
+        self._materialize()
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32)[keep])
+        first_row = self._matrix.shape[0] + len(self._tail)
+        if self.storage == "float32":
+            # The search matrix is the full-precision matrix, one row per record in order
+            self._matrix = (np.ascontiguousarray(vectors) if self.count() == 0
+                            else np.concatenate([self._matrix, vectors]))
+            self._search_matrix = self._matrix
+        else:
+            # New full-precision rows wait in RAM for the next compaction, so the
+            # memory-mapped base is never read back in
+            search, scales = quantize(vectors, self.storage)
+            self._tail = vectors if not len(self._tail) else np.concatenate([self._tail, vectors])
+            if self.count() == 0:
+                self._search_matrix, self._scales = search, scales
+            else:
+                self._search_matrix = np.concatenate([self._search_matrix, search])
+                if scales is not None:
+                    self._scales = np.concatenate([self._scales, scales])
+        self._rows = np.concatenate([self._rows, np.arange(first_row, first_row + len(keep), dtype=np.int64)])
+        kept_ids, kept_documents, kept_metadatas = [], [], []
+        for i in keep:
+            self._index[ids[i]] = len(self._ids)
+            self._ids.append(ids[i])
+            self._documents.append(documents[i] if documents is not None else None)
+            self._metadatas.append(metadatas[i] if metadatas is not None else None)
+            kept_ids.append(ids[i])
+            kept_documents.append(self._documents[-1])
+            kept_metadatas.append(self._metadatas[-1])
+        return kept_ids, vectors, kept_documents, kept_metadatas
+
+    def _remove(self, targets: set) -> None:
+        self._materialize()
+        keep = [i for i, record_id in enumerate(self._ids) if record_id not in targets]
+        if self.storage == "float32":
+            self._matrix = self._full_precision(np.asarray(keep, dtype=np.int64))
+            self._search_matrix = self._matrix
+            self._rows = np.arange(len(keep), dtype=np.int64)
+        else:
+            # Only the row map shrinks; dropped rows leave the files at the next compaction
+            self._rows = self._rows[keep]
+            self._search_matrix = np.ascontiguousarray(self._search_matrix[keep])
+            if self._scales is not None:
+                self._scales = self._scales[keep]
+        self._ids = [self._ids[i] for i in keep]
+        self._documents = [self._documents[i] for i in keep]
+        self._metadatas = [self._metadatas[i] for i in keep]
+        self._index = {record_id: i for i, record_id in enumerate(self._ids)}
+
+    def _materialize(self) -> None:
+        """Copy lazily decoded snapshot records into plain lists before a write"""
+        if not isinstance(self._documents, list):
+            self._documents = list(self._documents)
+        if not isinstance(self._metadatas, list):
+            self._metadatas = list(self._metadatas)
+
+    def _filter(self, where: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Row indices matching where, or None when unfiltered"""
+        if not where:
+            return None
+        return np.array([i for i, metadata in enumerate(self._metadatas)
+                         if matches_where(metadata, where)], dtype=np.int64)
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k highest scores, best first"""
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    def _journal_add(self, ids: List[str], vectors: np.ndarray, documents: List[Optional[str]],
+                     metadatas: List[Optional[Dict[str, Any]]]) -> None:
+        if ids:
+            self._journal({
+                "op": "add",
+                "ids": ids,
+                "embeddings": base64.b64encode(vectors.astype("<f4").tobytes()).decode("ascii"),
+                "documents": documents,
+                "metadatas": metadatas
+            }, len(ids))
+
+    def _journal(self, entry: Dict[str, Any], rows: int) -> None:
+        """Append one write to journal.jsonl, compacting once it has grown large enough"""
+        if self.directory is None:
+            return
+        with open(self.directory / "journal.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        self._journal_rows += rows
+        if self._journal_rows > max(COMPACT_MIN_ROWS, COMPACT_FRACTION * self.count()):
+            self._save()
+
+    def _replay_journal(self) -> int:
+        """Apply journaled writes on top of the loaded files, returning how many were applied"""
+        path = self.directory / "journal.jsonl"
+        if not path.exists():
+            return 0
+        applied = 0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A write torn by a crash is the last line; nothing after it was acknowledged
+                    logger.warning(f"Ignoring incomplete journal entry in collection {self.name}")
+                    break
+                if entry["op"] == "add":
+                    vectors = np.frombuffer(base64.b64decode(entry["embeddings"]), dtype="<f4")
+                    vectors = vectors.reshape(len(entry["ids"]), -1)
+                    ids = entry["ids"]
+                    keep = [i for i, record_id in enumerate(ids) if record_id not in self._index]
+                    self._append(ids, vectors, entry["documents"], entry["metadatas"], keep)
+                else:
+                    targets = {record_id for record_id in entry["ids"] if record_id in self._index}
+                    if targets:
+                        self._remove(targets)
+                applied += 1
+        return applied
+
+    def _save(self) -> None:
+        """Write embeddings.npy and records.json atomically and start a new journal"""
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        matrix_tmp = self.directory / "embeddings.tmp.npy"
+        records_tmp = self.directory / "records.json.tmp"
+        # Written in blocks so a memory-mapped base is streamed rather than loaded whole
+        dim = max(self._matrix.shape[1] if self._matrix.ndim == 2 else 0,
+                  self._tail.shape[1] if self._tail.ndim == 2 else 0)
+        out = np.lib.format.open_memmap(matrix_tmp, mode="w+", dtype=np.float32, shape=(self.count(), dim))
+        for start in range(0, self.count(), 65536):
+            stop = min(start + 65536, self.count())
+            out[start:stop] = self._full_precision(np.arange(start, stop))
+        out.flush()
+        del out
+        with open(records_tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "name": self.name,
+                "metadata": self.metadata,
+                "ids": self._ids,
+                "documents": self._documents,
+                "metadatas": self._metadatas
+            }, f)
+        os.replace(matrix_tmp, self.directory / "embeddings.npy")
+        os.replace(records_tmp, self.directory / "records.json")
+        (self.directory / "journal.jsonl").unlink(missing_ok=True)
+        self._journal_rows = 0
+        self._tail = np.empty((0, 0), dtype=np.float32)
+        self._rows = np.arange(self.count(), dtype=np.int64)
+        if self.storage != "float32":
+            # Keep full precision on disk; only the quantized copy stays resident
+            self._matrix = np.load(self.directory / "embeddings.npy", mmap_mode="r")
+
+    def _load(self) -> None:
+        """Load records and memory-map the embedding matrix"""
+        with open(self.directory / "records.json", encoding="utf-8") as f:
+            records = json.load(f)
+        self.metadata = records.get("metadata") or self.metadata
+        self._ids = records["ids"]
+        self._documents = records["documents"]
+        self._metadatas = records["metadatas"]
+        self._index = {record_id: i for i, record_id in enumerate(self._ids)}
+        self._matrix = np.load(self.directory / "embeddings.npy", mmap_mode="r")
+        self._rows = np.arange(self.count(), dtype=np.int64)
+        self._build_search_matrix()
+        if self._replay_journal():
+            # Fold the journal in so the matrix is memory-mapped again and replays stay short
+            self._save()
+            if self.storage == "float32":
+                self._matrix = np.load(self.directory / "embeddings.npy", mmap_mode="r")
+                self._search_matrix = self._matrix
+        logger.debug(f"Loaded {self.count()} records into numpy collection {self.name}")
+
+    def _build_search_matrix(self) -> None:
+        """Derive the search matrix from _matrix, quantizing in blocks"""
+        if self.storage == "float32":
+            self._search_matrix, self._scales = self._matrix, None
+            return
+        blocks = [quantize(np.asarray(self._matrix[start:start + 65536]), self.storage)
+                  for start in range(0, max(self.count(), 1), 65536)]
+        self._search_matrix = np.concatenate([block for block, _ in blocks])
+        self._scales = (np.concatenate([scales for _, scales in blocks])
+                        if self.storage == "int8" else None)
+
+class NumpyClient:
+    """Minimal Chroma-compatible client managing NumpyCollections"""
+
+    def __init__(self, path: Optional[str] = None, storage: str = "float32",
+                 rerank_factor: int = 0):
+        """Open a client
+
+        Args:
+            path: Directory holding one sub-directory per collection, None for in-memory
+            storage: Search matrix dtype for every collection
+            rerank_factor: Full-precision re-rank multiplier for quantized collections
+        """
+        self.path = Path(path) if path else None
+        self.storage = storage
+        self.rerank_factor = rerank_factor
+        self._collections: Dict[str, NumpyCollection] = {}
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            for directory in sorted(self.path.iterdir()):
+                if (directory / "records.json").exists():
+                    collection = NumpyCollection(directory.name, directory=directory,
+                                                 storage=storage, rerank_factor=rerank_factor)
+                    self._collections[collection.name] = collection
+
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None,
+                                 **kwargs) -> NumpyCollection:
+        if name not in self._collections:
+            return self.create_collection(name, metadata=metadata)
+        return self._collections[name]
+
+    def create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None,
+                          **kwargs) -> NumpyCollection:
+        if name in self._collections:
+            raise ValueError(f"Collection already exists: {name}")
+        directory = self.path / name if self.path is not None else None
+        collection = NumpyCollection(name, metadata=metadata, directory=directory,
+                                     storage=self.storage, rerank_factor=self.rerank_factor)
+        collection._save()
+        self._collections[name] = collection
+        return collection
+
+    def mount_snapshot(self, snapshot: Snapshot, name: Optional[str] = None) -> NumpyCollection:
+        """Register a snapshot as a collection without copying it"""
+        name = name or snapshot.name
+        if name in self._collections:
+            raise ValueError(f"Collection already exists: {name}")
+        collection = NumpyCollection.from_snapshot(snapshot, name=name, storage=self.storage,
+                                                   rerank_factor=self.rerank_factor)
+        self._collections[name] = collection
+        return collection
+
+    def get_collection(self, name: str, **kwargs) -> NumpyCollection:
+        if name not in self._collections:
+            raise ValueError(f"Collection {name} does not exist")
+        return self._collections[name]
+
+    def list_collections(self) -> List[NumpyCollection]:
+        return list(self._collections.values())
+
+    def delete_collection(self, name: str) -> None:
+        collection = self.get_collection(name)
+        del self._collections[name]
+        if collection.directory is not None:
+            for filename in ("embeddings.npy", "records.json", "journal.jsonl"):
+                (collection.directory / filename).unlink(missing_ok=True)
+            collection.directory.rmdir()
@@ -0,0 +1,67 @@
+"""
+Quantized embedding storage for exact search.
+float16 halves the matrix; int8 with a per-vector scale quarters it.
+Scores are computed block by block so the dequantized copy never exceeds
+one block in memory.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+STORAGE_DTYPES = ("float32", "float16", "int8")
+
+# Rows dequantized per matmul block
+BLOCK_ROWS = 8192
+
+def quantize(vectors: np.ndarray, storage: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Convert float32 vectors to the storage dtype
+
+    Args:
+        vectors: 2-D float32 array, ideally unit-normalized
+        storage: One of STORAGE_DTYPES
+
+    Returns:
+        (quantized matrix, per-row float32 scales or None)
+    """
+    if storage == "float32":
+        return np.ascontiguousarray(vectors, dtype=np.float32), None
+    if storage == "float16":
+        return np.ascontiguousarray(vectors, dtype=np.float16), None
+    if storage == "int8":
+        scales = np.abs(vectors).max(axis=1, initial=0.0) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.rint(vectors / scales[:, None]).astype(np.int8)
+        return np.ascontiguousarray(quantized), scales.astype(np.float32)
+    raise ValueError(f"Unsupported storage dtype: {storage}, expected one of {STORAGE_DTYPES}")
+
+def dequantize(matrix: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+    """Recover approximate float32 vectors"""
+    vectors = matrix.astype(np.float32)
+    if scales is not None:
+        vectors *= scales[:, None]
+    return vectors
+
+def quantized_scores(queries: np.ndarray, matrix: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+    """Inner products between float32 queries and a (possibly quantized) matrix
+
+    Args:
+        queries: 2-D float32 query array
+        matrix: Stored matrix in any STORAGE_DTYPES dtype
+        scales: Per-row scales for int8 storage
+
+    Returns:
+        Score array of shape (len(queries), len(matrix))
+    """
+    if matrix.dtype == np.float32:
+        return queries @ matrix.T
+    scores = np.empty((queries.shape[0], matrix.shape[0]), dtype=np.float32)
+    for start in range(0, matrix.shape[0], BLOCK_ROWS):
+        block = matrix[start:start + BLOCK_ROWS].astype(np.float32)
+        scores[:, start:start + BLOCK_ROWS] = queries @ block.T
+    if scales is not None:
+        scores *= scales[None, :]
+    return scores
+
+def storage_bytes(matrix: np.ndarray, scales: Optional[np.ndarray]) -> int:
+    """Resident bytes of a stored search matrix"""
+    return matrix.nbytes + (scales.nbytes if scales is not None else 0)
@@ -0,0 +1,95 @@
+"""
+In-process LRU cache of similarity query results.
+Keys embed a per-collection write generation: every add or delete bumps the
+generation, so results cached before the write can no longer be hit and
+age out of the LRU.
+"""
+from typing import Any, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+import json
+import threading
+
+from .embedding_cache import text_digest
+
+class QueryResultCache:
+    """Bounded LRU of query results with generation-based invalidation"""
+
+    def __init__(self, max_entries: int = 1024):
+        """Initialize the cache
+
+        Args:
+            max_entries: Maximum cached results; 0 disables caching
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def key(self, collection: str, query: str, k: int,
+            where: Optional[Dict[str, Any]] = None, *extra: Hashable) -> Tuple[Hashable, ...]:
+        """Cache key for a query against the current state of a collection
+
+        Args:
+            collection: Collection name
+            query: Query text
+            k: Number of results requested
+            where: Metadata filter
+            extra: Further parameters that change the result (threshold, search kind)
+        """
+        where_key = json.dumps(where, sort_keys=True, default=str) if where else ""
+        return (collection, self._generations.get(collection, 0), text_digest(query), k, where_key, *extra)
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """Cached result, or None on a miss; results are shared and must not be mutated"""
+        if not self.max_entries:
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            self._misses += 1
+            return None
+
+    def put(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        """Cache a result, evicting the least recently used entries beyond max_entries"""
+        if not self.max_entries:
+            return
+        with self._lock:
+            if key[1] != self._generations.get(key[0], 0):
+                # The collection was written while the query ran
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, collection: str) -> None:
+        """Bump a collection's generation so its cached results stop matching"""
+        with self._lock:
+            self._generations[collection] = self._generations.get(collection, 0) + 1
+            self._invalidations += 1
+
+    def generation(self, collection: str) -> int:
+        """Current write generation of a collection"""
+        return self._generations.get(collection, 0)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counts, hit rate and size"""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "invalidations": self._invalidations
+        }
+
+    def clear(self) -> None:
+        """Drop all cached results"""
+        with self._lock:
+            self._entries.clear()
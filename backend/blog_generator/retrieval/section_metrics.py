@@ -0,0 +1,161 @@
+"""
+Persisted section quality metrics.
+Scores are folded into per-(section type, model, time bucket) running sums
+in SQLite, so history survives restarts and rolling windows or per-model
+breakdowns are answered from a handful of rows.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+from datetime import timedelta
+from pathlib import Path
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class SectionMetricsStore:
+    """Incremental, time-bucketed section metrics"""
+
+    def __init__(self, path: str = ":memory:", bucket_seconds: int = 3600):
+        """Open or create the metrics table
+
+        Args:
+            path: SQLite file path, or ":memory:"
+            bucket_seconds: Width of a time bucket; rolling windows are
+                resolved to whole buckets
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.bucket_seconds = bucket_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS section_metrics (
+                section_type TEXT NOT NULL,
+                model TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                attempts INTEGER NOT NULL,
+                quality_sum REAL NOT NULL,
+                novelty_sum REAL NOT NULL,
+                PRIMARY KEY (section_type, model, bucket)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+
+    def record(self, section_type: str, model: str, quality_score: float,
+               novelty_score: float = 0.0, timestamp: Optional[float] = None) -> None:
+        """Fold one scored section into its bucket
+
+        Args:
+            section_type: Section type
+            model: Model that generated the section
+            quality_score: Quality score achieved
+            novelty_score: Novelty score achieved
+            timestamp: Unix time of the attempt, defaults to now
+        """
+        self.record_many([(section_type, model, quality_score, novelty_score)], timestamp)
+
+    def record_many(self, scores: Iterable[Tuple[str, str, float, float]],
+                    timestamp: Optional[float] = None) -> None:
+        """Fold several scored sections into their buckets in one transaction
+
+        Args:
+            scores: (section_type, model, quality_score, novelty_score) tuples
+            timestamp: Unix time of the attempts, defaults to now
+        """
+        bucket = int((timestamp if timestamp is not None else time.time()) // self.bucket_seconds)
+        rows = [(section_type, model, bucket, float(quality_score), float(novelty_score))
+                for section_type, model, quality_score, novelty_score in scores]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO section_metrics (section_type, model, bucket, attempts, quality_sum, novelty_sum)
+                VALUES (?, ?, ?, 1, ?, ?)
+                ON CONFLICT (section_type, model, bucket) DO UPDATE SET
+                    attempts = attempts + 1,
+                    quality_sum = quality_sum + excluded.quality_sum,
+                    novelty_sum = novelty_sum + excluded.novelty_sum
+                """,
+                rows
+            )
+            self._conn.commit()
+
+    def summary(self, section_types: Iterable[str] = (), section_type: Optional[str] = None,
+                window: Optional[timedelta] = None, by_model: bool = False) -> Dict[str, Dict]:
+        """Aggregate metrics per section type
+
+        Args:
+            section_types: Types always present in the result, with zero attempts if unseen
+            section_type: Restrict to one section type
+            window: Only count attempts within this long before now
+            by_model: Add a "models" breakdown to every section type
+
+        Returns:
+            {section_type: {"success_rate", "average_novelty", "total_attempts"[, "models"]}}
+            where success_rate is the mean quality score
+        """
+        clauses, params = [], []
+        if section_type:
+            clauses.append("section_type = ?")
+            params.append(section_type)
+        if window is not None:
+            clauses.append("bucket >= ?")
+            params.append(int((time.time() - window.total_seconds()) // self.bucket_seconds))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT section_type, model, SUM(attempts), SUM(quality_sum), SUM(novelty_sum)
+                FROM section_metrics {where}
+                GROUP BY section_type, model
+                """,
+                params
+            ).fetchall()
+
+        wanted = [section_type] if section_type else list(section_types)
+        totals = {name: [0, 0.0, 0.0] for name in wanted}
+        models: Dict[str, Dict[str, list]] = {name: {} for name in wanted}
+        for name, model, attempts, quality_sum, novelty_sum in rows:
+            total = totals.setdefault(name, [0, 0.0, 0.0])
+            total[0] += attempts
+            total[1] += quality_sum
+            total[2] += novelty_sum
+            models.setdefault(name, {})[model] = [attempts, quality_sum, novelty_sum]
+
+        result = {}
+        for name, (attempts, quality_sum, novelty_sum) in totals.items():
+            result[name] = self._aggregate(attempts, quality_sum, novelty_sum)
+            if by_model:
+                result[name]["models"] = {
+                    model: self._aggregate(*sums) for model, sums in sorted(models[name].items())
+                }
+        return result
+
+    @staticmethod
+    def _aggregate(attempts: int, quality_sum: float, novelty_sum: float) -> Dict[str, float]:
+        return {
+            "success_rate": quality_sum / attempts if attempts else 0.0,
+            "average_novelty": novelty_sum / attempts if attempts else 0.0,
+            "total_attempts": attempts
+        }
+
+    def prune(self, older_than: timedelta) -> int:
+        """Delete buckets older than a retention period, returning the rows removed"""
+        cutoff = int((time.time() - older_than.total_seconds()) // self.bucket_seconds)
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM section_metrics WHERE bucket < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        return removed
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,202 @@
+"""
+Collection sharded by a metadata field.
+Presents the subset of the Chroma collection API that VectorStore uses over
+one physical collection per shard value. Writes go to the shard named by
+each record's metadata; queries filtered on the shard field touch only the
+matching shards, and unfiltered queries fan out in parallel and merge the
+per-shard top-k by distance.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Shard for records whose shard field is missing or not a known value
+DEFAULT_SHARD = "other"
+
+_RESULT_KEYS = ("ids", "documents", "metadatas", "distances")
+
+def shard_values_from_where(where: Optional[Dict[str, Any]], field: str) -> Optional[Set[str]]:
+    """Shard values a where filter restricts field to, or None if unrestricted
+
+    Understands equality, $eq, $in and conjunctions through $and.
+    """
+    if not where:
+        return None
+    restricted: Optional[Set[str]] = None
+    for key, condition in where.items():
+        values = None
+        if key == "$and":
+            for clause in condition:
+                clause_values = shard_values_from_where(clause, field)
+                if clause_values is not None:
+                    restricted = clause_values if restricted is None else restricted & clause_values
+            continue
+        if key != field:
+            continue
+        if isinstance(condition, dict):
+            if "$eq" in condition:
+                values = {condition["$eq"]}
+            elif "$in" in condition:
+                values = set(condition["$in"])
+        else:
+            values = {condition}
+        if values is not None:
+            restricted = values if restricted is None else restricted & values
+    return restricted
+
+class ShardedCollection:
+    """One logical collection stored as a physical collection per shard value"""
+
+    def __init__(self, client, name: str, field: str, shard_values: Iterable[str],
+                 metadata: Optional[Dict[str, Any]] = None, max_workers: Optional[int] = None):
+        """Open or create every shard
+
+        Args:
+            client: Chroma or NumpyClient
+            name: Logical collection name; shards are named "<name>__<value>"
+            field: Metadata field records are sharded on
+            shard_values: Known shard values; anything else goes to DEFAULT_SHARD
+            metadata: Collection metadata applied to every shard
+            max_workers: Threads used to fan queries out, defaults to one per shard
+        """
+        self.name = name
+        self.field = field
+        self.metadata = {**(metadata or {}), "sharded_by": field}
+        values = list(dict.fromkeys([*shard_values, DEFAULT_SHARD]))
+        self.shards = {
+            value: client.get_or_create_collection(name=f"{name}__{value}", metadata=self.metadata)
+            for value in values
+        }
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or len(self.shards),
+                                            thread_name_prefix="shard")
+
+    def shard_for(self, metadata: Optional[Dict[str, Any]]) -> str:
+        """Shard value a record belongs to"""
+        value = (metadata or {}).get(self.field)
+        return value if value in self.shards else DEFAULT_SHARD
+
+    def count(self) -> int:
+        """Records across all shards"""
+        return sum(self._map(lambda shard: shard.count(), self.shards.values()))
+
+    def add(self, ids: Sequence[str], embeddings: Any, documents: Optional[Sequence[str]] = None,
+            metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None) -> Optional[List[str]]:
+        """Add records to their shards
+
+        Returns:
+            Ids of the records added, or None when a shard's add does not
+            report them (Chroma)
+        """
+        results = self._write("add", ids, embeddings, documents, metadatas)
+        if any(shard_ids is None for shard_ids in results):
+            return None
+        added = {record_id for shard_ids in results for record_id in shard_ids}
+        return [record_id for record_id in ids if record_id in added]
+
+    def upsert(self, ids: Sequence[str], embeddings: Any, documents: Optional[Sequence[str]] = None,
+               metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None) -> None:
+        """Upsert records into their shards, removing copies left in other shards"""
+        self._write("upsert", ids, embeddings, documents, metadatas)
+
+    def query(self, query_embeddings: Any, n_results: int = 10,
+              where: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, List[List[Any]]]:
+        """Top-k over the shards selected by where, merged by distance"""
+        shards = self._route(where)
+        per_shard = self._map(
+            lambda shard: shard.query(query_embeddings=query_embeddings, n_results=n_results,
+                                      where=where, **kwargs),
+            shards
+        )
+        query_count = len(per_shard[0]["ids"]) if per_shard else len(np.atleast_2d(query_embeddings))
+        merged = {key: [] for key in _RESULT_KEYS}
+        for q in range(query_count):
+            candidates = (
+                (results["distances"][q][i], results["ids"][q][i],
+                 results["documents"][q][i], results["metadatas"][q][i])
+                for results in per_shard
+                for i in range(len(results["ids"][q]))
+            )
+            best = heapq.nsmallest(n_results, candidates, key=lambda candidate: candidate[0])
+            merged["distances"].append([candidate[0] for candidate in best])
+            merged["ids"].append([candidate[1] for candidate in best])
+            merged["documents"].append([candidate[2] for candidate in best])
+            merged["metadatas"].append([candidate[3] for candidate in best])
+        return merged
+
+    def get(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None,
+            limit: Optional[int] = None, include: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Fetch records from the shards selected by where"""
+        kwargs = {"ids": list(ids) if ids is not None else None, "where": where}
+        if include is not None:
+            kwargs["include"] = include
+        per_shard = self._map(lambda shard: shard.get(**kwargs), self._route(where))
+        merged: Dict[str, Any] = {"ids": []}
+        for results in per_shard:
+            merged["ids"].extend(results["ids"])
+            for key in ("documents", "metadatas", "embeddings"):
+                if results.get(key) is not None:
+                    merged.setdefault(key, []).extend(list(results[key]))
+        if ids is not None:
+            # Restore the requested order
+            order = {record_id: i for i, record_id in enumerate(merged["ids"])}
+            positions = [order[record_id] for record_id in ids if record_id in order]
+            merged = {key: [values[p] for p in positions] for key, values in merged.items()}
+        if limit is not None:
+            merged = {key: values[:limit] for key, values in merged.items()}
+        if "embeddings" in merged:
+            merged["embeddings"] = np.asarray(merged["embeddings"], dtype=np.float32)
+        return merged
+
+    def delete(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None) -> None:
+        """Delete records from the shards selected by where"""
+        self._map(lambda shard: shard.delete(ids=list(ids) if ids is not None else None, where=where),
+                  self._route(where))
+
+    def _route(self, where: Optional[Dict[str, Any]]) -> List[Any]:
+        """Shards a where filter can match"""
+        values = shard_values_from_where(where, self.field)
+        if values is None:
+            return list(self.shards.values())
+        # Values without their own shard were written to DEFAULT_SHARD by shard_for
+        routed = {value if value in self.shards else DEFAULT_SHARD for value in values}
+        return [self.shards[value] for value in self.shards if value in routed]
+
+    def _write(self, method: str, ids, embeddings, documents, metadatas) -> List[Any]:
+        """Write each record to its shard, returning the per-shard results"""
+        results = []
+        groups: Dict[str, List[int]] = {}
+        if isinstance(embeddings, np.ndarray):
+            embeddings = embeddings.reshape(len(ids), -1)
+        for i in range(len(ids)):
+            groups.setdefault(self.shard_for(metadatas[i] if metadatas is not None else None), []).append(i)
+        for value, rows in groups.items():
+            results.append(getattr(self.shards[value], method)(
+                ids=[ids[i] for i in rows],
+                embeddings=(embeddings[rows] if isinstance(embeddings, np.ndarray)
+                            else [embeddings[i] for i in rows]),
+                documents=[documents[i] for i in rows] if documents is not None else None,
+                metadatas=[metadatas[i] for i in rows] if metadatas is not None else None
+            ))
+        if method == "upsert":
+            # A record whose shard field changed still has its old copy in another shard
+            for value, shard in self.shards.items():
+                moved = [ids[i] for other, rows in groups.items() if other != value for i in rows]
+                if moved:
+                    shard.delete(ids=moved)
+        return results
+
+    def _map(self, func, shards: Iterable[Any]) -> List[Any]:
+        """Apply func to shards, in parallel when there is more than one"""
+        shards = list(shards)
+        if len(shards) <= 1:
+            return [func(shard) for shard in shards]
+        return list(self._executor.map(func, shards))
+
+    def close(self) -> None:
+        """Stop the fan-out threads"""
+        self._executor.shutdown(wait=True)
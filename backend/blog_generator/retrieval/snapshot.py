@@ -0,0 +1,185 @@
+"""
+Columnar on-disk snapshots of a collection.
+
+A snapshot directory holds:
+    embeddings.npy   float32 matrix, memory-mapped on load
+    records.arrow    Arrow IPC file with id, document and metadata (JSON) columns,
+                     memory-mapped on load (records.json when pyarrow is missing)
+    snapshot.json    manifest with name, collection metadata, count, dim and format
+
+pyarrow is optional and imported lazily.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from datetime import datetime
+from pathlib import Path
+import json
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+def _pyarrow():
+    """Import pyarrow on demand, or None when it is not installed"""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        return None
+    return pyarrow
+
+class JsonColumn(Sequence):
+    """Read-only sequence decoding JSON strings on access, caching each row"""
+
+    def __init__(self, values: Sequence[Optional[str]]):
+        self._values = values
+        self._decoded: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index not in self._decoded:
+            raw = self._values[index]
+            self._decoded[index] = json.loads(raw) if raw is not None else None
+        return self._decoded[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self[i] for i in range(len(self)))
+
+class ArrowStringColumn(Sequence):
+    """Read-only, zero-copy view of an Arrow string column"""
+
+    def __init__(self, column):
+        self._column = column
+
+    def __len__(self) -> int:
+        return len(self._column)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._column.slice(*self._slice_bounds(index)).to_pylist()
+        if index < 0:
+            index += len(self)
+        return self._column[index].as_py()
+
+    def _slice_bounds(self, index: slice):
+        start, stop, _ = index.indices(len(self))
+        return start, max(stop - start, 0)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._column.to_pylist())
+
+class Snapshot:
+    """An opened snapshot: memory-mapped embeddings plus lazily decoded records"""
+
+    def __init__(self, path: Path, manifest: Dict[str, Any], embeddings: np.ndarray,
+                 ids: List[str], documents: Sequence[Optional[str]],
+                 metadatas: Sequence[Optional[Dict[str, Any]]]):
+        self.path = path
+        self.manifest = manifest
+        self.name = manifest["name"]
+        self.metadata = manifest.get("metadata") or {}
+        self.embeddings = embeddings
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+def write_snapshot(path: Path, name: str, ids: Sequence[str], embeddings: np.ndarray,
+                   documents: Sequence[Optional[str]], metadatas: Sequence[Optional[Dict[str, Any]]],
+                   collection_metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Write a collection snapshot directory
+
+    Args:
+        path: Snapshot directory, created if needed
+        name: Collection name
+        ids: Record ids
+        embeddings: 2-D embedding matrix aligned with ids
+        documents: Record documents
+        metadatas: Record metadata dictionaries
+        collection_metadata: Collection-level metadata
+
+    Returns:
+        The manifest written to snapshot.json
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    embeddings = np.ascontiguousarray(
+        np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1) if len(ids)
+        else np.empty((0, 0), dtype=np.float32)
+    )
+    np.save(path / "embeddings.tmp.npy", embeddings)
+    os.replace(path / "embeddings.tmp.npy", path / "embeddings.npy")
+
+    encoded_metadatas = [json.dumps(metadata) if metadata is not None else None for metadata in metadatas]
+    pa = _pyarrow()
+    if pa is not None:
+        table = pa.table({
+            "id": pa.array(list(ids), type=pa.string()),
+            "document": pa.array(list(documents), type=pa.string()),
+            "metadata": pa.array(encoded_metadatas, type=pa.string())
+        })
+        with pa.OSFile(str(path / "records.arrow.tmp"), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(path / "records.arrow.tmp", path / "records.arrow")
+        record_format = "arrow"
+    else:
+        logger.warning("pyarrow is not installed, writing snapshot records as JSON")
+        with open(path / "records.json.tmp", "w", encoding="utf-8") as f:
+            json.dump({"ids": list(ids), "documents": list(documents), "metadatas": encoded_metadatas}, f)
+        os.replace(path / "records.json.tmp", path / "records.json")
+        record_format = "json"
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "name": name,
+        "metadata": collection_metadata or {},
+        "count": len(ids),
+        "dim": int(embeddings.shape[1]),
+        "normalized": bool(np.allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=1e-3)),
+        "format": record_format,
+        "created": datetime.now().isoformat()
+    }
+    with open(path / "snapshot.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def read_snapshot(path: Path) -> Snapshot:
+    """Open a snapshot without copying its data
+
+    Embeddings and Arrow records are memory-mapped; documents are read and
+    metadata JSON decoded only when accessed.
+    """
+    path = Path(path)
+    with open(path / "snapshot.json", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {manifest.get('version')}")
+    embeddings = np.load(path / "embeddings.npy", mmap_mode="r")
+
+    if manifest["format"] == "arrow":
+        pa = _pyarrow()
+        if pa is None:
+            raise ImportError("pyarrow is required to read this snapshot: pip install pyarrow")
+        table = pa.ipc.open_file(pa.memory_map(str(path / "records.arrow"), "r")).read_all()
+        ids = table.column("id").to_pylist()
+        documents = ArrowStringColumn(table.column("document"))
+        metadatas = JsonColumn(ArrowStringColumn(table.column("metadata")))
+    else:
+        with open(path / "records.json", encoding="utf-8") as f:
+            records = json.load(f)
+        ids = records["ids"]
+        documents = records["documents"]
+        metadatas = JsonColumn(records["metadatas"])
+    return Snapshot(path, manifest, embeddings, ids, documents, metadatas)
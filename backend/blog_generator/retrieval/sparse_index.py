@@ -0,0 +1,180 @@
+"""
+Persisted BM25 inverted index maintained alongside vector collections.
+Postings live in SQLite so documents can be added and removed incrementally;
+document lengths are cached in memory per collection for scoring.
+"""
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from collections import Counter
+from pathlib import Path
+import logging
+import math
+import re
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens used for indexing and querying"""
+    return _WORD_PATTERN.findall(text.lower())
+
+class BM25Index:
+    """Okapi BM25 over one or more named collections"""
+
+    def __init__(self, path: str = ":memory:", k1: float = 1.5, b: float = 0.75):
+        """Open or create the index
+
+        Args:
+            path: SQLite file path, or ":memory:"
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._lengths: Dict[str, Dict[str, int]] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS postings (
+                collection TEXT NOT NULL,
+                term TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (collection, term, doc_id)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings (collection, doc_id)"
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                collection TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                PRIMARY KEY (collection, doc_id)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+
+    def add(self, collection: str, ids: Sequence[str], texts: Sequence[str]) -> None:
+        """Index documents, replacing any previously indexed under the same id"""
+        lengths = self._doc_lengths(collection)
+        postings = []
+        documents = []
+        for doc_id, text in zip(ids, texts):
+            counts = Counter(tokenize(text or ""))
+            documents.append((collection, doc_id, sum(counts.values())))
+            postings.extend((collection, term, doc_id, tf) for term, tf in counts.items())
+
+        with self._lock:
+            self._delete_postings(collection, [doc_id for doc_id in ids if doc_id in lengths])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO documents (collection, doc_id, length) VALUES (?, ?, ?)",
+                documents
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO postings (collection, term, doc_id, tf) VALUES (?, ?, ?, ?)",
+                postings
+            )
+            self._conn.commit()
+            for _, doc_id, length in documents:
+                lengths[doc_id] = length
+
+    def delete(self, collection: str, ids: Sequence[str]) -> None:
+        """Remove documents from the index"""
+        lengths = self._doc_lengths(collection)
+        with self._lock:
+            self._delete_postings(collection, ids)
+            self._conn.executemany(
+                "DELETE FROM documents WHERE collection = ? AND doc_id = ?",
+                [(collection, doc_id) for doc_id in ids]
+            )
+            self._conn.commit()
+            for doc_id in ids:
+                lengths.pop(doc_id, None)
+
+    def delete_collection(self, collection: str) -> None:
+        """Drop every posting of a collection"""
+        with self._lock:
+            self._conn.execute("DELETE FROM postings WHERE collection = ?", (collection,))
+            self._conn.execute("DELETE FROM documents WHERE collection = ?", (collection,))
+            self._conn.commit()
+            self._lengths.pop(collection, None)
+
+    def count(self, collection: str) -> int:
+        """Number of indexed documents in a collection"""
+        return len(self._doc_lengths(collection))
+
+    def ids(self, collection: str) -> Set[str]:
+        """Ids of the indexed documents in a collection"""
+        return set(self._doc_lengths(collection))
+
+    def search(self, collection: str, query: str, k: int = 10,
+               allowed_ids: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """Rank documents by BM25 score
+
+        Args:
+            collection: Collection name
+            query: Free-text query
+            k: Maximum results
+            allowed_ids: Optional whitelist of candidate ids
+
+        Returns:
+            List of (doc_id, score), best first
+        """
+        lengths = self._doc_lengths(collection)
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not lengths or not terms:
+            return []
+        total = len(lengths)
+        average_length = sum(lengths.values()) / total or 1.0
+
+        scores: Dict[str, float] = {}
+        with self._lock:
+            for term in terms:
+                rows = self._conn.execute(
+                    "SELECT doc_id, tf FROM postings WHERE collection = ? AND term = ?",
+                    (collection, term)
+                ).fetchall()
+                if not rows:
+                    continue
+                idf = math.log(1 + (total - len(rows) + 0.5) / (len(rows) + 0.5))
+                for doc_id, tf in rows:
+                    if allowed_ids is not None and doc_id not in allowed_ids:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * lengths.get(doc_id, 0) / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def _doc_lengths(self, collection: str) -> Dict[str, int]:
+        """In-memory document lengths for a collection, loaded on first use"""
+        if collection not in self._lengths:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT doc_id, length FROM documents WHERE collection = ?", (collection,)
+                ).fetchall()
+            self._lengths[collection] = dict(rows)
+        return self._lengths[collection]
+
+    def _delete_postings(self, collection: str, ids: Sequence[str]) -> None:
+        """Remove postings of ids (caller holds the lock)"""
+        self._conn.executemany(
+            "DELETE FROM postings WHERE collection = ? AND doc_id = ?",
+            [(collection, doc_id) for doc_id in ids]
+        )
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
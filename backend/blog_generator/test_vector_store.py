@@ -46,9 +46,9 @@ def main():
     ]
     
     print("\nTesting Queries:")
-    for query in test_queries:
+    all_results = store.query_many(test_queries, k=2, collection_name="user_messages")
+    for query, results in zip(test_queries, all_results):
         print(f"\nQuery: {query}")
-        results = store.query_similar("user_messages", query, n_results=2)
         for result in results:
             print(f"\nContent: {result['content']}")
             print(f"Position: {result['metadata']['position']}")
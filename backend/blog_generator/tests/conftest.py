@@ -0,0 +1,18 @@
+"""
+Shared fixtures for the vector store test modules.
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from .helpers import fake_encode
+
+@pytest.fixture
+def mock_model():
+    """SentenceTransformer patched out of vector_store, encoding with fake_encode
+
+    Modules swap the encoder through mock_model.return_value.encode.side_effect,
+    and count model calls with mock_model.return_value.encode.call_count.
+    """
+    with patch("blog_generator.vector_store.SentenceTransformer") as model:
+        model.return_value.encode = MagicMock(side_effect=fake_encode)
+        yield model
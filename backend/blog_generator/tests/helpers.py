@@ -0,0 +1,17 @@
+"""
+Encoder fakes shared by the vector store test modules.
+"""
+import numpy as np
+
+def fake_encode(texts, batch_size=None):
+    """Deterministic stand-in for SentenceTransformer.encode"""
+    if isinstance(texts, str):
+        return np.full(4, float(len(texts)), dtype=np.float32)
+    return np.array([[float(len(t)), 1.0, 0.0, 0.0] for t in texts], dtype=np.float32)
+
+def count_encoder(*substrings, length=True):
+    """Stand-in encode whose dimensions are the text length, the count of each substring and 1.0"""
+    def encode(texts, batch_size=None):
+        return np.array([([len(t)] if length else []) + [t.count(s) for s in substrings] + [1.0]
+                         for t in texts], dtype=np.float32)
+    return encode
@@ -0,0 +1,152 @@
+"""
+Test suite for concurrent section generation in BlogGenerator.
+"""
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import yaml
+
+from ..blog_generator import BlogGenerator, LLMType
+from ..pipeline.gemini import GeminiAdapter
+from ..pipeline.rate_limiter import RateLimiter
+
+TEMPLATE = """---
+title: Concurrency
+sections:
+  - name: Intro
+    prompt: intro prompt
+    model: GPT-4
+  - name: Theory
+    prompt: theory prompt
+    model: Claude-3
+  - name: Trends
+    prompt: trends prompt
+    model: Gemini
+  - name: Outro
+    prompt: outro prompt
+    model: GPT-4
+---
+"""
+
+LATENCY = 0.2
+
+def make_generator(tmp_path, max_concurrency):
+    """BlogGenerator whose providers answer after a fixed network latency"""
+    async def openai_create(**kwargs):
+        await asyncio.sleep(LATENCY)
+        prompt = kwargs["messages"][-1]["content"].split("Prompt:\n")[1]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f"gpt {prompt}"))])
+
+    async def claude_create(**kwargs):
+        await asyncio.sleep(LATENCY)
+        return SimpleNamespace(content=[SimpleNamespace(text="claude text")])
+
+    async def gemini_generate(prompt_text, model_name):
+        await asyncio.sleep(LATENCY)
+        return "gemini text"
+
+    with patch("blog_generator.blog_generator.openai.AsyncOpenAI"), \
+         patch("blog_generator.blog_generator.AsyncAnthropic"):
+        generator = BlogGenerator(max_concurrency=max_concurrency)
+    generator.output_dir = tmp_path / "out"
+    generator.output_dir.mkdir(parents=True)
+    generator.orchestrator.openai_client.chat.completions.create = openai_create
+    generator.orchestrator.claude_client.messages.create = claude_create
+    generator.orchestrator.gemini = MagicMock(generate=gemini_generate)
+    return generator
+
+@pytest.mark.asyncio
+async def test_sections_generated_concurrently_in_template_order(tmp_path):
+    """Test independent sections overlap and the post keeps template order"""
+    template = tmp_path / "post.md"
+    template.write_text(TEMPLATE, encoding="utf-8")
+
+    timings = {}
+    for max_concurrency in (1, 4):
+        generator = make_generator(tmp_path / str(max_concurrency), max_concurrency)
+        start = time.perf_counter()
+        output_path = await generator.generate_blog_post(str(template))
+        timings[max_concurrency] = time.perf_counter() - start
+
+    print(f"\nsequential {timings[1]:.2f}s, concurrent {timings[4]:.2f}s, "
+          f"speedup {timings[1] / timings[4]:.1f}x")
+    assert timings[1] >= 4 * LATENCY
+    assert timings[4] < 2 * LATENCY
+
+    text = output_path.read_text(encoding="utf-8")
+    metadata = yaml.safe_load(text.split("---")[1])
+    headings = [line[3:] for line in text.splitlines() if line.startswith("## ")]
+    assert headings == ["Intro", "Theory", "Trends", "Outro"]
+    assert metadata["content"]["Intro"].startswith("gpt intro prompt")
+    assert metadata["content"]["Trends"].startswith("gemini text")
+
+@pytest.mark.asyncio
+async def test_posts_overlap_under_shared_limit(tmp_path):
+    """Test several posts generate concurrently within max_concurrency"""
+    templates = []
+    for name in ("first", "second"):
+        template = tmp_path / f"{name}.md"
+        template.write_text(TEMPLATE, encoding="utf-8")
+        templates.append(str(template))
+    generator = make_generator(tmp_path, max_concurrency=8)
+
+    start = time.perf_counter()
+    outputs = await generator.generate_blog_posts(templates)
+    elapsed = time.perf_counter() - start
+
+    assert [path.name.split("_")[0] for path in outputs] == ["first", "second"]
+    assert elapsed < 2 * LATENCY
+
+@pytest.mark.asyncio
+async def test_gemini_sections_use_the_shared_adapter(monkeypatch):
+    """Test Gemini sections go through the adapter's cached model and rate limiter"""
+    monkeypatch.setenv("GEMINI_API_KEY", "key")
+    limiter = RateLimiter()
+    adapter = GeminiAdapter(rate_limiter=limiter)
+
+    async def gemini_generate(prompt_text):
+        return SimpleNamespace(text="gemini text")
+
+    genai = MagicMock()
+    genai.GenerativeModel.return_value = MagicMock(generate_content_async=gemini_generate)
+    with patch("blog_generator.blog_generator.openai.AsyncOpenAI"), \
+         patch("blog_generator.blog_generator.AsyncAnthropic"), \
+         patch("blog_generator.blog_generator.gemini_adapter", adapter), \
+         patch("blog_generator.pipeline.gemini.genai", genai):
+        generator = BlogGenerator()
+        for _ in range(2):
+            content = await generator.orchestrator.generate_blog_section(LLMType.GEMINI, "prompt")
+
+    assert content.startswith("gemini text")
+    assert genai.GenerativeModel.call_count == 1
+    assert limiter.stats()["gemini:gemini-pro"]["requests"] == 2
+
+@pytest.mark.asyncio
+async def test_chatgpt_and_claude_sections_go_through_the_rate_limiter():
+    """Test ChatGPT and Claude sections are limited and retried by the shared limiter, not the SDKs"""
+    limiter = RateLimiter()
+
+    async def openai_create(**kwargs):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="gpt text"))])
+
+    async def claude_create(**kwargs):
+        return SimpleNamespace(content=[SimpleNamespace(text="claude text")])
+
+    with patch("blog_generator.blog_generator.openai.AsyncOpenAI") as openai_client, \
+         patch("blog_generator.blog_generator.AsyncAnthropic") as claude_client, \
+         patch("blog_generator.blog_generator.rate_limiter", limiter):
+        generator = BlogGenerator()
+    orchestrator = generator.orchestrator
+    orchestrator.openai_client.chat.completions.create = openai_create
+    orchestrator.claude_client.messages.create = claude_create
+
+    assert (await orchestrator.generate_with_chatgpt("prompt", "context")).startswith("gpt text")
+    assert (await orchestrator.generate_with_claude("prompt", "context")).startswith("claude text")
+    assert openai_client.call_args.kwargs["max_retries"] == 0
+    assert claude_client.call_args.kwargs["max_retries"] == 0
+    stats = limiter.stats()
+    assert stats["openai:gpt-4-turbo-preview"]["requests"] == 1
+    assert stats["anthropic:claude-3-opus-20240229"]["requests"] == 1
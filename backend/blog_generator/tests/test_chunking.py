@@ -0,0 +1,87 @@
+"""
+Test suite for the streaming text chunker.
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from ..retrieval.chunking import TextChunker
+from ..vector_store import VectorStore
+
+SAMPLE_TEXT = "\n\n".join(
+    f"Paragraph {i}. " + " ".join(f"word{i}_{j}" for j in range(40)) for i in range(12)
+)
+
+@pytest.mark.parametrize("unit", ["chars", "tokens"])
+@pytest.mark.parametrize("read_size", [5, 97, 1 << 16])
+def test_chunk_offsets_match_source(tmp_path, unit, read_size):
+    """Test chunk offsets point back into the file for any block size"""
+    path = tmp_path / "transcript.md"
+    path.write_text(SAMPLE_TEXT, encoding="utf-8")
+    chunker = TextChunker(chunk_size=120, chunk_overlap=30, unit=unit, read_size=read_size)
+    
+    chunks = list(chunker.chunk_file(path))
+    
+    assert len(chunks) > 1
+    assert [c.index for c in chunks] == list(range(len(chunks)))
+    assert all(SAMPLE_TEXT[c.start:c.end] == c.text for c in chunks)
+    assert chunks[-1].end == len(SAMPLE_TEXT)
+    # Consecutive chunks overlap and never go backwards
+    assert all(b.start < a.end and b.start > a.start for a, b in zip(chunks, chunks[1:]))
+
+def test_char_chunks_respect_size_and_stream_identically():
+    """Test character chunks stay within chunk_size and match in-memory chunking"""
+    chunker = TextChunker(chunk_size=200, chunk_overlap=50, read_size=13)
+    
+    streamed = list(chunker._chunk_blocks(
+        (SAMPLE_TEXT[i:i + 13] for i in range(0, len(SAMPLE_TEXT), 13)), "s"
+    ))
+    whole = list(chunker.chunk_text(SAMPLE_TEXT, "s"))
+    
+    assert all(len(c.text) <= 200 for c in whole)
+    assert [(c.start, c.end) for c in streamed] == [(c.start, c.end) for c in whole]
+
+def test_token_chunks_respect_token_budget():
+    """Test token mode counts tokens, not characters"""
+    chunker = TextChunker(chunk_size=25, chunk_overlap=5, unit="tokens")
+    
+    chunks = list(chunker.chunk_text(SAMPLE_TEXT))
+    
+    assert all(len(chunker.tokenizer(c.text)) <= 25 for c in chunks)
+    assert len(chunker.tokenizer(chunks[0].text)) == 25
+
+def test_invalid_overlap_rejected():
+    """Test overlap must be smaller than the chunk size"""
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size=100, chunk_overlap=100)
+
+def test_ingest_files_stores_provenance(tmp_path, mock_model):
+    """Test VectorStore.ingest_files uses config chunk sizes and keeps offsets"""
+    source = tmp_path / "raw"
+    source.mkdir()
+    (source / "a.md").write_text(SAMPLE_TEXT, encoding="utf-8")
+    
+    def encode(texts, batch_size=None):
+        return np.ones((len(texts), 3), dtype=np.float32)
+    
+    with patch("chromadb.PersistentClient") as mock_client:
+        mock_model.return_value.encode.side_effect = encode
+        mock_collection = MagicMock()
+        mock_collection.name = "research_sections"
+        mock_client.return_value.get_collection.return_value = mock_collection
+        
+        store = VectorStore.from_config(
+            {"embedding_model": "all-MiniLM-L6-v2", "chunk_size": 300, "chunk_overlap": 60},
+            persist_directory=str(tmp_path / "db"),
+            near_duplicate_threshold=None,
+            keyword_index=False
+        )
+        stats = store.ingest_files(source, collection_name="transcripts", metadata={"kind": "raw"})
+        
+        metadatas = [m for call in mock_collection.add.call_args_list for m in call[1]["metadatas"]]
+        assert stats["documents"] == len(metadatas) > 1
+        first = metadatas[0]
+        assert first["kind"] == "raw"
+        assert first["start_offset"] == "0"
+        assert int(first["end_offset"]) <= 300
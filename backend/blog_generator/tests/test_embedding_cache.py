@@ -0,0 +1,66 @@
+"""
+Test suite for the persistent embedding cache.
+"""
+import pytest
+from unittest.mock import patch
+
+import numpy as np
+
+from ..retrieval.embedding_cache import EmbeddingCache, embedding_namespace
+from ..vector_store import VectorStore
+from .helpers import count_encoder
+
+def test_cache_roundtrip_and_counters(tmp_path):
+    """Test vectors survive a reopen and hits/misses are counted"""
+    path = str(tmp_path / "cache.sqlite3")
+    namespace = embedding_namespace("all-MiniLM-L6-v2")
+    cache = EmbeddingCache(path)
+    cache.put_many(namespace, ["a poem"], [np.array([0.5, 1.5], dtype=np.float32)])
+    cache.close()
+    
+    reopened = EmbeddingCache(path)
+    vectors = reopened.get_many(namespace, ["a poem", "unseen"])
+    
+    np.testing.assert_array_equal(vectors[0], [0.5, 1.5])
+    assert vectors[1] is None
+    assert reopened.stats()["hits"] == 1
+    assert reopened.stats()["misses"] == 1
+
+def test_cache_namespaces_are_isolated():
+    """Test the same text under another model or config misses"""
+    cache = EmbeddingCache()
+    cache.put_many(embedding_namespace("model-a"), ["text"], [np.ones(3)])
+    
+    assert cache.get_many(embedding_namespace("model-b"), ["text"]) == [None]
+    assert cache.get_many(embedding_namespace("model-a", {"normalize": True}), ["text"]) == [None]
+
+def test_cache_evicts_least_recently_used():
+    """Test size-bounded eviction keeps recently read entries"""
+    namespace = embedding_namespace("model")
+    cache = EmbeddingCache(max_entries=2)
+    cache.put_many(namespace, ["old"], [np.ones(2)])
+    cache.put_many(namespace, ["newer"], [np.ones(2)])
+    cache.get_many(namespace, ["old"])
+    cache.put_many(namespace, ["newest"], [np.ones(2)])
+    
+    old, newer, newest = cache.get_many(namespace, ["old", "newer", "newest"])
+    assert old is not None
+    assert newer is None
+    assert newest is not None
+    assert cache.stats()["entries"] == 2
+
+def test_vector_store_embeds_each_text_once_across_instances(tmp_path, mock_model):
+    """Test every embed path reuses cached vectors across VectorStore instances"""
+    mock_model.return_value.encode.side_effect = count_encoder()
+    with patch("chromadb.PersistentClient"):
+        first = VectorStore(persist_directory=str(tmp_path), model_name="all-MiniLM-L6-v2",
+                            near_duplicate_threshold=None, keyword_index=False)
+        first.embed(["alpha", "beta", "alpha"])
+        second = VectorStore(persist_directory=str(tmp_path), model_name="all-MiniLM-L6-v2",
+                             near_duplicate_threshold=None, keyword_index=False)
+        vector = second.embed("beta")
+        
+        assert mock_model.return_value.encode.call_count == 1
+        assert mock_model.return_value.encode.call_args[0][0] == ["alpha", "beta"]
+        np.testing.assert_array_equal(vector, [4.0, 1.0])
+        assert second.get_cache_stats()["hits"] == 1
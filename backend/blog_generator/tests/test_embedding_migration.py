@@ -0,0 +1,121 @@
+"""
+Test suite for re-embedding migrations between embedding models.
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from ..embedding_migration import EmbeddingMigration, shadow_collection_name
+from ..vector_store import Document, VectorStore
+
+def fake_models():
+    """Old model with 4-dim vectors, new model with 6-dim vectors"""
+    old, new = MagicMock(), MagicMock()
+    old.encode = MagicMock(side_effect=lambda texts, batch_size=None: np.array(
+        [[len(t), t.count("a"), t.count("e"), 1.0] for t in texts], dtype=np.float32))
+    new.encode = MagicMock(side_effect=lambda texts, batch_size=None: np.array(
+        [[len(t), t.count("a"), t.count("e"), t.count("o"), 1.0, 0.5] for t in texts], dtype=np.float32))
+    return {"old-model": old, "new-model": new}
+
+def documents(count=25):
+    return [Document(content=f"{'a' * i} section {'e' * (i % 3)}", metadata={"section_type": "technical"},
+                     id=f"s{i}") for i in range(count)]
+
+@pytest.mark.parametrize("backend", ["numpy", "chroma"])
+def test_migration_resumes_and_switches_atomically(tmp_path, backend):
+    """Test queries read the old collection mid-migration, and a resumed job switches over"""
+    models = fake_models()
+    with patch("blog_generator.vector_store.SentenceTransformer", side_effect=lambda name: models[name]):
+        store = VectorStore(persist_directory=str(tmp_path), model_name="old-model", backend=backend)
+        store.add_documents_bulk(documents())
+        before = store.query_many(["aaaa section e"], k=3)
+
+        migration = EmbeddingMigration(store, "research_sections", "new-model", batch_size=4)
+        assert migration.copy_pending(limit=10) == 10
+        assert migration.shadow.count() == 10
+        # Dual-read: still the source collection and the old model
+        assert store.research_collection.name == "research_sections"
+        models["new-model"].encode.reset_mock()
+        assert store.query_many(["aaaa section e"], k=3) == before
+        models["new-model"].encode.assert_not_called()
+
+        # Writes and deletes that land mid-migration reach the shadow before the switch
+        store.add_documents_bulk([Document(content="late aaaaa section", metadata={}, id="late")])
+        store.delete_documents(["s0"])
+        store.close()
+
+        # A fresh process resumes from what is already in the shadow
+        store = VectorStore(persist_directory=str(tmp_path), model_name="old-model", backend=backend)
+        migration = EmbeddingMigration(store, "research_sections", "new-model", batch_size=4)
+        # s0's delete and the late write were mirrored into the shadow
+        assert len(migration.pending_ids()) == 15
+        progress = migration.run()
+
+        shadow = shadow_collection_name("research_sections", "new-model")
+        assert progress["status"] == "completed" and progress["migrated"] == 15
+        assert store.research_collection.name == shadow
+        assert store.research_collection.count() == 25
+        assert "s0" not in store.research_collection.get(ids=["s0"])["ids"]
+        assert store.query_many(["aaaa section e"], k=1)[0][0]["id"] == "s4"
+        assert len(store.sparse_index.search(shadow, "late", k=5)) == 1
+        store.close()
+
+        # The switch is persisted for later stores
+        models["new-model"].encode.reset_mock()
+        reopened = VectorStore(persist_directory=str(tmp_path), model_name="old-model", backend=backend)
+        assert reopened.research_collection.name == shadow
+        assert reopened.query_many(["aaaa section e"], k=1, collection_name="research_sections")[0][0]["id"] == "s4"
+        reopened.query_many(["an uncached query"], k=1)
+        models["new-model"].encode.assert_called_once()
+
+def test_background_migration_redirects_writes(tmp_path):
+    """Test a background job completes and writes embedded for the old collection are redirected"""
+    models = fake_models()
+    with patch("blog_generator.vector_store.SentenceTransformer", side_effect=lambda name: models[name]):
+        store = VectorStore(persist_directory=str(tmp_path), model_name="old-model", backend="numpy")
+        store.add_documents_bulk(documents(12))
+        source = store.research_collection
+
+        migration = EmbeddingMigration(store, "research_sections", "new-model", batch_size=5).start()
+        assert migration.wait(timeout=30)["status"] == "completed"
+
+        # A write that resolved the old collection before the switch
+        store._add_records(source, ["racer"], store.embed(["racer text"]), ["racer text"], [None])
+
+        assert source.count() == 12
+        assert store.research_collection.get(ids=["racer"])["ids"] == ["racer"]
+        assert store.research_collection.get(ids=["racer"], include=["embeddings"])["embeddings"].shape[1] == 6
+
+@pytest.mark.parametrize("backend", ["numpy", "chroma"])
+def test_records_edited_mid_migration_are_not_served_stale(tmp_path, backend):
+    """Test delete-and-re-add edits reach the shadow whether or not a migration was mirroring them"""
+    models = fake_models()
+    edited = lambda record_id, text: Document(content=text, metadata={"section_type": "technical"}, id=record_id)
+    with patch("blog_generator.vector_store.SentenceTransformer", side_effect=lambda name: models[name]):
+        store = VectorStore(persist_directory=str(tmp_path), model_name="old-model", backend=backend)
+        store.add_documents_bulk(documents(12))
+        migration = EmbeddingMigration(store, "research_sections", "new-model", batch_size=4)
+        migration.copy_pending(limit=8)
+
+        # Edited while mirrored: one already copied, one still pending
+        for record_id, text in (("s1", "ooo rewritten one"), ("s10", "ooo rewritten ten")):
+            store.delete_documents([record_id])
+            store.add_documents_bulk([edited(record_id, text)])
+        assert migration.shadow.get(ids=["s1"])["documents"] == ["ooo rewritten one"]
+        store.close()
+
+        # Edited by a process with no migration running
+        store = VectorStore(persist_directory=str(tmp_path), model_name="old-model", backend=backend)
+        store.delete_documents(["s2"])
+        store.add_documents_bulk([edited("s2", "ooo rewritten two")])
+        migration = EmbeddingMigration(store, "research_sections", "new-model", batch_size=4)
+        assert migration.stale_ids() == ["s2"]
+        migration.run()
+
+        served = store.research_collection.get(ids=["s1", "s2", "s10"], include=["documents"])
+        assert dict(zip(served["ids"], served["documents"])) == {
+            "s1": "ooo rewritten one", "s2": "ooo rewritten two", "s10": "ooo rewritten ten"}
+        assert store.research_collection.count() == 12
+        assert store.query_many(["ooo rewritten two"], k=1)[0][0]["id"] == "s2"
+        store.close()
@@ -0,0 +1,96 @@
+"""
+Test suite for the ndarray embedding path from model output to storage.
+"""
+import base64
+import sys
+import time
+import tracemalloc
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from ..vector_store import Document, VectorStore
+
+DIM = 384
+
+def encode(texts, batch_size=None):
+    seeds = [sum(map(ord, text)) for text in texts]
+    return np.stack([np.random.default_rng(seed).standard_normal(DIM, dtype=np.float32) for seed in seeds])
+
+@pytest.fixture
+def mock_model(mock_model):
+    mock_model.return_value.encode.side_effect = encode
+    return mock_model
+
+def test_openai_embeddings_decoded_from_base64():
+    """Test OpenAI embeddings are requested as base64 and decoded into a float32 matrix"""
+    vectors = np.arange(12, dtype=np.float32).reshape(3, 4)
+    response = SimpleNamespace(data=[
+        SimpleNamespace(index=i, embedding=base64.b64encode(vectors[i].astype("<f4").tobytes()).decode())
+        for i in (2, 0, 1)
+    ])
+    with patch("blog_generator.vector_store.openai.embeddings.create", return_value=response) as create:
+        store = VectorStore(model_name="text-embedding-ada-002", backend="numpy")
+        embeddings = store.embed(["a", "b", "c"])
+
+    assert create.call_args.kwargs["encoding_format"] == "base64"
+    assert embeddings.dtype == np.float32 and embeddings.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(embeddings, vectors)
+
+def test_embed_returns_model_buffer_without_copy(tmp_path, mock_model):
+    """Test an uncached batch passes the model's float32 output through untouched"""
+    output = encode(["x", "y"])
+    mock_model.return_value.encode = MagicMock(return_value=output)
+    store = VectorStore(persist_directory=str(tmp_path), model_name="m", backend="numpy")
+
+    assert store.embed_batch(["x", "y"]) is output
+    assert isinstance(store.embed_batch(["x", "y"]), np.ndarray)
+
+def test_ndarray_ingest_benchmark(tmp_path, mock_model):
+    """Micro-benchmark: ndarray ingest against the old embed(...).tolist() path
+
+    Run with -s to see live allocations at write time, peak traced memory
+    and wall time for both paths.
+    """
+    count = 500
+    store = VectorStore(persist_directory=str(tmp_path), model_name="m", backend="numpy",
+                        keyword_index=False)
+
+    def measure(name, ingest):
+        collection = store.client.get_or_create_collection(name)
+        docs = [Document(content=f"{name} section {i}", metadata={}, id=f"{name}{i}") for i in range(count)]
+        original_add = collection.add
+        blocks = {}
+
+        def add(**kwargs):
+            blocks["write"] = sys.getallocatedblocks()
+            return original_add(**kwargs)
+
+        collection.add = add
+        tracemalloc.start()
+        baseline = sys.getallocatedblocks()
+        start = time.perf_counter()
+        ingest(name, docs)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert collection.count() == count
+        return blocks["write"] - baseline, peak, elapsed
+
+    def legacy(name, docs):
+        embeddings = store.embed([doc.content for doc in docs]).tolist()
+        store._add_records(store.client.get_collection(name), ids=[doc.id for doc in docs],
+                           embeddings=embeddings, documents=[doc.content for doc in docs],
+                           metadatas=[doc.metadata for doc in docs])
+
+    legacy_blocks, legacy_peak, legacy_time = measure("legacy", legacy)
+    native_blocks, native_peak, native_time = measure("native", store.add_documents)
+
+    print(f"\nlegacy: {legacy_blocks} live blocks at write, peak {legacy_peak / 1e6:.1f} MB, {legacy_time * 1e3:.1f} ms")
+    print(f"native: {native_blocks} live blocks at write, peak {native_peak / 1e6:.1f} MB, {native_time * 1e3:.1f} ms")
+    print(f"speedup: {legacy_time / native_time:.1f}x")
+    assert legacy_blocks > count * DIM
+    assert native_blocks < count * DIM // 10
+    assert native_peak < legacy_peak / 2
@@ -0,0 +1,44 @@
+"""
+Test suite for the multi-process embedding pool.
+"""
+import os
+
+import numpy as np
+import pytest
+
+from ..retrieval.encoder_pool import EncoderPool
+
+class FakeModel:
+    """Picklable stand-in for SentenceTransformer that records its process"""
+
+    def get_sentence_embedding_dimension(self):
+        return 3
+
+    def encode(self, texts, batch_size=None):
+        return np.array([[len(t), t.count("a"), os.getpid()] for t in texts], dtype=np.float32)
+
+def fake_loader(model_name):
+    """Worker loader; kept in this light module so spawned workers import quickly"""
+    return FakeModel()
+
+def failing_loader(model_name):
+    """Worker loader for a model that does not exist"""
+    raise OSError(f"{model_name} is not a valid model identifier")
+
+def test_pool_encodes_in_order_across_processes():
+    """Test vectors computed in worker processes come back aligned with the input"""
+    texts = ["a" * (i % 17) + "b" * (i % 5) for i in range(200)]
+    
+    with EncoderPool("fake", processes=2, batch_size=16, loader=fake_loader) as pool:
+        vectors = pool.encode(texts)
+        empty = pool.encode([])
+    
+    np.testing.assert_array_equal(vectors[:, 0], [len(t) for t in texts])
+    np.testing.assert_array_equal(vectors[:, 1], [t.count("a") for t in texts])
+    assert os.getpid() not in vectors[:, 2].tolist()
+    assert empty.shape == (0, 3)
+
+def test_pool_reports_worker_load_failure():
+    """Test a model the workers cannot load fails the constructor instead of hanging"""
+    with pytest.raises(RuntimeError, match="no-such-model"):
+        EncoderPool("no-such-model", processes=2, loader=failing_loader, timeout=60)
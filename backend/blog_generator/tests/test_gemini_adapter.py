@@ -0,0 +1,69 @@
+"""
+Test suite for the shared async Gemini adapter.
+"""
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from ..pipeline.gemini import GeminiAdapter
+from ..pipeline.llm_orchestrator import LLMOrchestrator
+from ..pipeline.research_questions import ResearchQuestionGenerator
+
+LATENCY = 0.2
+
+async def slow_reply(prompt):
+    await asyncio.sleep(LATENCY)
+    return SimpleNamespace(text=f"reply to {prompt}")
+
+def fake_genai():
+    genai = MagicMock()
+    genai.GenerativeModel.side_effect = lambda name, generation_config=None: MagicMock(
+        generate_content_async=slow_reply
+    )
+    return genai
+
+@pytest.mark.asyncio
+async def test_adapter_caches_models_and_runs_calls_concurrently():
+    """Test one model object per config and overlapping, non-blocking requests"""
+    with patch("blog_generator.pipeline.gemini.genai", fake_genai()) as genai:
+        adapter = GeminiAdapter(api_key="key")
+        start = time.perf_counter()
+        replies = await asyncio.gather(*[adapter.generate(f"p{i}", "gemini-pro") for i in range(5)])
+        elapsed = time.perf_counter() - start
+        await adapter.generate("other", "gemini-pro", generation_config={"temperature": 0.1})
+
+    assert replies == [f"reply to p{i}" for i in range(5)]
+    assert elapsed < 2 * LATENCY
+    assert genai.GenerativeModel.call_count == 2
+    genai.configure.assert_called_once_with(api_key="key")
+
+@pytest.mark.asyncio
+async def test_pipeline_callers_share_the_adapter():
+    """Test the orchestrator fan-out and question generator await Gemini through the adapter"""
+    adapter = GeminiAdapter(api_key="key")
+
+    async def slow_completion(**kwargs):
+        await asyncio.sleep(LATENCY)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="gpt reply"))],
+                               content=[SimpleNamespace(text="claude reply")])
+
+    with patch("blog_generator.pipeline.gemini.genai", fake_genai()) as genai, \
+         patch("blog_generator.pipeline.llm_orchestrator.AsyncOpenAI"), \
+         patch("blog_generator.pipeline.llm_orchestrator.AsyncAnthropic"), \
+         patch("blog_generator.pipeline.llm_orchestrator.gemini_adapter", adapter), \
+         patch("blog_generator.pipeline.research_questions.gemini_adapter", adapter):
+        orchestrator = LLMOrchestrator()
+        orchestrator.openai_client.chat.completions.create = slow_completion
+        orchestrator.anthropic_client.messages.create = slow_completion
+
+        start = time.perf_counter()
+        responses = await orchestrator.get_parallel_completions({"gpt4": "a", "claude": "b", "gemini": "c"})
+        elapsed = time.perf_counter() - start
+        questions = await ResearchQuestionGenerator()._generate_with_gemini("questions")
+
+    assert responses == {"gpt4": "gpt reply", "claude": "claude reply", "gemini": "reply to c"}
+    assert elapsed < 2 * LATENCY
+    assert questions == ["reply to questions"]
+    assert genai.GenerativeModel.call_count == 2
@@ -0,0 +1,191 @@
+"""
+Test suite for latency histograms and hedged (raced) completions.
+"""
+import asyncio
+import itertools
+import json
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from ..pipeline.hedging import LatencyHistogram, LatencyRecorder, hedged
+from ..pipeline.llm_orchestrator import LLMOrchestrator
+from ..pipeline.rate_limiter import RateLimiter
+from ..pipeline.response_cache import ResponseCache
+
+def test_histogram_quantiles():
+    """Test quantiles fall within a bucket width of the exact values"""
+    histogram = LatencyHistogram()
+    samples = [0.1 * i for i in range(1, 101)]
+    for seconds in samples:
+        histogram.record(seconds)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 100
+    assert snapshot["mean"] == pytest.approx(5.05)
+    assert 4.0 < snapshot["p50"] < 6.0
+    assert 8.0 < snapshot["p95"] <= 10.0
+    assert snapshot["p99"] <= snapshot["max"] == pytest.approx(10.0)
+    assert sum(snapshot["buckets"].values()) == 100
+    assert LatencyHistogram().quantile(0.95) is None
+
+@pytest.mark.asyncio
+async def test_hedge_wins_and_loser_is_cancelled():
+    """Test a slow primary is hedged after its delay and cancelled once the secondary answers"""
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(1.0)
+            return "slow"
+        except asyncio.CancelledError:
+            cancelled.append("primary")
+            raise
+
+    async def fast():
+        await asyncio.sleep(0.05)
+        return "fast"
+
+    start = time.perf_counter()
+    winner, result = await hedged([("primary", slow), ("secondary", fast)], lambda name: 0.1)
+    elapsed = time.perf_counter() - start
+
+    assert (winner, result) == ("secondary", "fast")
+    assert 0.15 <= elapsed < 0.5
+    assert cancelled == ["primary"]
+
+@pytest.mark.asyncio
+async def test_fast_primary_never_hedges_and_failures_hand_over():
+    """Test no hedge is sent when the primary is quick, and a failure starts the next candidate"""
+    started = []
+
+    def candidate(name, delay, error=None):
+        async def request():
+            started.append(name)
+            await asyncio.sleep(delay)
+            if error:
+                raise error
+            return name
+        return request
+
+    assert await hedged([("a", candidate("a", 0.01)), ("b", candidate("b", 0.01))],
+                        lambda name: 0.5) == ("a", "a")
+    assert started == ["a"]
+
+    started.clear()
+    start = time.perf_counter()
+    winner, _ = await hedged([("a", candidate("a", 0.01, ValueError("bad json"))),
+                              ("b", candidate("b", 0.01))], lambda name: 5.0)
+    assert winner == "b" and time.perf_counter() - start < 0.5
+
+    with pytest.raises(RuntimeError):
+        await hedged([("a", candidate("a", 0.01, ValueError("a"))),
+                      ("b", candidate("b", 0.01, RuntimeError("b")))], lambda name: 5.0)
+
+def make_orchestrator(gpt_latency, claude_latency, gpt_reply='{"score": 1}', response_cache=None):
+    """Orchestrator whose providers answer after sampled latencies"""
+    async def openai_create(**kwargs):
+        await asyncio.sleep(gpt_latency())
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=gpt_reply))])
+
+    async def claude_create(**kwargs):
+        await asyncio.sleep(claude_latency())
+        return SimpleNamespace(content=[SimpleNamespace(text='{"score": 2}')])
+
+    limits = {"openai": {"rpm": 1_000_000, "tpm": 1e9}, "anthropic": {"rpm": 1_000_000, "tpm": 1e9}}
+    with patch("blog_generator.pipeline.llm_orchestrator.AsyncOpenAI"), \
+         patch("blog_generator.pipeline.llm_orchestrator.AsyncAnthropic"):
+        orchestrator = LLMOrchestrator(rate_limiter=RateLimiter(limits=limits),
+                                       latency_recorder=LatencyRecorder(),
+                                       response_cache=response_cache,
+                                       default_hedge_delay=0.1,
+                                       min_hedge_delay=0.01)
+    orchestrator.openai_client.chat.completions.create = openai_create
+    orchestrator.anthropic_client.messages.create = claude_create
+    return orchestrator
+
+@pytest.mark.asyncio
+async def test_raced_structured_completion_skips_invalid_json():
+    """Test an invalid structured response hands over to the next model"""
+    cache = ResponseCache()
+    orchestrator = make_orchestrator(lambda: 0.01, lambda: 0.01, gpt_reply="not json", response_cache=cache)
+    result = await orchestrator.get_structured_completion(["gpt4", "claude"], "score it", {"score": 0})
+    assert result == {"score": 2}
+    # Only the valid response is cached, so the invalid one is not replayed
+    assert cache.stats()["entries"] == 1
+    with pytest.raises(ValueError):
+        await orchestrator.get_structured_completion("gpt4", "score it", {"score": 0})
+    assert cache.stats()["entries"] == 1
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cached", [False, True])
+async def test_each_response_is_validated_once(cached):
+    """Test raced and cached completions parse each response a single time"""
+    orchestrator = make_orchestrator(lambda: 0.01, lambda: 0.5,
+                                     response_cache=ResponseCache() if cached else None)
+    parsed = []
+
+    def validate(text):
+        parsed.append(text)
+        return json.loads(text)
+
+    for _ in range(2):
+        parsed.clear()
+        assert await orchestrator.get_raced_completion(["gpt4", "claude"], "score it",
+                                                       validate=validate) == ("gpt4", {"score": 1})
+        assert parsed == ['{"score": 1}']
+
+@pytest.mark.asyncio
+async def test_cancelled_and_failed_attempts_are_recorded():
+    """Test hedged-out and failed attempts count toward the latency the hedge delay is based on"""
+    orchestrator = make_orchestrator(lambda: 1.0, lambda: 0.01)
+    winner, _ = await orchestrator.get_raced_completion(["gpt4", "claude"], "race")
+    assert winner == "claude"
+    cancelled = orchestrator.latency.histogram("gpt4:gpt-4")
+    assert cancelled.count == 1 and cancelled.max >= 0.1
+
+    async def failing(**kwargs):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("provider down")
+
+    orchestrator.anthropic_client.messages.create = failing
+    with pytest.raises(RuntimeError):
+        await orchestrator.get_completion("claude", "fail")
+    assert orchestrator.latency.histogram("claude:claude-3-opus-20240229").count == 2
+
+    # The p95 never drops below the floor
+    orchestrator.min_hedge_delay = 0.5
+    for _ in range(30):
+        orchestrator.latency.record("gpt4:gpt-4", 0.001)
+    assert orchestrator.hedge_delay("gpt4") == 0.5
+
+@pytest.mark.asyncio
+async def test_hedging_cuts_tail_latency():
+    """Test racing a primary with a slow tail against a steady secondary lowers p99"""
+    calls = itertools.count(1)
+    # GPT-4: usually 20ms, every 25th call stalls for 400ms; Claude: steady 60ms
+    gpt_latency = lambda: 0.4 if next(calls) % 25 == 0 else 0.02
+    orchestrator = make_orchestrator(gpt_latency, lambda: 0.06)
+
+    # Warm up the primary's histogram so the hedge delay is its p95
+    for _ in range(30):
+        await orchestrator.get_completion("gpt4", "warm up")
+    hedge_delay = orchestrator.hedge_delay("gpt4")
+    assert 0.02 < hedge_delay < orchestrator.default_hedge_delay
+
+    for _ in range(40):
+        start = time.perf_counter()
+        await orchestrator.get_completion("gpt4", "plain")
+        orchestrator.latency.record("plain:gpt4", time.perf_counter() - start)
+        await orchestrator.get_raced_completion(["gpt4", "claude"], "raced")
+
+    stats = orchestrator.get_latency_stats()
+    plain, raced = stats["plain:gpt4"], stats["race:gpt4+claude"]
+    print(f"\nhedge delay {hedge_delay * 1000:.0f}ms\n"
+          f"plain p50 {plain['p50'] * 1000:.0f}ms p99 {plain['p99'] * 1000:.0f}ms\n"
+          f"raced p50 {raced['p50'] * 1000:.0f}ms p99 {raced['p99'] * 1000:.0f}ms\n"
+          f"{json.dumps({'plain': plain['buckets'], 'raced': raced['buckets']})}")
+    assert raced["count"] == 40
+    assert plain["p99"] > 0.3
+    assert raced["p99"] < 0.5 * plain["p99"]
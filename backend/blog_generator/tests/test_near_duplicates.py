@@ -0,0 +1,39 @@
+"""
+Test suite for MinHash/LSH near-duplicate detection.
+"""
+import pytest
+
+from ..retrieval.near_duplicates import MinHasher, NearDuplicateIndex, estimate_jaccard
+
+def test_signature_estimates_jaccard():
+    """Test signature agreement tracks the true shingle Jaccard similarity"""
+    hasher = MinHasher(num_perm=256)
+    first = "the quick brown fox jumps over the lazy dog " * 5
+    second = first + "and then naps in the afternoon sun"
+    exact = len(hasher.shingles(first) & hasher.shingles(second)) / len(hasher.shingles(first) | hasher.shingles(second))
+    
+    estimate = estimate_jaccard(hasher.signature(first), hasher.signature(second))
+    
+    assert abs(estimate - exact) < 0.1
+    assert estimate_jaccard(hasher.signature("Same  TEXT"), hasher.signature("same text")) == 1.0
+
+def test_index_candidates_persist_and_delete(tmp_path):
+    """Test LSH candidates, persistence across reopen and deletion"""
+    path = str(tmp_path / "signatures.sqlite3")
+    index = NearDuplicateIndex(path)
+    text = "a regenerated research section about model weights and evaluation " * 3
+    index.add("c", ["a", "b"], [index.signature(text), index.signature("something else entirely")])
+    index.close()
+    
+    reopened = NearDuplicateIndex(path)
+    doc_id, jaccard, candidates = reopened.best_match("c", reopened.signature(text + "!"))
+    
+    assert doc_id == "a" and jaccard > 0.9 and candidates >= 1
+    assert reopened.best_match("other", reopened.signature(text)) == (None, 0.0, 0)
+    reopened.delete("c", ["a"])
+    assert reopened.best_match("c", reopened.signature(text))[0] is None
+    
+def test_bands_must_divide_signature():
+    """Test invalid band configuration is rejected"""
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(num_perm=100, bands=32)
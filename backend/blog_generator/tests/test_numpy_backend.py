@@ -0,0 +1,196 @@
+"""
+Test suite for the in-process NumPy exact-search backend.
+"""
+import pytest
+from unittest.mock import patch
+
+import numpy as np
+
+from ..retrieval.numpy_backend import NumpyClient
+from ..vector_store import Document, VectorStore
+from .helpers import count_encoder
+
+def make_records(n=50, dim=8, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    ids = [f"id{i}" for i in range(n)]
+    metadatas = [{"section_type": "technical" if i % 2 else "core_analysis", "rank": i} for i in range(n)]
+    return ids, vectors, metadatas
+
+def test_query_matches_brute_force_cosine():
+    """Test top-k and distances match an exact cosine ranking"""
+    ids, vectors, metadatas = make_records()
+    collection = NumpyClient().get_or_create_collection("research_sections")
+    collection.add(ids=ids, embeddings=vectors, documents=ids, metadatas=metadatas)
+    query = vectors[:2] + 0.01
+    
+    results = collection.query(query_embeddings=query, n_results=5)
+    
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    for row, q in enumerate(query):
+        cosine = normalized @ (q / np.linalg.norm(q))
+        expected = [ids[i] for i in np.argsort(-cosine)[:5]]
+        assert results["ids"][row] == expected
+        np.testing.assert_allclose(results["distances"][row], 1 - np.sort(cosine)[::-1][:5], atol=1e-5)
+
+def test_where_filters():
+    """Test equality, operator and boolean filters restrict candidates"""
+    ids, vectors, metadatas = make_records()
+    collection = NumpyClient().get_or_create_collection("c")
+    collection.add(ids=ids, embeddings=vectors, metadatas=metadatas)
+    
+    results = collection.query(query_embeddings=[vectors[0]], n_results=50, where={"section_type": "technical"})
+    assert len(results["ids"][0]) == 25
+    assert all(m["section_type"] == "technical" for m in results["metadatas"][0])
+    
+    where = {"$and": [{"section_type": {"$in": ["technical"]}}, {"rank": {"$lt": 10}}]}
+    assert sorted(collection.get(where=where)["ids"]) == sorted(f"id{i}" for i in (1, 3, 5, 7, 9))
+
+def test_persist_and_mmap_reload(tmp_path):
+    """Test collections reload from .npy + JSON with a memory-mapped matrix"""
+    ids, vectors, metadatas = make_records(10)
+    client = NumpyClient(str(tmp_path))
+    client.get_or_create_collection("poems").add(ids=ids, embeddings=vectors, metadatas=metadatas)
+    client.get_collection("poems").delete(ids=["id0"])
+    
+    reopened = NumpyClient(str(tmp_path)).get_collection("poems")
+    
+    assert reopened.count() == 9
+    assert isinstance(reopened._matrix, np.memmap)
+    assert reopened.query(query_embeddings=[vectors[3]], n_results=1)["ids"] == [["id3"]]
+
+@pytest.mark.parametrize("storage", ["float32", "int8"])
+def test_writes_are_journaled_and_compacted(tmp_path, monkeypatch, storage):
+    """Test small writes append to the journal instead of rewriting the matrix"""
+    from ..retrieval import numpy_backend
+    monkeypatch.setattr(numpy_backend, "COMPACT_MIN_ROWS", 15)
+    ids, vectors, metadatas = make_records(30)
+    collection = NumpyClient(str(tmp_path), storage=storage).get_or_create_collection("c")
+    matrix_path = tmp_path / "c" / "embeddings.npy"
+    written = matrix_path.stat().st_mtime_ns
+    
+    for i in range(10):
+        collection.add(ids=ids[i:i + 1], embeddings=vectors[i:i + 1], metadatas=metadatas[i:i + 1])
+    collection.delete(ids=["id0"])
+    collection.upsert(ids=["id1"], embeddings=vectors[29:30], documents=["moved"])
+    assert matrix_path.stat().st_mtime_ns == written
+    assert len((tmp_path / "c" / "journal.jsonl").read_text().splitlines()) == 13
+    
+    # A write torn by a crash is dropped on reopen, everything before it is kept
+    with open(tmp_path / "c" / "journal.jsonl", "a") as f:
+        f.write('{"op": "add", "ids": ["torn"')
+    reopened = NumpyClient(str(tmp_path), storage=storage).get_collection("c")
+    assert reopened.count() == 9
+    assert isinstance(reopened._matrix, np.memmap)
+    assert not (tmp_path / "c" / "journal.jsonl").exists()
+    assert reopened.get(ids=["id1"])["documents"] == ["moved"]
+    np.testing.assert_allclose(reopened.get(ids=["id1"], include=["embeddings"])["embeddings"][0],
+                               vectors[29] / np.linalg.norm(vectors[29]), atol=1e-6)
+    assert reopened.query(query_embeddings=[vectors[5]], n_results=1)["ids"] == [["id5"]]
+    
+    # Enough journaled rows fold back into embeddings.npy
+    reopened.add(ids=ids[10:], embeddings=vectors[10:], metadatas=metadatas[10:])
+    assert not (tmp_path / "c" / "journal.jsonl").exists()
+    assert NumpyClient(str(tmp_path), storage=storage).get_collection("c").count() == 29
+    assert reopened.memory_usage()["full_precision_bytes"] == 0
+
+def test_queries_see_consistent_state_during_writes():
+    """Test queries and writes from several threads never observe a half-applied write"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    ids, vectors, _ = make_records(400, dim=16)
+    collection = NumpyClient().get_or_create_collection("c")
+    collection.add(ids=ids[:10], embeddings=vectors[:10], documents=ids[:10])
+    
+    def write(i):
+        collection.add(ids=[ids[i]], embeddings=vectors[i:i + 1], documents=[ids[i]])
+        if i % 3 == 0:
+            collection.delete(ids=[ids[i - 5]])
+    
+    def read(i):
+        results = collection.query(query_embeddings=[vectors[i % 10]], n_results=5)
+        assert results["ids"][0] == results["documents"][0]
+        assert len(results["distances"][0]) == 5
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(write, i) for i in range(10, 400)]
+        futures += [pool.submit(read, i) for i in range(400)]
+        for future in futures:
+            future.result()
+    assert collection.count() == len(collection.get(include=[])["ids"]) == len(collection._rows)
+
+def test_add_skips_existing_and_upsert_replaces():
+    """Test id handling mirrors Chroma"""
+    collection = NumpyClient().get_or_create_collection("c")
+    collection.add(ids=["a"], embeddings=[[1.0, 0.0]], documents=["first"])
+    collection.add(ids=["a"], embeddings=[[0.0, 1.0]], documents=["second"])
+    assert collection.get(ids=["a"])["documents"] == ["first"]
+    
+    collection.upsert(ids=["a"], embeddings=[[0.0, 1.0]], documents=["second"])
+    assert collection.get(ids=["a"])["documents"] == ["second"]
+    assert collection.count() == 1
+
+def test_ids_repeated_within_a_batch():
+    """Test add rejects a batch with a repeated id and upsert keeps its last occurrence"""
+    collection = NumpyClient().get_or_create_collection("c")
+    with pytest.raises(ValueError):
+        collection.add(ids=["a", "b", "a"], embeddings=[[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+    assert collection.count() == 0
+    
+    collection.upsert(ids=["a", "b", "a"], embeddings=[[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]],
+                      documents=["first", "b", "last"])
+    assert collection.count() == 2
+    assert sorted(collection.get()["ids"]) == ["a", "b"]
+    assert collection.get(ids=["a"])["documents"] == ["last"]
+    collection.delete(ids=["a"])
+    assert collection.get()["ids"] == ["b"]
+
+@pytest.mark.asyncio
+async def test_vector_store_numpy_backend(tmp_path, mock_model):
+    """Test VectorStore runs unchanged on the numpy backend"""
+    mock_model.return_value.encode.side_effect = count_encoder("poem", "model", length=False)
+    store = VectorStore.from_config(
+        {"embedding_model": "all-MiniLM-L6-v2", "backend": "numpy"},
+        persist_directory=str(tmp_path)
+    )
+    docs = [
+        Document(content="poem poem poem", metadata={"section_type": "subtextual"}, id="p"),
+        Document(content="model model", metadata={"section_type": "technical"}, id="m"),
+    ]
+    store.add_documents_bulk(docs)
+    
+    results = await store.similarity_search("poem", k=2, threshold=0.0, section_type="technical")
+    
+    assert [doc.id for doc in results] == ["m"]
+    assert store.list_collections() == ["research_sections"]
+    assert (tmp_path / "numpy" / "research_sections" / "embeddings.npy").exists()
+
+@pytest.mark.parametrize("storage,max_bytes_ratio", [("float16", 0.5), ("int8", 0.3)])
+def test_quantized_storage_recall_and_memory(tmp_path, storage, max_bytes_ratio):
+    """Test quantized search keeps recall with re-ranking and shrinks resident memory"""
+    from ..benchmarks.quantization_benchmark import recall_at_k, synthetic_embeddings
+    
+    vectors = synthetic_embeddings(2000, dim=64)
+    ids = [str(i) for i in range(len(vectors))]
+    queries = vectors[:50] + 0.05
+    baseline = NumpyClient().get_or_create_collection("baseline")
+    baseline.add(ids=ids, embeddings=vectors)
+    quantized = NumpyClient(str(tmp_path), storage=storage, rerank_factor=4).get_or_create_collection("q")
+    quantized.add(ids=ids, embeddings=vectors)
+    
+    truth = baseline.query(query_embeddings=queries, n_results=10)["ids"]
+    found = quantized.query(query_embeddings=queries, n_results=10)["ids"]
+    reloaded = NumpyClient(str(tmp_path), storage=storage, rerank_factor=4).get_collection("q")
+    
+    assert recall_at_k(found, truth) >= 0.98
+    usage = quantized.memory_usage()
+    assert usage["search_bytes"] <= max_bytes_ratio * baseline.memory_usage()["search_bytes"]
+    assert usage["full_precision_bytes"] == 0
+    assert reloaded.query(query_embeddings=queries, n_results=10)["ids"] == found
+
+def test_quantized_storage_requires_numpy_backend(tmp_path):
+    """Test the Chroma backend rejects quantized storage"""
+    with patch("chromadb.PersistentClient"), \
+         patch("blog_generator.vector_store.SentenceTransformer"):
+        with pytest.raises(ValueError):
+            VectorStore(persist_directory=str(tmp_path), model_name="m", storage_dtype="int8")
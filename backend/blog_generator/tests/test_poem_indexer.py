@@ -0,0 +1,62 @@
+"""
+Test suite for incremental poem indexing.
+"""
+import os
+import pytest
+
+from ..poem_indexer import PoemIndexer, split_frontmatter
+from ..vector_store import VectorStore
+from .helpers import count_encoder
+
+POEM = '---\npublished: true\ndescription: "{description}"\n---\n{body}\n'
+
+@pytest.fixture
+def mock_model(mock_model):
+    mock_model.return_value.encode.side_effect = count_encoder("e")
+    return mock_model
+
+def write_poem(directory, name, body, description="a poem"):
+    path = directory / f"{name}.md"
+    path.write_text(POEM.format(description=description, body=body), encoding="utf-8")
+    return path
+
+def test_split_frontmatter():
+    """Test frontmatter fields are parsed and stripped from the body"""
+    fields, body = split_frontmatter(POEM.format(description="for Wednesday", body="My cat"))
+    assert fields == {"published": "true", "description": "for Wednesday"}
+    assert body == "My cat\n"
+    assert split_frontmatter("no frontmatter") == ({}, "no frontmatter")
+
+def test_sync_reembeds_only_changed_poems(tmp_path, mock_model):
+    """Test added, edited, touched and removed poems are handled incrementally"""
+    poems = tmp_path / "poems"
+    poems.mkdir()
+    write_poem(poems, "Autumn", "leaves fall")
+    write_poem(poems, "Winter", "snow settles")
+    doomed = write_poem(poems, "Spring", "rain returns")
+
+    store = VectorStore(persist_directory=str(tmp_path / "db"), model_name="m", backend="numpy")
+    indexer = PoemIndexer(store, poems)
+    collection = store.client.get_collection("poems")
+
+    first = indexer.sync()
+    assert (first["added"], first["chunks"], collection.count()) == (3, 3, 3)
+
+    embedded = mock_model.return_value.encode.call_count
+    second = PoemIndexer(store, poems).sync()
+    assert second["unchanged"] == 3 and second["chunks"] == 0
+    assert second["seconds"] < 1.0
+    assert mock_model.return_value.encode.call_count == embedded
+
+    write_poem(poems, "Autumn", "leaves fall and burn")
+    stat = (poems / "Winter.md").stat()
+    os.utime(poems / "Winter.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    doomed.unlink()
+    third = PoemIndexer(store, poems).sync()
+
+    assert (third["added"], third["updated"], third["removed"], third["unchanged"]) == (0, 1, 1, 1)
+    assert collection.count() == 2
+    records = collection.get(ids=["Autumn.md#0"])
+    assert records["documents"] == ["leaves fall and burn\n"]
+    assert store.sparse_index.search("poems", "rain") == []
+    assert PoemIndexer(store, poems).sync()["unchanged"] == 2
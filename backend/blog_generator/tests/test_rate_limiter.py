@@ -0,0 +1,161 @@
+"""
+Test suite for the per-provider token-bucket rate limiter.
+"""
+import asyncio
+import time
+import pytest
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from ..llm_orchestrator import LLMOrchestrator as ScriptOrchestrator
+from ..pipeline.llm_orchestrator import LLMOrchestrator
+from ..pipeline.rate_limiter import RateLimiter, estimate_tokens, parse_reset, retry_after_seconds
+
+class FakeStatusError(Exception):
+    """Provider SDK error carrying a status code and response headers"""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+def test_header_parsing():
+    """Test reset durations, timestamps and Retry-After variants"""
+    assert parse_reset("6m0s") == 360
+    assert parse_reset("1.5s") == 1.5
+    assert parse_reset("20ms") == pytest.approx(0.02)
+    assert parse_reset("12") == 12
+    soon = (datetime.now(timezone.utc) + timedelta(seconds=30)).isoformat()
+    assert 28 < parse_reset(soon) <= 30
+    assert parse_reset("soon") is None
+
+    assert retry_after_seconds({"Retry-After": "3"}) == 3
+    assert retry_after_seconds({"retry-after-ms": "250", "retry-after": "1"}) == 0.25
+    http_date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+    assert 58 < retry_after_seconds({"Retry-After": http_date}) <= 60
+    assert retry_after_seconds({}) is None
+    assert estimate_tokens("a" * 400, None, max_tokens=100) == 200
+
+@pytest.mark.asyncio
+async def test_requests_paced_by_bucket():
+    """Test requests beyond the burst are spaced at the per-minute rate"""
+    limiter = RateLimiter(limits={"openai:gpt-4": {"rpm": 600, "tpm": 1_000_000, "burst_seconds": 0.1}})
+
+    async def request():
+        return time.perf_counter()
+
+    start = time.perf_counter()
+    stamps = await asyncio.gather(*[limiter.call("openai", "gpt-4", request) for _ in range(5)])
+    elapsed = time.perf_counter() - start
+
+    # One request in the burst, then one every 0.1s
+    assert 0.35 < elapsed < 0.8
+    assert stamps == sorted(stamps)
+    assert limiter.stats()["openai:gpt-4"]["requests"] == 5
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_large_requests():
+    """Test the tokens-per-minute bucket holds back requests once spent"""
+    limiter = RateLimiter(limits={"anthropic": {"rpm": 10_000, "tpm": 6_000, "burst_seconds": 1}})
+
+    async def request():
+        return "ok"
+
+    start = time.perf_counter()
+    await limiter.call("anthropic", "claude", request, tokens=100)
+    await limiter.call("anthropic", "claude", request, tokens=50)
+    assert time.perf_counter() - start > 0.4
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_every_caller():
+    """Test a 429 with Retry-After is retried and holds concurrent requests to that model"""
+    limiter = RateLimiter(limits={"openai": {"rpm": 100_000, "tpm": 10_000_000}}, base_delay=0.01)
+    attempts = []
+
+    async def throttled_once():
+        attempts.append(time.perf_counter())
+        if len(attempts) == 1:
+            raise FakeStatusError(429, {"retry-after": "0.3", "x-ratelimit-remaining-requests": "0"})
+        return "done"
+
+    async def other():
+        await asyncio.sleep(0.05)
+        return time.perf_counter()
+
+    start = time.perf_counter()
+    result, other_finished = await asyncio.gather(
+        limiter.call("openai", "gpt-4", throttled_once),
+        limiter.call("openai", "gpt-4", other)
+    )
+
+    assert result == "done"
+    assert attempts[1] - start >= 0.3
+    assert other_finished - start >= 0.3
+    stats = limiter.stats()["openai:gpt-4"]
+    assert stats["throttled"] == 1 and stats["retries"] == 1
+
+@pytest.mark.asyncio
+async def test_backoff_gives_up_and_other_errors_propagate():
+    """Test retries stop after max_retries and non-retryable errors are raised at once"""
+    limiter = RateLimiter(max_retries=2, base_delay=0.01)
+    calls = []
+
+    async def always_throttled():
+        calls.append(1)
+        raise FakeStatusError(429)
+
+    with pytest.raises(FakeStatusError):
+        await limiter.call("gemini", "gemini-pro", always_throttled)
+    assert len(calls) == 3
+
+    async def bad_request():
+        calls.append(1)
+        raise FakeStatusError(400)
+
+    calls.clear()
+    with pytest.raises(FakeStatusError):
+        await limiter.call("gemini", "gemini-pro", bad_request)
+    assert len(calls) == 1
+
+def test_observe_headers_adapts_limits():
+    """Test server-reported limits resize the buckets and an exhausted window pauses them"""
+    limiter = RateLimiter()
+    limiter.observe_headers("anthropic", "claude", {
+        "anthropic-ratelimit-requests-limit": "4000",
+        "anthropic-ratelimit-requests-remaining": "0",
+        "anthropic-ratelimit-requests-reset": (datetime.now(timezone.utc) + timedelta(seconds=5)).isoformat()
+    })
+    requests, _ = limiter._buckets["anthropic:claude"]
+    assert requests.per_minute == 4000
+    assert limiter._paused_until["anthropic:claude"] - time.monotonic() > 4
+
+@pytest.mark.asyncio
+async def test_orchestrator_retries_throttled_completion():
+    """Test the pipeline orchestrator routes completions through the limiter"""
+    limiter = RateLimiter(base_delay=0.01)
+    replies = [FakeStatusError(429, {"retry-after-ms": "50"}),
+               SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="answer"))])]
+
+    async def create(**kwargs):
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    with patch("blog_generator.pipeline.llm_orchestrator.AsyncOpenAI"), \
+         patch("blog_generator.pipeline.llm_orchestrator.AsyncAnthropic"):
+        orchestrator = LLMOrchestrator(rate_limiter=limiter)
+    orchestrator.openai_client.chat.completions.create = create
+
+    assert await orchestrator.get_completion("gpt4", "question") == "answer"
+    assert limiter.stats()["openai:gpt-4"]["throttled"] == 1
+
+def test_script_orchestrator_leaves_retries_to_the_limiter():
+    """Test the script-mode orchestrator's SDK clients never retry on their own"""
+    orchestrator = ScriptOrchestrator({"openai": {"api_key": "key", "config": {"model_name": "gpt-4"}},
+                                       "anthropic": {"api_key": "key", "config": {"model_name": "claude"}},
+                                       "google": {"api_key": "key", "config": {"model_name": "gemini-pro"}}})
+    assert orchestrator.openai_client.max_retries == 0
+    assert orchestrator.anthropic_client.max_retries == 0
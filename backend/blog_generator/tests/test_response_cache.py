@@ -0,0 +1,60 @@
+"""
+Test suite for the LLM response cache.
+"""
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from ..pipeline.llm_orchestrator import LLMOrchestrator
+from ..pipeline.response_cache import ResponseCache, request_digest
+
+def test_response_cache_ttl_eviction_and_namespaces(tmp_path):
+    """Test expiry, LRU eviction, per-namespace metrics and persistence"""
+    path = str(tmp_path / "responses.sqlite3")
+    cache = ResponseCache(path, ttl_seconds=60, max_entries=2)
+    cache.put("gpt4:gpt-4", "a", "first")
+    cache.put("claude:opus", "b", "second")
+    assert cache.get("gpt4:gpt-4", "a") == "first"
+    cache.put("gpt4:gpt-4", "c", "third")
+
+    assert cache.get("claude:opus", "b") is None
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["namespaces"]["gpt4:gpt-4"]["hits"] == 1
+    assert stats["namespaces"]["claude:opus"]["misses"] == 1
+
+    with patch("blog_generator.pipeline.response_cache.time.time", return_value=10**10):
+        assert cache.get("gpt4:gpt-4", "a") is None
+    cache.close()
+
+    reopened = ResponseCache(path, ttl_seconds=60, max_entries=2)
+    assert reopened.get("gpt4:gpt-4", "c") == "third"
+    reopened.clear("gpt4:gpt-4")
+    assert reopened.stats()["entries"] == 0
+
+def test_request_digest_covers_every_field():
+    """Test any change to the request changes the cache key"""
+    base = dict(system_prompt="s", prompt="p", temperature=0.3, max_tokens=2000)
+    assert request_digest(**base) == request_digest(**dict(reversed(list(base.items()))))
+    assert request_digest(**base) != request_digest(**{**base, "temperature": 0.7})
+    assert request_digest(**base) != request_digest(**{**base, "system_prompt": None})
+
+@pytest.mark.asyncio
+async def test_get_completion_served_from_cache(tmp_path):
+    """Test identical requests skip the API, and bypass_cache refreshes the entry"""
+    with patch("blog_generator.pipeline.llm_orchestrator.AsyncOpenAI"), \
+         patch("blog_generator.pipeline.llm_orchestrator.AsyncAnthropic"):
+        orchestrator = LLMOrchestrator(response_cache=ResponseCache(str(tmp_path / "responses.sqlite3")))
+    replies = iter(["first answer", "fresh answer"])
+    create = AsyncMock(side_effect=lambda **kwargs: SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=next(replies)))]))
+    orchestrator.openai_client.chat.completions.create = create
+
+    assert await orchestrator.get_completion("gpt4", "prompt", system_prompt="sys") == "first answer"
+    assert await orchestrator.get_completion("gpt4", "prompt", system_prompt="sys") == "first answer"
+    assert create.await_count == 1
+
+    assert await orchestrator.get_completion("gpt4", "prompt", system_prompt="sys", bypass_cache=True) == "fresh answer"
+    assert await orchestrator.get_completion("gpt4", "prompt", system_prompt="sys") == "fresh answer"
+    assert create.await_count == 2
+    assert orchestrator.get_cache_stats()["namespaces"]["gpt4:gpt-4"] == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
@@ -0,0 +1,129 @@
+"""
+Test suite for section_type sharding of the research collection.
+"""
+import pytest
+from unittest.mock import patch
+
+import numpy as np
+
+from ..retrieval.sharding import DEFAULT_SHARD, shard_values_from_where
+from ..vector_store import Document, VectorStore
+from .helpers import count_encoder
+
+@pytest.fixture
+def mock_model(mock_model):
+    mock_model.return_value.encode.side_effect = count_encoder("a", "e")
+    return mock_model
+
+def documents():
+    types = ["technical", "core_analysis", "subtextual", None]
+    return [
+        Document(content=f"{'a' * i} note {'e' * (i % 4)}",
+                 metadata={"section_type": types[i % 4]} if types[i % 4] else {}, id=f"d{i}")
+        for i in range(40)
+    ]
+
+def test_shard_values_from_where():
+    """Test shard routing understands equality, $eq, $in and $and"""
+    assert shard_values_from_where(None, "section_type") is None
+    assert shard_values_from_where({"model": "gpt4"}, "section_type") is None
+    assert shard_values_from_where({"section_type": "technical"}, "section_type") == {"technical"}
+    assert shard_values_from_where({"section_type": {"$in": ["a", "b"]}}, "section_type") == {"a", "b"}
+    assert shard_values_from_where(
+        {"$and": [{"section_type": {"$eq": "a"}}, {"model": "gpt4"}]}, "section_type"
+    ) == {"a"}
+
+@pytest.mark.parametrize("backend", ["numpy", "chroma"])
+def test_sharded_results_match_unsharded(tmp_path, backend, mock_model):
+    """Test routed and fanned-out queries return what a single collection would"""
+    plain = VectorStore(persist_directory=str(tmp_path / "plain"), model_name="m", backend=backend,
+                        query_cache_size=0)
+    sharded = VectorStore(persist_directory=str(tmp_path / "sharded"), model_name="m", backend=backend,
+                          query_cache_size=0, shard_by_section_type=True)
+    plain.add_documents_bulk(documents())
+    sharded.add_documents_bulk(documents())
+    queries = ["aaaa note e", "aaaaaaaaaaaa note eee"]
+
+    for where in (None, {"section_type": "technical"}, {"section_type": {"$in": ["subtextual", "technical"]}}):
+        expected = plain.query_many(queries, k=5, where=where)
+        found = sharded.query_many(queries, k=5, where=where)
+        for expected_hits, found_hits in zip(expected, found):
+            # HNSW distances agree only to float precision, so near-ties may swap
+            assert np.allclose([hit["distance"] for hit in found_hits],
+                               [hit["distance"] for hit in expected_hits], atol=1e-5)
+
+    collection = sharded.research_collection
+    assert collection.count() == 40
+    assert collection.shards[DEFAULT_SHARD].count() == 10
+    assert collection.get(ids=["d3", "d0"])["ids"] == ["d3", "d0"]
+    sharded.delete_documents(["d1", "d2"])
+    assert collection.count() == 38
+    sharded.close()
+
+@pytest.mark.parametrize("backend", ["numpy", "chroma"])
+def test_unknown_section_types_found_in_default_shard(tmp_path, backend, mock_model):
+    """Test filters on section types outside the shard keys match what a single collection returns"""
+    custom = [Document(content=f"{'a' * i} custom {'e' * i}", metadata={"section_type": "custom"}, id=f"c{i}")
+              for i in range(1, 3)]
+    plain = VectorStore(persist_directory=str(tmp_path / "plain"), model_name="m", backend=backend,
+                        query_cache_size=0)
+    sharded = VectorStore(persist_directory=str(tmp_path / "sharded"), model_name="m", backend=backend,
+                          query_cache_size=0, shard_by_section_type=True)
+    for store in (plain, sharded):
+        store.add_documents_bulk(documents() + custom)
+
+    for where in ({"section_type": "custom"}, {"section_type": {"$in": ["custom", "technical"]}}):
+        expected = plain.query_many(["aa custom ee"], k=5, where=where)[0]
+        found = sharded.query_many(["aa custom ee"], k=5, where=where)[0]
+        assert sorted(hit["id"] for hit in found) == sorted(hit["id"] for hit in expected)
+    assert sorted(sharded.research_collection.get(where={"section_type": "custom"})["ids"]) == ["c1", "c2"]
+    sharded.close()
+    plain.close()
+
+@pytest.mark.asyncio
+async def test_filtered_search_touches_one_shard(tmp_path, mock_model):
+    """Test a section_type filter routes to a single shard and no filter fans out"""
+    store = VectorStore(persist_directory=str(tmp_path), model_name="m", backend="numpy",
+                        shard_by_section_type=True)
+    store.add_documents_bulk(documents())
+    shards = store.research_collection.shards
+    spies = {name: patch.object(shard, "query", wraps=shard.query) for name, shard in shards.items()}
+    mocks = {name: spy.start() for name, spy in spies.items()}
+    try:
+        results = await store.similarity_search("aaaa note", k=3, threshold=0.0, section_type="technical")
+        assert [name for name, mock in mocks.items() if mock.called] == ["technical"]
+        assert all(doc.metadata["section_type"] == "technical" for doc in results)
+
+        store.query_many(["aaaa note"], k=3)
+        assert all(mock.called for mock in mocks.values())
+    finally:
+        for spy in spies.values():
+            spy.stop()
+
+@pytest.mark.parametrize("backend", ["numpy", "chroma"])
+def test_upsert_moves_records_between_shards(tmp_path, backend, mock_model):
+    """Test an upsert that changes section_type leaves no copy in the old shard"""
+    store = VectorStore(persist_directory=str(tmp_path), model_name="m", backend=backend,
+                        shard_by_section_type=True)
+    collection = store.research_collection
+    store.add_documents_bulk(documents())
+    embedding = collection.get(ids=["d0"], include=["embeddings"])["embeddings"]
+
+    collection.upsert(ids=["d0"], embeddings=embedding, documents=["moved"],
+                      metadatas=[{"section_type": "subtextual"}])
+
+    assert collection.count() == 40
+    assert collection.shards["technical"].get(ids=["d0"])["ids"] == []
+    assert collection.get(where={"section_type": "subtextual"}, ids=["d0"])["ids"] == ["d0"]
+    store.close()
+
+def test_sharding_rejects_migrated_research_collection(tmp_path, mock_model):
+    """Test sharding is refused instead of ignoring a research collection alias"""
+    store = VectorStore(persist_directory=str(tmp_path), model_name="m", backend="numpy")
+    store.client.get_or_create_collection(name="research_sections__v2")
+    store.switch_collection("research_sections", "research_sections__v2", "m2")
+    store.close()
+
+    with pytest.raises(ValueError, match="research_sections__v2"):
+        VectorStore(persist_directory=str(tmp_path), model_name="m", backend="numpy",
+                    shard_by_section_type=True)
@@ -0,0 +1,75 @@
+"""
+Test suite for collection snapshot export and load.
+"""
+import time
+import pytest
+from unittest.mock import patch
+
+import numpy as np
+
+from ..retrieval import snapshot as snapshot_module
+from ..retrieval.snapshot import read_snapshot
+from ..vector_store import Document, VectorStore
+from .helpers import count_encoder
+
+@pytest.fixture
+def mock_model(mock_model):
+    mock_model.return_value.encode.side_effect = count_encoder("a", "e")
+    return mock_model
+
+def make_store(path, **kwargs):
+    store = VectorStore(persist_directory=str(path), model_name="m", backend="numpy", **kwargs)
+    store.add_documents_bulk([
+        Document(content=f"{'a' * i} section {'e' * (i % 3)}", metadata={"section_type": "technical", "rank": i},
+                 id=f"s{i}")
+        for i in range(30)
+    ])
+    return store
+
+@pytest.mark.parametrize("arrow", [True, False])
+def test_snapshot_round_trip_mounts_without_copy(tmp_path, arrow, mock_model):
+    """Test export/load preserves records and search results on the numpy backend"""
+    source = make_store(tmp_path / "source")
+    with patch.object(snapshot_module, "_pyarrow", wraps=snapshot_module._pyarrow) as pyarrow:
+        if not arrow:
+            pyarrow.side_effect = lambda: None
+        manifest = source.export_snapshot("research_sections", tmp_path / "snap")
+
+        target = VectorStore(persist_directory=str(tmp_path / "target"), model_name="m", backend="numpy")
+        start = time.perf_counter()
+        collection = target.load_snapshot(tmp_path / "snap", collection_name="restored")
+        elapsed = time.perf_counter() - start
+
+    assert manifest["format"] == ("arrow" if arrow else "json")
+    assert manifest["count"] == 30 and manifest["normalized"]
+    assert elapsed < 1.0
+    assert isinstance(collection._matrix, np.memmap)
+    assert collection.get(ids=["s7"])["metadatas"] == [{"section_type": "technical", "rank": "7"}]
+    assert (target.query_many(["aaaa section e"], k=3, collection_name="restored")
+            == source.query_many(["aaaa section e"], k=3))
+
+    target.add_documents_bulk([Document(content="new", metadata={}, id="new")], collection_name="restored")
+    assert collection.count() == 31
+    assert collection.get(ids=["s0"])["documents"] == source.research_collection.get(ids=["s0"])["documents"]
+
+def test_snapshot_imports_into_chroma(tmp_path, mock_model):
+    """Test a snapshot loads into a Chroma-backed store through batched adds"""
+    source = make_store(tmp_path / "source")
+    source.export_snapshot("research_sections", tmp_path / "snap")
+
+    target = VectorStore(persist_directory=str(tmp_path / "chroma"), model_name="m", write_batch_size=8)
+    collection = target.load_snapshot(tmp_path / "snap", collection_name="restored")
+
+    assert collection.count() == 30
+    assert target.query_many(["aaaa section e"], k=1, collection_name="restored")[0][0]["id"] == "s4"
+    assert len(target.sparse_index.search("restored", "section", k=50)) == 30
+
+def test_empty_snapshot(tmp_path, mock_model):
+    """Test an empty collection exports and reads back"""
+    store = VectorStore(persist_directory=str(tmp_path / "db"), model_name="m", backend="numpy")
+    store.export_snapshot("research_sections", tmp_path / "snap")
+
+    snapshot = read_snapshot(tmp_path / "snap")
+
+    assert len(snapshot) == 0
+    assert store.load_snapshot(tmp_path / "snap", collection_name="empty").count() == 0
@@ -0,0 +1,134 @@
+"""
+Test suite for the BM25 keyword index and hybrid retrieval.
+"""
+import pytest
+
+from ..retrieval.sparse_index import BM25Index, tokenize
+from ..vector_store import Document, VectorStore
+from .helpers import count_encoder
+
+def test_tokenize_lowercases_words():
+    """Test tokens are lowercased word characters"""
+    assert tokenize("The Waste-Land, 1922!") == ["the", "waste", "land", "1922"]
+
+def test_bm25_ranks_rare_terms_higher():
+    """Test documents matching rarer and more frequent query terms rank first"""
+    index = BM25Index()
+    index.add("c", ["a", "b", "c"], [
+        "the raven quoth the raven nevermore",
+        "the sea the sea the sea",
+        "the raven flew over the sea",
+    ])
+
+    ranking = [doc_id for doc_id, _ in index.search("c", "raven nevermore")]
+
+    assert ranking == ["a", "c"]
+    assert index.search("c", "albatross") == []
+    assert [doc_id for doc_id, _ in index.search("c", "raven", allowed_ids={"c"})] == ["c"]
+
+def test_bm25_replace_delete_and_persist(tmp_path):
+    """Test re-adding replaces postings, deletes remove them and the index persists"""
+    path = str(tmp_path / "bm25.sqlite3")
+    index = BM25Index(path)
+    index.add("c", ["a", "b"], ["autumn leaves", "winter snow"])
+    index.add("c", ["a"], ["spring rain"])
+    index.delete("c", ["b"])
+    index.add("other", ["x"], ["autumn"])
+    index.close()
+
+    reopened = BM25Index(path)
+
+    assert reopened.search("c", "autumn") == []
+    assert [doc_id for doc_id, _ in reopened.search("c", "rain")] == ["a"]
+    assert reopened.count("c") == 1
+    reopened.delete_collection("other")
+    assert reopened.count("other") == 0
+
+@pytest.fixture
+def mock_model(mock_model):
+    mock_model.return_value.encode.side_effect = count_encoder("grief", "light", length=False)
+    return mock_model
+
+@pytest.mark.asyncio
+async def test_hybrid_search_fuses_keyword_and_dense(tmp_path, mock_model):
+    """Test RRF surfaces a document found only by keyword alongside dense hits"""
+    store = VectorStore(persist_directory=str(tmp_path), model_name="m", backend="numpy")
+    store.add_documents_bulk([
+        Document(content="grief grief and more grief", metadata={"section_type": "core_analysis"}, id="g"),
+        Document(content="light on the water", metadata={"section_type": "technical"}, id="l"),
+        Document(content="an elegy for Ozymandias", metadata={"section_type": "technical"}, id="o"),
+    ])
+
+    results = await store.hybrid_search("grief Ozymandias", k=3, keyword_shortcut=False)
+    filtered = await store.hybrid_search("grief Ozymandias", k=3, keyword_shortcut=False,
+                                         where={"section_type": "technical"})
+
+    ids = [doc.id for doc in results]
+    assert ids[:2] == ["g", "o"] or ids[:2] == ["o", "g"]
+    assert all(float(doc.metadata["rrf_score"]) > 0 for doc in results)
+    assert int(results[0].metadata["keyword_rank"]) > 0 and int(results[0].metadata["dense_rank"]) > 0
+    assert {doc.id for doc in filtered} <= {"l", "o"}
+    assert filtered[0].id == "o"
+
+def test_repeated_ids_keep_keyword_and_dense_in_step(tmp_path, mock_model):
+    """Test an id the collection already holds is not re-indexed with the new text"""
+    store = VectorStore(persist_directory=str(tmp_path), model_name="m", backend="numpy")
+    store.add_documents("research_sections", [Document(content="grief in winter", metadata={})])
+    store.add_documents("research_sections", [Document(content="light in summer", metadata={}),
+                                              Document(content="grief at dawn", metadata={})])
+
+    assert store.research_collection.get(ids=["0"])["documents"] == ["grief in winter"]
+    assert store.sparse_index.search("research_sections", "summer") == []
+    assert [doc_id for doc_id, _ in store.sparse_index.search("research_sections", "dawn")] == ["1"]
+    assert store.near_duplicates.count("research_sections") == store.research_collection.count() == 2
+    store.close()
+
+@pytest.mark.asyncio
+async def test_hybrid_search_exact_match_skips_embedding(tmp_path, mock_model):
+    """Test an exact phrase hit returns keyword results without encoding the query"""
+    store = VectorStore(persist_directory=str(tmp_path), model_name="m", backend="numpy")
+    store.add_documents_bulk([
+        Document(content="Do Not Go Gentle Into That Good Night", metadata={}, id="poem"),
+        Document(content="light against the dying of the light", metadata={}, id="other"),
+    ])
+    calls = mock_model.return_value.encode.call_count
+
+    results = await store.hybrid_search("go gentle into that good night", k=2)
+
+    assert results[0].id == "poem"
+    assert results[0].metadata["dense_rank"] == "-1"
+    assert mock_model.return_value.encode.call_count == calls
+
+def test_numpy_writes_skip_the_existing_id_lookup(tmp_path, mock_model):
+    """Test the numpy backend reports the ids it added instead of the store reading them back"""
+    store = VectorStore(persist_directory=str(tmp_path), model_name="m", backend="numpy")
+    collection = store.research_collection
+    original_get = collection.get
+    lookups = []
+    collection.get = lambda *args, **kwargs: lookups.append(kwargs) or original_get(*args, **kwargs)
+
+    store.add_documents_bulk([Document(content="grief in winter", metadata={}, id="a")])
+    store.add_documents_bulk([Document(content="light in summer", metadata={}, id="a"),
+                              Document(content="grief at dawn", metadata={}, id="b")])
+
+    assert lookups == []
+    assert store.sparse_index.search("research_sections", "summer") == []
+    assert store.sparse_index.ids("research_sections") == {"a", "b"}
+    store.close()
+
+@pytest.mark.parametrize("backend", ["numpy", "chroma"])
+def test_existing_documents_indexed_at_open(tmp_path, backend, mock_model):
+    """Test documents stored while the keyword index was off are indexed when the store reopens"""
+    store = VectorStore(persist_directory=str(tmp_path), model_name="m", backend=backend, keyword_index=False)
+    store.add_documents_bulk([Document(content="grief in winter", metadata={}, id="a"),
+                              Document(content="light in summer", metadata={}, id="b")])
+    store.client.get_or_create_collection(name="poems")
+    store.add_documents_bulk([Document(content="do not go gentle", metadata={}, id="p")], collection_name="poems")
+    store.close()
+
+    reopened = VectorStore(persist_directory=str(tmp_path), model_name="m", backend=backend)
+
+    assert [doc_id for doc_id, _ in reopened.sparse_index.search("research_sections", "summer")] == ["b"]
+    assert [doc_id for doc_id, _ in reopened.sparse_index.search("poems", "gentle")] == ["p"]
+    assert reopened._backfill_keyword_index() == 0
+    reopened.close()
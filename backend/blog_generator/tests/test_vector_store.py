@@ -2,11 +2,19 @@
 Test suite for vector store functionality.
 """
 import pytest
+import base64
 import json
+import asyncio
+import threading
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from ..vector_store import Document, VectorStore
+import numpy as np
+
+from ..vector_store import Document, Section, VectorStore
+from .helpers import fake_encode
+from .test_encoder_pool import fake_loader
 
 @pytest.mark.asyncio
 async def test_document_metadata_sanitization():
@@ -29,16 +37,17 @@ async def test_document_metadata_sanitization():
     assert isinstance(doc.metadata["timestamp"], str)
 
 @pytest.mark.asyncio
-async def test_vector_store_add_document():
+async def test_vector_store_add_document(tmp_path):
     """Test adding document to vector store"""
     with patch("chromadb.PersistentClient") as mock_client:
         # Setup mock collection
         mock_collection = MagicMock()
+        mock_collection.name = "research_sections"
         mock_collection.add = MagicMock()
         mock_client.return_value.get_or_create_collection.return_value = mock_collection
         
         # Create vector store
-        store = VectorStore(persist_directory="test_db")
+        store = VectorStore(persist_directory=str(tmp_path))
         
         # Create test document
         doc = Document(
@@ -62,3 +71,357 @@ async def test_vector_store_add_document():
         assert len(call_args["metadatas"]) == 1
         assert isinstance(call_args["metadatas"][0], dict)
         assert all(isinstance(v, str) for v in call_args["metadatas"][0].values())
+
+def test_add_documents_bulk_batches_embeddings_and_writes(tmp_path, mock_model):
+    """Test bulk ingest embeds and writes in configured batch sizes"""
+    with patch("chromadb.PersistentClient") as mock_client:
+        mock_collection = MagicMock()
+        mock_collection.name = "research_sections"
+        mock_client.return_value.get_collection.return_value = mock_collection
+        
+        store = VectorStore(
+            persist_directory=str(tmp_path),
+            model_name="all-MiniLM-L6-v2",
+            embedding_batch_size=2,
+            write_batch_size=4,
+            near_duplicate_threshold=None,
+            keyword_index=False
+        )
+        docs = (Document(content=f"doc {i}", metadata={"n": i}) for i in range(5))
+        
+        stats = store.add_documents_bulk(docs, collection_name="poems")
+        
+        assert stats["documents"] == 5
+        assert stats["docs_per_second"] > 0
+        assert mock_model.return_value.encode.call_count == 3
+        assert [len(c[1]["ids"]) for c in mock_collection.add.call_args_list] == [4, 1]
+        
+        mock_collection.add.reset_mock()
+        docs = [Document(content=f"doc {i}", metadata={"n": i}, id=str(i)) for i in range(11)]
+        store.add_documents_bulk(docs, collection_name="poems", batch_size=5, write_batch_size=3)
+        
+        calls = mock_collection.add.call_args_list
+        assert [len(c[1]["ids"]) for c in calls] == [3, 3, 3, 2]
+        assert [i for c in calls for i in c[1]["ids"]] == [str(i) for i in range(11)]
+        assert all(len(c[1]["embeddings"]) == len(c[1]["ids"]) for c in calls)
+
+@pytest.mark.asyncio
+async def test_store_research_sections_single_query_per_batch(tmp_path, mock_model):
+    """Test batched section storage issues one query and one add per batch"""
+    with patch("chromadb.PersistentClient") as mock_client:
+        mock_collection = MagicMock()
+        mock_collection.name = "research_sections"
+        mock_collection.query.return_value = {
+            "ids": [[], [], []], "distances": [[], [], []],
+            "metadatas": [[], [], []], "documents": [[], [], []]
+        }
+        mock_client.return_value.get_or_create_collection.return_value = mock_collection
+        
+        store = VectorStore(persist_directory=str(tmp_path), model_name="all-MiniLM-L6-v2",
+                            near_duplicate_threshold=None)
+        sections = [
+            (Section(content="", metadata={}, title=f"Title {i}", summary="s", body="b"), "gpt4", "technical")
+            for i in range(3)
+        ]
+        
+        result = await store.store_research_sections(sections, batch_size=3)
+        
+        assert result["documents"] == 3
+        assert all(m["novelty_score"] == 1.0 for m in result["metrics"])
+        assert mock_collection.query.call_count == 1
+        assert mock_collection.add.call_count == 1
+        assert store.get_section_performance("technical")["technical"]["total_attempts"] == 3
+
+@pytest.mark.asyncio
+async def test_async_embedding_does_not_block_event_loop(tmp_path, mock_model):
+    """Test slow encoding runs off the loop and respects max_concurrency"""
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    
+    def slow_encode(texts, batch_size=None):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.1)
+        with lock:
+            active -= 1
+        return fake_encode(texts)
+    
+    with patch("chromadb.PersistentClient") as mock_client:
+        mock_model.return_value.encode.side_effect = slow_encode
+        mock_collection = MagicMock()
+        mock_collection.name = "research_sections"
+        mock_collection.query.return_value = {
+            "ids": [[]], "distances": [[]], "metadatas": [[]], "documents": [[]]
+        }
+        mock_client.return_value.get_or_create_collection.return_value = mock_collection
+        
+        store = VectorStore(
+            persist_directory=str(tmp_path),
+            model_name="all-MiniLM-L6-v2",
+            max_concurrency=2
+        )
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+        
+        ticker_task = asyncio.create_task(ticker())
+        await asyncio.gather(*(store.similarity_search(f"query {i}") for i in range(4)))
+        ticker_task.cancel()
+        store.close()
+        
+        assert peak == 2
+        assert ticks >= 10
+        assert mock_collection.query.call_count == 4
+
+def test_async_openai_client_per_event_loop(tmp_path):
+    """Test a store reused across asyncio.run() calls embeds on a client of the current loop"""
+    clients = []
+    
+    def make_client():
+        loop = asyncio.get_running_loop()
+        
+        async def create(input, model, encoding_format):
+            assert asyncio.get_running_loop() is loop and not loop.is_closed()
+            encoded = base64.b64encode(np.ones(3, dtype="<f4").tobytes()).decode()
+            return MagicMock(data=[MagicMock(index=i, embedding=encoded) for i in range(len(input))])
+        
+        client = MagicMock()
+        client.embeddings.create = create
+        clients.append(client)
+        return client
+    
+    with patch("blog_generator.vector_store.openai.AsyncOpenAI", side_effect=make_client):
+        store = VectorStore(persist_directory=str(tmp_path), backend="numpy")
+        first = asyncio.run(store.aembed(["first"]))
+        second = asyncio.run(store.aembed(["second", "third"]))
+        store.close()
+    
+    assert first.shape == (1, 3) and second.shape == (2, 3)
+    assert len(clients) == 2
+
+@pytest.mark.asyncio
+async def test_store_research_section_embeds_once(tmp_path, mock_model):
+    """Test the novelty check and the insert share one embedding call"""
+    with patch("chromadb.PersistentClient") as mock_client:
+        mock_collection = MagicMock()
+        mock_collection.name = "research_sections"
+        mock_collection.query.return_value = {
+            "ids": [[]], "distances": [[]], "metadatas": [[]], "documents": [[]]
+        }
+        mock_client.return_value.get_or_create_collection.return_value = mock_collection
+        
+        store = VectorStore(persist_directory=str(tmp_path), model_name="all-MiniLM-L6-v2",
+                            near_duplicate_threshold=None)
+        section = Section(content="", metadata={}, title="Title", summary="Summary", body="Body")
+        
+        await store.store_research_section(section, "gpt4", "technical")
+        
+        assert mock_model.return_value.encode.call_count == 1
+        assert store.get_cache_stats()["hits"] == 0
+        query_vector = mock_collection.query.call_args[1]["query_embeddings"][0]
+        stored_vector = mock_collection.add.call_args[1]["embeddings"][0]
+        np.testing.assert_array_equal(query_vector, stored_vector)
+
+def test_embedding_model_loaded_lazily_and_shared(tmp_path, mock_model):
+    """Test stores construct without loading the model and share one instance"""
+    with patch("chromadb.PersistentClient"):
+        first = VectorStore(persist_directory=str(tmp_path / "a"), model_name="all-MiniLM-L6-v2",
+                            near_duplicate_threshold=None, keyword_index=False)
+        second = VectorStore(persist_directory=str(tmp_path / "b"), model_name="all-MiniLM-L6-v2",
+                             near_duplicate_threshold=None, keyword_index=False)
+        assert mock_model.call_count == 0
+        
+        first.warmup()
+        second.embed(["shared model"])
+        
+        assert mock_model.call_count == 1
+        assert first.model is second.model
+
+@pytest.mark.asyncio
+async def test_query_many_single_embed_and_query(tmp_path, mock_model):
+    """Test query_many batches all queries and aligns results to inputs"""
+    store = VectorStore(persist_directory=str(tmp_path), model_name="all-MiniLM-L6-v2", backend="numpy",
+                        query_cache_size=0)
+    store.add_documents_bulk([
+        Document(content="x" * n, metadata={"section_type": "technical"}, id=f"doc{n}")
+        for n in (1, 5, 9)
+    ])
+    encode_calls = mock_model.return_value.encode.call_count
+    
+    with patch.object(store.research_collection, "query", wraps=store.research_collection.query) as query:
+        results = store.query_many(["y" * 9, "y", "y" * 5], k=1)
+        async_results = await store.aquery_many(["y" * 9, "y", "y" * 5], k=1)
+    
+    assert [hits[0]["id"] for hits in results] == ["doc9", "doc1", "doc5"]
+    assert async_results == results
+    assert query.call_count == 2
+    assert mock_model.return_value.encode.call_count == encode_calls + 1
+    assert store.query_similar("research_sections", "y" * 5, n_results=1)[0]["id"] == "doc5"
+
+@pytest.mark.asyncio
+async def test_near_duplicate_sections_skip_embedding(tmp_path, mock_model):
+    """Test regenerated sections are reported without embedding and new ones skip the novelty query"""
+    store = VectorStore(persist_directory=str(tmp_path), model_name="all-MiniLM-L6-v2", backend="numpy")
+    body = " ".join(f"sentence {i} about recursive self-improvement and alignment" for i in range(40))
+    original = Section(content="", metadata={}, title="Alignment", summary="Summary", body=body)
+    regenerated = Section(content="", metadata={}, title="Alignment", summary="Summary", body=body + " Indeed.")
+    unrelated = Section(content="", metadata={}, title="Cats", summary="Whiskers",
+                        body="My cat brought in a dead bird to replace the one I threw out.")
+    
+    with patch.object(store.research_collection, "query", wraps=store.research_collection.query) as query:
+        first = await store.store_research_section(original, "gpt4", "technical")
+        assert query.call_count == 0
+        encodes = mock_model.return_value.encode.call_count
+        
+        duplicate = await store.store_research_section(regenerated, "claude", "technical")
+        assert mock_model.return_value.encode.call_count == encodes
+        batch = await store.store_research_sections([(regenerated, "gpt4", "technical"),
+                                                     (unrelated, "gpt4", "subtextual")])
+    
+    assert "duplicate_of" not in first
+    assert duplicate["jaccard"] >= 0.9
+    assert duplicate["novelty_score"] == pytest.approx(1.0 - duplicate["jaccard"])
+    assert batch["metrics"][0]["duplicate_of"] == duplicate["duplicate_of"]
+    assert "duplicate_of" not in batch["metrics"][1]
+    assert query.call_count == 0
+    assert store.research_collection.count() == 2
+    assert store.near_duplicates.count("research_sections") == 2
+
+@pytest.mark.asyncio
+async def test_sections_written_elsewhere_are_checked_for_duplicates(tmp_path, mock_model):
+    """Test sections from other write paths and older databases are signed and caught as duplicates"""
+    body = " ".join(f"sentence {i} about recursive self-improvement and alignment" for i in range(40))
+    other = " ".join(f"line {i} on interpretability of sparse features" for i in range(40))
+    # A database written before signatures existed
+    unsigned = VectorStore(persist_directory=str(tmp_path), model_name="m", backend="numpy",
+                           near_duplicate_threshold=None)
+    unsigned.add_documents_bulk([Document(content=f"Alignment\nSummary\n{body}", metadata={}, id="old")])
+    unsigned.close()
+    
+    store = VectorStore(persist_directory=str(tmp_path), model_name="m", backend="numpy")
+    assert store.near_duplicates.ids("research_sections") == {"old"}
+    await store.add_document(Document(content=f"Sparse\nSummary\n{other}", metadata={}, id="added"))
+    assert store.near_duplicates.count("research_sections") == 2
+    
+    for title, text, original in (("Alignment", body, "old"), ("Sparse", other, "added")):
+        copy = Section(content="", metadata={}, title=title, summary="Summary", body=text + " Indeed.")
+        assert (await store.store_research_section(copy, "gpt4", "technical"))["duplicate_of"] == original
+    
+    # Until every section is signed, missing LSH candidates do not prove novelty
+    store.near_duplicates.delete("research_sections", ["added"])
+    unrelated = Section(content="", metadata={}, title="Cats", summary="Whiskers", body="A cat sat.")
+    with patch.object(store.research_collection, "query", wraps=store.research_collection.query) as query:
+        await store.store_research_section(unrelated, "gpt4", "subtextual")
+    assert query.call_count == 1
+    store.close()
+
+@pytest.mark.asyncio
+async def test_query_cache_hits_until_collection_written(tmp_path, mock_model):
+    """Test repeated queries are cached and writes invalidate only their collection"""
+    store = VectorStore(persist_directory=str(tmp_path), model_name="all-MiniLM-L6-v2", backend="numpy")
+    store.add_documents_bulk([Document(content="x" * n, metadata={"section_type": "technical"}, id=f"doc{n}")
+                              for n in (1, 5)])
+    
+    with patch.object(store.research_collection, "query", wraps=store.research_collection.query) as query:
+        first = await store.similarity_search("yyyyy", k=1, threshold=0.0)
+        second = await store.similarity_search("yyyyy", k=1, threshold=0.0)
+        store.query_many(["yyyyy", "y"], k=1)
+        store.query_many(["y", "yyyyy"], k=1)
+        assert query.call_count == 2
+        
+        store.create_collection("other")
+        store.add_documents("other", [Document(content="z", metadata={}, id="z")])
+        await store.similarity_search("yyyyy", k=1, threshold=0.0)
+        assert query.call_count == 2
+        
+        store.add_documents_bulk([Document(content="x" * 6, metadata={}, id="doc6")])
+        await store.similarity_search("yyyyy", k=1, threshold=0.0)
+        assert query.call_count == 3
+    
+    assert [doc.id for doc in first] == [doc.id for doc in second] == ["doc5"]
+    stats = store.get_query_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (4, 4)
+    assert stats["hit_rate"] == 0.5
+
+def test_vector_store_parallel_encoding(tmp_path, mock_model):
+    """Test bulk ingest routes encoding through the pool only inside the block"""
+    mock_model.return_value.encode.side_effect = (
+        lambda texts, batch_size=None: np.ones((len(texts), 3), dtype=np.float32))
+    store = VectorStore(persist_directory=str(tmp_path), model_name="m", backend="numpy",
+                        embedding_batch_size=8)
+    docs = [Document(content=f"doc {i}", metadata={}, id=str(i)) for i in range(50)]
+    
+    with store.parallel_encoding(processes=2, loader=fake_loader):
+        assert store._bulk_batch_size() == 8 * 2 * 4
+        store.add_documents_bulk(docs)
+        assert store.embedding_batch_size == 8
+    
+    assert store._bulk_batch_size() == 8
+    assert mock_model.return_value.encode.call_count == 0
+    stored = store.research_collection.get(ids=["7"], include=["embeddings"])["embeddings"]
+    assert stored.shape == (1, 3)
+    store.embed(["outside the pool"])
+    assert mock_model.return_value.encode.call_count == 1
+
+def test_parallel_encoding_rejects_openai_model(tmp_path):
+    """Test the pool is only available for local models"""
+    with patch("chromadb.PersistentClient"):
+        store = VectorStore(persist_directory=str(tmp_path), near_duplicate_threshold=None,
+                            keyword_index=False)
+        with pytest.raises(ValueError):
+            with store.parallel_encoding():
+                pass
+
+@pytest.mark.asyncio
+async def test_section_metrics_persist_with_windows_and_models(tmp_path, mock_model):
+    """Test section metrics survive a restart and break down by model and window"""
+    store = VectorStore(persist_directory=str(tmp_path), model_name="all-MiniLM-L6-v2", backend="numpy")
+    for i, model in enumerate(["gpt4", "gpt4", "claude"]):
+        section = Section(content="", metadata={}, title=f"Topic {i}", summary="s",
+                          body=f"body {i} " + "word " * (10 * i))
+        await store.store_research_section(section, model, "technical")
+    store.metrics_store.record("technical", "gpt4", 0.0, timestamp=time.time() - 30 * 86400)
+    store.close()
+    
+    reopened = VectorStore(persist_directory=str(tmp_path), model_name="all-MiniLM-L6-v2", backend="numpy")
+    all_time = reopened.get_section_performance("technical", by_model=True)["technical"]
+    recent = reopened.get_section_performance(window=timedelta(days=1), by_model=True)
+    
+    assert all_time["total_attempts"] == 4
+    assert all_time["models"]["gpt4"]["total_attempts"] == 3
+    assert recent["technical"]["total_attempts"] == 3
+    assert recent["technical"]["models"]["claude"]["total_attempts"] == 1
+    assert recent["core_analysis"]["total_attempts"] == 0
+    assert recent["technical"]["success_rate"] > all_time["success_rate"]
+    assert reopened.section_metrics["technical"]["total_attempts"] == 4
+
+@pytest.mark.asyncio
+async def test_section_metrics_written_off_the_event_loop(tmp_path, mock_model):
+    """Test metrics are recorded in one transaction per batch on the I/O executor"""
+    store = VectorStore(persist_directory=str(tmp_path), model_name="all-MiniLM-L6-v2", backend="numpy")
+    loop_thread = threading.get_ident()
+    calls = []
+    record_many = store.metrics_store.record_many
+    
+    def tracking_record_many(scores, timestamp=None):
+        scores = list(scores)
+        calls.append((threading.get_ident(), len(scores)))
+        record_many(scores, timestamp)
+    
+    store.metrics_store.record_many = tracking_record_many
+    sections = [(Section(content="", metadata={}, title=f"Topic {i}", summary="s", body=f"body {i}"),
+                 "gpt4", "technical") for i in range(5)]
+    await store.store_research_sections(sections, batch_size=3)
+    await store.store_research_section(sections[0][0], "gpt4", "technical")
+    
+    assert [count for _, count in calls] == [3, 2, 1]
+    assert all(thread != loop_thread for thread, _ in calls)
+    assert store.section_metrics["technical"]["total_attempts"] == 6
+    store.close()
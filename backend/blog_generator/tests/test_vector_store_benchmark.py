@@ -0,0 +1,36 @@
+"""
+Test suite for the VectorStore benchmark suite.
+"""
+import copy
+import json
+
+import numpy as np
+
+from ..benchmarks.vector_store_benchmark import HashingEmbedder, compare_results, run_benchmark
+
+def test_hashing_embedder_is_deterministic():
+    """Test the fake embedder is stable and places shared words close together"""
+    embedder = HashingEmbedder(dim=64)
+    vectors = embedder.encode(["ocean grief light", "ocean grief light", "machine city war"])
+
+    assert vectors.dtype == np.float32 and vectors.shape == (3, 64)
+    np.testing.assert_array_equal(vectors[0], HashingEmbedder(dim=64).encode(["ocean grief light"])[0])
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+def test_benchmark_report_and_regression_diff():
+    """Test a small offline run reports every metric per backend and diffs against a baseline"""
+    report = run_benchmark(sizes=[150], embedders=["hashing"], k=5, query_count=15)
+
+    json.dumps(report)
+    assert [(row["backend"], row["size"]) for row in report["results"]] == [("numpy", 150), ("chroma", 150)]
+    for row in report["results"]:
+        assert row["ingest_docs_per_second"] > 0
+        assert row["query_p50_ms"] <= row["query_p95_ms"] <= row["query_p99_ms"]
+        assert row["recall_at_k"] > 0.9
+    assert report["results"][0]["index_bytes_per_10k"] == 10_000 * 384 * 4
+
+    slower = copy.deepcopy(report)
+    slower["results"][0]["query_p95_ms"] *= 2
+    slower["results"][0]["recall_at_k"] *= 0.5
+    regressions = {(c["backend"], c["metric"]) for c in compare_results(report, slower) if c["regression"]}
+    assert regressions == {("numpy", "query_p95_ms"), ("numpy", "recall_at_k")}
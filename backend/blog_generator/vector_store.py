@@ -5,19 +5,34 @@ Uses Chroma as a lightweight vector database and sentence-transformers for embed
 
 import os
 from pathlib import Path
-from typing import List, Dict, Optional, Union, Any
+from typing import List, Dict, Optional, Union, Any, Iterable, Tuple, Callable
 from dataclasses import dataclass
 import json
-from datetime import datetime
+import base64
+from datetime import datetime, timedelta
 import logging
+import threading
+import time
 import uuid
 import traceback
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from itertools import islice
 
 import chromadb
 from chromadb.config import Settings
+import numpy as np
 from sentence_transformers import SentenceTransformer
 import openai
 
+from .retrieval import (
+    MODEL_REGISTRY, BM25Index, EmbeddingCache, EncoderPool, NearDuplicateIndex, NumpyClient,
+    NumpyCollection, QueryResultCache, SectionMetricsStore, ShardedCollection, TextChunker,
+    embedding_namespace, load_sentence_transformer, read_snapshot, write_snapshot
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.DEBUG,
@@ -29,6 +44,48 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Section types tracked by the research collection
+SECTION_TYPES = (
+    "core_analysis",
+    "long_context",
+    "subtextual",
+    "technical",
+    "emerging_trends",
+    "recommendations"
+)
+
+# VECTOR_STORE_CONFIG keys that map directly onto VectorStore arguments
+_CONFIG_OPTIONS = (
+    "embedding_batch_size",
+    "write_batch_size",
+    "max_concurrency",
+    "chunk_size",
+    "chunk_overlap",
+    "chunk_unit",
+    "backend",
+    "storage_dtype",
+    "rerank_factor",
+    "keyword_index",
+    "near_duplicate_threshold",
+    "query_cache_size",
+    "shard_by_section_type"
+)
+
+def _batched(items: Iterable[Any], size: int) -> Iterable[List[Any]]:
+    """Yield successive lists of at most size items from any iterable"""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def _add_reports_ids(collection) -> bool:
+    """Whether collection.add returns the ids it stored; Chroma's returns None"""
+    if isinstance(collection, ShardedCollection):
+        return all(isinstance(shard, NumpyCollection) for shard in collection.shards.values())
+    return isinstance(collection, NumpyCollection)
+
 @dataclass
 class Document:
     """Represents a document to be stored in the vector database"""
@@ -72,20 +129,70 @@ class VectorStore:
     def __init__(self, 
                  persist_directory: Optional[str] = None,
                  model_name: str = 'text-embedding-ada-002',
-                 embedding_config: Optional[Dict[str, Any]] = None):
+                 embedding_config: Optional[Dict[str, Any]] = None,
+                 embedding_batch_size: int = 64,
+                 write_batch_size: int = 1000,
+                 embedding_cache: Optional[EmbeddingCache] = None,
+                 embedding_cache_size: int = 100_000,
+                 max_concurrency: int = 4,
+                 chunk_size: int = 1000,
+                 chunk_overlap: int = 200,
+                 chunk_unit: str = "chars",
+                 backend: str = "chroma",
+                 storage_dtype: str = "float32",
+                 rerank_factor: int = 4,
+                 keyword_index: bool = True,
+                 near_duplicate_threshold: Optional[float] = 0.9,
+                 query_cache_size: int = 1024,
+                 shard_by_section_type: bool = False):
         """Initialize vector store with configurable embedding model
         
         Args:
             persist_directory: Directory to persist the database
             model_name: Name of embedding model to use
             embedding_config: Configuration for embedding generation
+            embedding_batch_size: Number of texts embedded per model/API call in bulk ingest
+            write_batch_size: Number of records written per Chroma add call in bulk ingest
+            embedding_cache: Shared embedding cache, defaults to one stored next to the database
+            embedding_cache_size: Maximum cached vectors when the default cache is created
+            max_concurrency: Maximum concurrent embedding calls and Chroma worker threads
+            chunk_size: Maximum chunk length used when ingesting files
+            chunk_overlap: Overlap between consecutive chunks
+            chunk_unit: Unit for chunk_size and chunk_overlap, "chars" or "tokens"
+            backend: "chroma" (HNSW via Chroma) or "numpy" (exact in-process search)
+            storage_dtype: Numpy backend search matrix dtype, "float32", "float16" or "int8"
+            rerank_factor: Candidates per result re-ranked at full precision for quantized storage
+            keyword_index: Maintain a BM25 index of every document added, used by hybrid_search
+            near_duplicate_threshold: Estimated Jaccard similarity at which a research section
+                is reported as a duplicate instead of being embedded and stored; None disables
+                the MinHash prefilter
+            query_cache_size: Maximum cached query results; 0 disables the cache
+            shard_by_section_type: Store research sections in one collection per section
+                type; section_type-filtered queries hit a single shard and unfiltered
+                queries fan out in parallel. Existing unsharded sections are not moved,
+                and a research collection switched by an embedding migration cannot be sharded.
         """
         self.base_path = Path(__file__).parent
         
-        # Initialize Chroma client with optimized settings
+        persist_path = None
         if persist_directory:
             persist_path = self.base_path / persist_directory
             persist_path.mkdir(parents=True, exist_ok=True)
+        self.persist_path = persist_path
+            
+        # Initialize storage backend; Chroma uses optimized settings
+        self.backend = backend
+        if backend == "numpy":
+            self.client = NumpyClient(
+                str(persist_path / "numpy") if persist_path else None,
+                storage=storage_dtype,
+                rerank_factor=rerank_factor
+            )
+        elif backend != "chroma":
+            raise ValueError(f"Unsupported vector store backend: {backend}")
+        elif storage_dtype != "float32":
+            raise ValueError("Quantized storage requires the numpy backend")
+        elif persist_path:
             self.client = chromadb.PersistentClient(
                 path=str(persist_path),
                 settings=Settings(
@@ -102,35 +209,549 @@ class VectorStore:
         # Configure embedding model
         self.model_name = model_name
         self.embedding_config = embedding_config or {}
+        self.embedding_batch_size = embedding_batch_size
+        self.write_batch_size = write_batch_size
+        self.chunker = TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap, unit=chunk_unit)
         
-        if model_name == 'text-embedding-ada-002':
-            self.embed = lambda text: openai.Embedding.create(
-                input=text, 
-                model=model_name
-            )["data"][0]["embedding"]
-        else:
-            self.model = SentenceTransformer(model_name)
-            self.embed = self.model.encode
-            
-        # Initialize section performance tracking
-        self.section_metrics = {
-            "core_analysis": {"success_rate": 0.0, "total_attempts": 0},
-            "long_context": {"success_rate": 0.0, "total_attempts": 0},
-            "subtextual": {"success_rate": 0.0, "total_attempts": 0},
-            "technical": {"success_rate": 0.0, "total_attempts": 0},
-            "emerging_trends": {"success_rate": 0.0, "total_attempts": 0},
-            "recommendations": {"success_rate": 0.0, "total_attempts": 0}
+        # Content-addressed embedding cache shared across runs and instances
+        if embedding_cache is None:
+            cache_path = str(persist_path / "embedding_cache.sqlite3") if persist_path else ":memory:"
+            embedding_cache = EmbeddingCache(cache_path, max_entries=embedding_cache_size)
+        self.embedding_cache = embedding_cache
+        self._cache_namespace = embedding_namespace(model_name, self.embedding_config)
+        
+        # BM25 keyword index kept in step with every write
+        self.sparse_index = None
+        if keyword_index:
+            index_path = str(persist_path / "bm25_index.sqlite3") if persist_path else ":memory:"
+            self.sparse_index = BM25Index(index_path)
+            
+        # Query results cached until the next write to their collection
+        self.query_cache = QueryResultCache(max_entries=query_cache_size)
+        
+        # MinHash/LSH signatures of stored research sections
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self.near_duplicates = None
+        if near_duplicate_threshold is not None:
+            signatures_path = str(persist_path / "near_duplicates.sqlite3") if persist_path else ":memory:"
+            self.near_duplicates = NearDuplicateIndex(signatures_path)
+        
+        # Async methods hand blocking work to bounded pools instead of the event loop
+        self.max_concurrency = max_concurrency
+        self._embed_executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="embed")
+        self._io_executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="chroma")
+        # Semaphore and async OpenAI client of the event loop they were made on, see _bind_loop
+        self._bound_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._embed_semaphore: Optional[asyncio.Semaphore] = None
+        self._async_openai: Optional[openai.AsyncOpenAI] = None
+        self._encoder_pool: Optional[EncoderPool] = None
+            
+        # Section performance tracking, persisted next to the vector database
+        metrics_path = str(persist_path / "section_metrics.sqlite3") if persist_path else ":memory:"
+        self.metrics_store = SectionMetricsStore(metrics_path)
+        
+        # Logical collection names switched to re-embedded collections by EmbeddingMigration
+        self._aliases_path = persist_path / "collection_aliases.json" if persist_path else None
+        self.collection_aliases: Dict[str, Dict[str, str]] = {}
+        if self._aliases_path is not None and self._aliases_path.exists():
+            self.collection_aliases = json.loads(self._aliases_path.read_text(encoding="utf-8"))
+        self._superseded: Dict[str, str] = {}
+        # Source collection name -> (shadow collection, model) of in-progress migrations
+        self._mirrors: Dict[str, Tuple[Any, str]] = {}
+        self._collection_lock = threading.RLock()
+        
+        # Create or get research collection, optionally one physical collection per section type
+        research_alias = self.collection_aliases.get("research_sections")
+        research_metadata = {
+            "description": "Research sections with performance tracking",
+            "embedding_model": model_name,
+            "embedding_config": json.dumps(self.embedding_config, sort_keys=True)
         }
+        if shard_by_section_type:
+            if research_alias:
+                raise ValueError(
+                    f"research_sections is served by migrated collection {research_alias['collection']}, "
+                    "which cannot be sharded by section type"
+                )
+            self.research_collection = ShardedCollection(
+                self.client,
+                "research_sections",
+                "section_type",
+                SECTION_TYPES,
+                metadata=research_metadata
+            )
+        else:
+            if research_alias:
+                research_metadata["embedding_model"] = research_alias["model_name"]
+            self.research_collection = self.client.get_or_create_collection(
+                name=research_alias["collection"] if research_alias else "research_sections",
+                metadata=research_metadata
+            )
         
-        # Create or get research collection
-        self.research_collection = self.client.get_or_create_collection(
-            name="research_sections",
-            metadata={
-                "description": "Research sections with performance tracking",
-                "embedding_model": model_name,
-                "embedding_config": embedding_config
-            }
-        )
+        # Sections written before every research write was signed, and documents
+        # written before the keyword index existed or while it was disabled
+        self._backfill_signatures()
+        self._backfill_keyword_index()
+        
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict[str, Any],
+        persist_directory: Optional[str] = None,
+        **overrides
+    ) -> "VectorStore":
+        """Create a vector store from a VECTOR_STORE_CONFIG-style dictionary
+        
+        Args:
+            config: Vector store configuration, see config.VECTOR_STORE_CONFIG
+            persist_directory: Directory to persist the database
+            overrides: Keyword arguments that take precedence over config
+            
+        Returns:
+            Configured VectorStore
+        """
+        options = {"model_name": config.get("embedding_model", 'text-embedding-ada-002')}
+        for key in _CONFIG_OPTIONS:
+            if key in config:
+                options[key] = config[key]
+        options.update(overrides)
+        return cls(persist_directory=persist_directory, **options)
+        
+    def embed(self, texts: Union[str, List[str]], model_name: Optional[str] = None) -> np.ndarray:
+        """Embed one text or a list of texts through the embedding cache
+        
+        Args:
+            texts: Single text or list of texts
+            model_name: Embedding model, defaults to the store's model
+            
+        Returns:
+            1-D vector for a single text, 2-D array for a list
+        """
+        if isinstance(texts, str):
+            return self._embed_cached([texts], model_name)[0]
+        return self._embed_cached(list(texts), model_name)
+        
+    def embed_batch(self, texts: List[str], model_name: Optional[str] = None) -> np.ndarray:
+        """Embed a list of texts with a single model or API call
+        
+        Args:
+            texts: Texts to embed
+            model_name: Embedding model, defaults to the store's model
+            
+        Returns:
+            2-D float32 array aligned with texts
+        """
+        return self.embed(texts, model_name)
+        
+    def get_cache_stats(self) -> Dict[str, float]:
+        """Get embedding cache hit/miss statistics"""
+        return self.embedding_cache.stats()
+        
+    def get_query_cache_stats(self) -> Dict[str, float]:
+        """Get query result cache hit/miss statistics"""
+        return self.query_cache.stats()
+        
+    def _embed_cached(self, texts: List[str], model_name: Optional[str] = None) -> np.ndarray:
+        """Embed texts, computing only those missing from the cache
+        
+        Args:
+            texts: Texts to embed
+            model_name: Embedding model, defaults to the store's model
+            
+        Returns:
+            2-D float32 array aligned with texts
+        """
+        namespace = self._namespace(model_name)
+        cached = self.embedding_cache.get_many(namespace, texts)
+        missing = self._missing_texts(texts, cached)
+        vectors = self._embed_uncached(missing, model_name) if missing else []
+        if missing:
+            self.embedding_cache.put_many(namespace, missing, vectors)
+        return self._merge_cached(texts, cached, missing, vectors)
+        
+    def _namespace(self, model_name: Optional[str]) -> str:
+        """Embedding cache namespace for a model"""
+        if model_name is None or model_name == self.model_name:
+            return self._cache_namespace
+        return embedding_namespace(model_name, self.embedding_config)
+        
+    async def aembed(self, texts: Union[str, List[str]], model_name: Optional[str] = None) -> np.ndarray:
+        """Non-blocking counterpart of embed for use inside the event loop
+        
+        Cache lookups run on the Chroma I/O pool, SentenceTransformer encoding on
+        the bounded embedding pool and OpenAI requests on the async client.
+        
+        Args:
+            texts: Single text or list of texts
+            model_name: Embedding model, defaults to the store's model
+            
+        Returns:
+            1-D vector for a single text, 2-D array for a list
+        """
+        batch = [texts] if isinstance(texts, str) else list(texts)
+        namespace = self._namespace(model_name)
+        cached = await self._run_io(self.embedding_cache.get_many, namespace, batch)
+        missing = self._missing_texts(batch, cached)
+        vectors = []
+        if missing:
+            self._bind_loop()
+            async with self._embed_semaphore:
+                vectors = await self._aembed_uncached(missing, model_name)
+            await self._run_io(self.embedding_cache.put_many, namespace, missing, vectors)
+        embeddings = self._merge_cached(batch, cached, missing, vectors)
+        return embeddings[0] if isinstance(texts, str) else embeddings
+        
+    def _bind_loop(self) -> None:
+        """Give the running event loop its own semaphore and async OpenAI client
+        
+        Both belong to the loop they were first used on, so a store reused
+        across asyncio.run() calls would otherwise fail with "Event loop is closed".
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._bound_loop:
+            self._bound_loop = loop
+            self._embed_semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._async_openai = None
+        
+    @staticmethod
+    def _missing_texts(texts: List[str], cached: List[Optional[np.ndarray]]) -> List[str]:
+        """Unique texts that had no cached vector"""
+        return list(dict.fromkeys(text for text, vector in zip(texts, cached) if vector is None))
+        
+    @staticmethod
+    def _merge_cached(
+        texts: List[str],
+        cached: List[Optional[np.ndarray]],
+        missing: List[str],
+        vectors: Union[np.ndarray, List]
+    ) -> np.ndarray:
+        """Combine cached and freshly computed vectors in input order"""
+        if missing and len(missing) == len(texts):
+            # Nothing cached and no repeats: the model output is already in order
+            return np.ascontiguousarray(vectors, dtype=np.float32)
+        computed = dict(zip(missing, vectors))
+        rows = [vector if vector is not None else computed[text]
+                for text, vector in zip(texts, cached)]
+        merged = np.empty((len(rows), len(rows[0]) if rows else 0), dtype=np.float32)
+        for i, row in enumerate(rows):
+            merged[i] = row
+        return merged
+        
+    def _embed_uncached(self, texts: List[str], model_name: Optional[str] = None) -> np.ndarray:
+        """Call the embedding model for texts in a single request
+        
+        Args:
+            texts: Texts to embed
+            model_name: Embedding model, defaults to the store's model
+            
+        Returns:
+            2-D float32 array aligned with texts
+        """
+        model_name = model_name or self.model_name
+        if model_name == 'text-embedding-ada-002':
+            response = openai.embeddings.create(input=texts, model=model_name, encoding_format="base64")
+            return self._decode_openai_embeddings(response)
+        return self._encode(texts, model_name)
+        
+    async def _aembed_uncached(self, texts: List[str], model_name: Optional[str] = None) -> np.ndarray:
+        """Embed texts without blocking the event loop"""
+        model_name = model_name or self.model_name
+        if model_name == 'text-embedding-ada-002':
+            self._bind_loop()
+            if self._async_openai is None:
+                self._async_openai = openai.AsyncOpenAI()
+            response = await self._async_openai.embeddings.create(
+                input=texts, model=model_name, encoding_format="base64"
+            )
+            return self._decode_openai_embeddings(response)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._embed_executor, self._encode, texts, model_name)
+        
+    @staticmethod
+    def _decode_openai_embeddings(response) -> np.ndarray:
+        """Decode an OpenAI embeddings response into a float32 matrix
+        
+        With encoding_format="base64" each embedding arrives as packed
+        little-endian float32 bytes, which are copied straight into the
+        output rows without building Python float lists.
+        """
+        data = sorted(response.data, key=lambda item: item.index)
+        if not data:
+            return np.empty((0, 0), dtype=np.float32)
+        rows = [
+            np.frombuffer(base64.b64decode(item.embedding), dtype="<f4")
+            if isinstance(item.embedding, str) else item.embedding
+            for item in data
+        ]
+        matrix = np.empty((len(rows), len(rows[0])), dtype=np.float32)
+        for i, row in enumerate(rows):
+            matrix[i] = row
+        return matrix
+        
+    @property
+    def model(self):
+        """Shared SentenceTransformer for model_name, loaded on first access"""
+        if self.model_name == 'text-embedding-ada-002':
+            raise AttributeError("text-embedding-ada-002 is served by the OpenAI API, not a local model")
+        return MODEL_REGISTRY.get(self.model_name, SentenceTransformer)
+        
+    def warmup(self) -> None:
+        """Load the embedding model now instead of on the first embed
+        
+        Useful before latency-sensitive work; a no-op for OpenAI embeddings.
+        """
+        if self.model_name != 'text-embedding-ada-002':
+            self._encode(["warmup"])
+        
+    def _encode(self, texts: List[str], model_name: Optional[str] = None) -> np.ndarray:
+        """Encode texts with a local SentenceTransformer model, or the process pool when active"""
+        if model_name is not None and model_name != self.model_name:
+            model = MODEL_REGISTRY.get(model_name, SentenceTransformer)
+            return np.asarray(model.encode(texts, batch_size=len(texts)), dtype=np.float32)
+        if self._encoder_pool is not None:
+            return self._encoder_pool.encode(texts)
+        return np.asarray(self.model.encode(texts, batch_size=len(texts)), dtype=np.float32)
+        
+    @contextmanager
+    def parallel_encoding(self, processes: Optional[int] = None, batch_size: Optional[int] = None,
+                          loader: Callable[[str], Any] = load_sentence_transformer):
+        """Encode across a process pool for the duration of a large ingest
+        
+        Inside the block, every local-model embedding call (add_documents,
+        add_documents_bulk, ingest_files, ...) is split into length-sorted
+        batches across worker processes that each load the model once.
+        Bulk ingest batches grow to batch_size * processes * 4 texts so all
+        workers stay busy. The embedding cache still applies.
+        
+        Usage:
+            with store.parallel_encoding(processes=8):
+                store.ingest_files("raw_text")
+        
+        Args:
+            processes: Worker processes, defaults to the number of CPUs
+            batch_size: Texts per worker task, defaults to embedding_batch_size
+            loader: Picklable callable that builds the model in each worker
+        """
+        if self.model_name == 'text-embedding-ada-002':
+            raise ValueError("parallel_encoding requires a local SentenceTransformer model")
+        batch_size = batch_size or self.embedding_batch_size
+        pool = EncoderPool(self.model_name, processes=processes, batch_size=batch_size, loader=loader)
+        self._encoder_pool = pool
+        try:
+            yield pool
+        finally:
+            self._encoder_pool = None
+            pool.close()
+            
+    def _bulk_batch_size(self) -> int:
+        """Default texts per bulk embedding call, enough to keep every pool worker busy"""
+        pool = self._encoder_pool
+        if pool is not None:
+            return pool.batch_size * pool.processes * 4
+        return self.embedding_batch_size
+        
+    async def _run_io(self, func, *args, **kwargs):
+        """Run a blocking Chroma or cache call on the I/O thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_executor, partial(func, *args, **kwargs))
+        
+    def _get_collection(self, collection_name: Optional[str] = None):
+        """Named collection, or the research collection when no name is given"""
+        if collection_name is None:
+            return self.research_collection
+        physical = self.resolve_collection_name(collection_name)
+        if physical == self.research_collection.name:
+            return self.research_collection
+        return self.client.get_collection(physical)
+        
+    def resolve_collection_name(self, collection_name: str) -> str:
+        """Physical collection currently serving a logical collection name"""
+        alias = self.collection_aliases.get(collection_name)
+        return alias["collection"] if alias else collection_name
+        
+    def _model_for(self, collection) -> str:
+        """Embedding model a collection's vectors come from"""
+        for alias in self.collection_aliases.values():
+            if alias["collection"] == collection.name:
+                return alias["model_name"]
+        return self.model_name
+        
+    def switch_collection(self, collection_name: str, target: str, model_name: str) -> None:
+        """Atomically point a logical collection name at another physical collection
+        
+        Reads and writes resolved after the switch go to target and embed with
+        model_name; the alias is persisted so later stores open target too.
+        
+        Args:
+            collection_name: Logical collection name, e.g. research_sections
+            target: Physical collection to serve it from
+            model_name: Embedding model target was built with
+        """
+        with self._collection_lock:
+            previous = self.resolve_collection_name(collection_name)
+            if previous == self.research_collection.name and isinstance(self.research_collection, ShardedCollection):
+                raise ValueError("A sharded research collection cannot be switched to another collection")
+            self.collection_aliases[collection_name] = {"collection": target, "model_name": model_name}
+            if self._aliases_path is not None:
+                tmp_path = self._aliases_path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(self.collection_aliases, indent=2), encoding="utf-8")
+                os.replace(tmp_path, self._aliases_path)
+            if previous == self.research_collection.name:
+                self.research_collection = self.client.get_collection(target)
+            self._superseded[previous] = collection_name
+            self._superseded.pop(target, None)
+            self._mirrors.pop(previous, None)
+            self.query_cache.invalidate(previous)
+            self.query_cache.invalidate(target)
+        logger.info(f"Collection {collection_name} now served by {target} ({model_name})")
+        
+    def _add_records(
+        self,
+        collection,
+        ids: List[str],
+        embeddings: Any,
+        documents: List[str],
+        metadatas: List[Optional[Dict[str, Any]]],
+        signatures: Optional[List[np.ndarray]] = None
+    ) -> None:
+        """Single write path: add to the vector collection, the keyword index
+        and, for the research collection, the near-duplicate index
+        
+        Args:
+            signatures: MinHash signatures already computed for documents
+        """
+        with self._collection_lock:
+            logical = self._superseded.get(collection.name)
+            if logical is not None:
+                # The collection was switched away from while this write was being embedded
+                collection = self._get_collection(logical)
+                embeddings = self.embed(list(documents), self._model_for(collection))
+            if _add_reports_ids(collection):
+                added = set(collection.add(ids=ids, embeddings=embeddings, documents=documents,
+                                           metadatas=metadatas))
+            else:
+                # Chroma's add does not report which ids it skipped, so look them up first
+                existing = set(collection.get(ids=list(ids), include=[])["ids"])
+                collection.add(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+                added = {record_id for record_id in ids if record_id not in existing}
+            self.query_cache.invalidate(collection.name)
+            if len(added) < len(ids):
+                # add keeps the stored record for an id it already has, so the
+                # keyword and near-duplicate indexes must keep theirs too
+                accepted = [i for i, record_id in enumerate(ids) if record_id in added]
+                logger.warning(f"Ignored {len(ids) - len(accepted)} records already in {collection.name}")
+                ids = [ids[i] for i in accepted]
+                documents = [documents[i] for i in accepted]
+                metadatas = [metadatas[i] for i in accepted]
+                if signatures is not None:
+                    signatures = [signatures[i] for i in accepted]
+                if not ids:
+                    return
+            if self.sparse_index is not None:
+                self.sparse_index.add(collection.name, ids, documents)
+            if self.near_duplicates is not None and collection.name == self.research_collection.name:
+                if signatures is None:
+                    signatures = [self.near_duplicates.signature(text) for text in documents]
+                self.near_duplicates.add(collection.name, list(ids), list(signatures))
+            mirror = self._mirrors.get(collection.name)
+            if mirror is not None:
+                self._mirror_add(*mirror, ids, documents, metadatas, signatures)
+        
+    def mirror_writes(self, source_name: str, shadow, model_name: str) -> None:
+        """Copy later writes and deletes of a collection into a migration shadow
+        
+        Mirrored writes are upserts, so a record re-added with new content
+        replaces the copy already migrated. Mirroring ends when
+        switch_collection moves source_name to another collection.
+        
+        Args:
+            source_name: Physical collection being migrated
+            shadow: Shadow collection receiving the re-embedded records
+            model_name: Embedding model of the shadow
+        """
+        with self._collection_lock:
+            self._mirrors[source_name] = (shadow, model_name)
+        
+    def _mirror_add(self, shadow, model_name: str, ids, documents, metadatas, signatures) -> None:
+        """Upsert records just written to a migrating collection into its shadow (caller holds the lock)"""
+        shadow.upsert(ids=list(ids), embeddings=self.embed(list(documents), model_name),
+                      documents=list(documents), metadatas=list(metadatas))
+        self.query_cache.invalidate(shadow.name)
+        if self.sparse_index is not None:
+            self.sparse_index.add(shadow.name, ids, documents)
+        if signatures is not None:
+            self.near_duplicates.add(shadow.name, list(ids), list(signatures))
+        
+    def _backfill_signatures(self) -> int:
+        """Sign research sections that have no near-duplicate signature yet
+        
+        Returns:
+            Number of sections signed
+        """
+        if self.near_duplicates is None:
+            return 0
+        collection = self.research_collection
+        if self.near_duplicates.count(collection.name) == collection.count():
+            return 0
+        signed = self.near_duplicates.ids(collection.name)
+        missing = [doc_id for doc_id in collection.get(include=[])["ids"] if doc_id not in signed]
+        for begin in range(0, len(missing), self.write_batch_size):
+            records = collection.get(ids=missing[begin:begin + self.write_batch_size], include=["documents"])
+            self.near_duplicates.add(
+                collection.name,
+                list(records["ids"]),
+                [self.near_duplicates.signature(text) for text in records["documents"]]
+            )
+        if missing:
+            logger.info(f"Signed {len(missing)} existing sections of {collection.name} for near-duplicate checks")
+        return len(missing)
+        
+    def _backfill_keyword_index(self) -> int:
+        """Index stored documents missing from the BM25 keyword index
+        
+        Returns:
+            Number of documents indexed
+        """
+        if self.sparse_index is None:
+            return 0
+        collections = {self.research_collection.name: self.research_collection}
+        shards = set()
+        if isinstance(self.research_collection, ShardedCollection):
+            shards = {shard.name for shard in self.research_collection.shards.values()}
+        for collection in self.client.list_collections():
+            if collection.name not in shards:
+                collections.setdefault(collection.name, collection)
+        total = 0
+        for name, collection in collections.items():
+            if self.sparse_index.count(name) == collection.count():
+                continue
+            indexed = self.sparse_index.ids(name)
+            missing = [doc_id for doc_id in collection.get(include=[])["ids"] if doc_id not in indexed]
+            for begin in range(0, len(missing), self.write_batch_size):
+                records = collection.get(ids=missing[begin:begin + self.write_batch_size], include=["documents"])
+                self.sparse_index.add(name, list(records["ids"]), list(records["documents"]))
+            if missing:
+                logger.info(f"Indexed {len(missing)} existing documents of {name} for keyword search")
+            total += len(missing)
+        return total
+        
+    def _signatures_complete(self) -> bool:
+        """Whether every research section has a signature, so no LSH candidates means novel"""
+        collection = self.research_collection
+        return self.near_duplicates.count(collection.name) == collection.count()
+        
+    def close(self) -> None:
+        """Shut down worker pools and close the embedding cache and keyword index"""
+        self._embed_executor.shutdown(wait=True)
+        self._io_executor.shutdown(wait=True)
+        self.embedding_cache.close()
+        if self.sparse_index is not None:
+            self.sparse_index.close()
+        if self.near_duplicates is not None:
+            self.near_duplicates.close()
+        self.metrics_store.close()
+        if isinstance(self.research_collection, ShardedCollection):
+            self.research_collection.close()
         
     async def store_research_section(
         self,
@@ -138,9 +759,13 @@ class VectorStore:
         model_name: str,
         section_type: str,
         similarity_threshold: float = 0.7
-    ) -> Dict[str, float]:
+    ) -> Dict[str, Any]:
         """Store research section with performance tracking
         
+        Sections whose MinHash similarity to a stored section reaches
+        near_duplicate_threshold are not embedded or stored; their metrics
+        carry duplicate_of and jaccard instead.
+        
         Args:
             section: Section to store
             model_name: Name of model that generated the section
@@ -150,16 +775,31 @@ class VectorStore:
         Returns:
             Dictionary of quality metrics
         """
-        # Calculate section embedding
         section_text = f"{section.title}\n{section.summary}\n{section.body}"
-        embedding = self.embed(section_text)
+        collection_name = self.research_collection.name
         
-        # Check similarity with existing sections
-        similar_sections = await self.similarity_search(
-            section_text,
-            k=3,
-            threshold=similarity_threshold
-        )
+        # Cheap MinHash check before any embedding work
+        check = await self._run_io(self._near_duplicate_checks, collection_name, [section_text])
+        signature, duplicate_of, jaccard, candidates = check[0]
+        if self._is_near_duplicate(jaccard):
+            metrics = self._duplicate_metrics(section, model_name, section_type, duplicate_of, jaccard)
+            await self._run_io(self._update_metrics, [(section_type, metrics, model_name)])
+            return metrics
+        
+        # Calculate section embedding
+        embedding = await self.aembed(section_text, self._model_for(self.research_collection))
+        
+        # Check similarity with existing sections, reusing the same embedding;
+        # content with no LSH candidates is treated as novel without a query
+        # once every stored section is signed
+        similar_sections = []
+        if (self.near_duplicates is None or candidates
+                or not await self._run_io(self._signatures_complete)):
+            similar_sections = await self.similarity_search_by_vector(
+                embedding,
+                k=3,
+                threshold=similarity_threshold
+            )
         
         # Calculate quality metrics
         metrics = self._calculate_section_metrics(
@@ -169,10 +809,14 @@ class VectorStore:
         )
         
         # Update section performance tracking
-        self._update_metrics(section_type, metrics["quality_score"])
+        await self._run_io(self._update_metrics, [(section_type, metrics, model_name)])
         
         # Store section with enhanced metadata
-        self.research_collection.add(
+        doc_id = str(uuid.uuid4())
+        await self._run_io(
+            self._add_records,
+            self.research_collection,
+            ids=[doc_id],
             embeddings=[embedding],
             documents=[section_text],
             metadatas=[{
@@ -183,16 +827,149 @@ class VectorStore:
                 "novelty_score": metrics["novelty_score"],
                 "coherence_score": metrics["coherence_score"],
                 "timestamp": datetime.now().isoformat()
-            }]
+            }],
+            signatures=[signature] if signature is not None else None
         )
         
         return metrics
         
+    async def store_research_sections(
+        self,
+        sections: Iterable[Tuple[Section, str, str]],
+        similarity_threshold: float = 0.7,
+        batch_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Store many research sections with batched embedding and writes
+        
+        Each batch is embedded in one call, checked for novelty with one
+        multi-embedding query and written with one add call. Near duplicates
+        of stored sections are reported and skipped as in store_research_section.
+        Sections in the same batch are not compared against each other.
+        
+        Args:
+            sections: Iterable of (section, model_name, section_type) tuples
+            similarity_threshold: Threshold for similarity comparison
+            batch_size: Sections per batch, defaults to embedding_batch_size
+            
+        Returns:
+            Dictionary with per-section metrics and throughput statistics
+        """
+        batch_size = batch_size or self._bulk_batch_size()
+        all_metrics = []
+        start = time.perf_counter()
+        
+        collection_name = self.research_collection.name
+        
+        for batch in _batched(sections, batch_size):
+            texts = [f"{section.title}\n{section.summary}\n{section.body}" for section, _, _ in batch]
+            checks = await self._run_io(self._near_duplicate_checks, collection_name, texts)
+            batch_metrics: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+            scored = []
+            keep = []
+            for i, (section, model_name, section_type) in enumerate(batch):
+                _, duplicate_of, jaccard, _ = checks[i]
+                if self._is_near_duplicate(jaccard):
+                    batch_metrics[i] = self._duplicate_metrics(section, model_name, section_type,
+                                                               duplicate_of, jaccard)
+                    scored.append((section_type, batch_metrics[i], model_name))
+                else:
+                    keep.append(i)
+            
+            if keep:
+                embeddings = await self.aembed([texts[i] for i in keep], self._model_for(self.research_collection))
+                
+                # One novelty query for the whole batch, skipped when nothing has LSH
+                # candidates and every stored section is signed
+                results = None
+                if (self.near_duplicates is None or any(checks[i][3] for i in keep)
+                        or not await self._run_io(self._signatures_complete)):
+                    results = await self._run_io(
+                        self.research_collection.query,
+                        query_embeddings=embeddings,
+                        n_results=3
+                    )
+                
+                ids = [str(uuid.uuid4()) for _ in keep]
+                metadatas = []
+                for row, i in enumerate(keep):
+                    section, model_name, section_type = batch[i]
+                    similar_sections = (self._results_to_documents(results, row, similarity_threshold)
+                                        if results is not None else [])
+                    metrics = self._calculate_section_metrics(section, similar_sections, section_type)
+                    scored.append((section_type, metrics, model_name))
+                    batch_metrics[i] = metrics
+                    metadatas.append({
+                        **section.metadata,
+                        "model": model_name,
+                        "section_type": section_type,
+                        "quality_score": metrics["quality_score"],
+                        "novelty_score": metrics["novelty_score"],
+                        "coherence_score": metrics["coherence_score"],
+                        "timestamp": datetime.now().isoformat()
+                    })
+                    
+                await self._run_io(
+                    self._add_records,
+                    self.research_collection,
+                    ids=ids,
+                    embeddings=embeddings,
+                    documents=[texts[i] for i in keep],
+                    metadatas=metadatas,
+                    signatures=[checks[i][0] for i in keep] if self.near_duplicates is not None else None
+                )
+            # One metrics transaction per batch, off the event loop
+            await self._run_io(self._update_metrics, scored)
+            all_metrics.extend(batch_metrics)
+            
+        elapsed = time.perf_counter() - start
+        rate = len(all_metrics) / elapsed if elapsed > 0 else 0.0
+        logger.info(f"Stored {len(all_metrics)} research sections in {elapsed:.2f}s ({rate:.1f} docs/sec)")
+        
+        return {
+            "metrics": all_metrics,
+            "documents": len(all_metrics),
+            "seconds": elapsed,
+            "docs_per_second": rate
+        }
+        
+    def _near_duplicate_checks(
+        self,
+        collection_name: str,
+        texts: List[str]
+    ) -> List[Tuple[Optional[np.ndarray], Optional[str], float, int]]:
+        """MinHash signature, closest stored match, its Jaccard and LSH candidate count per text"""
+        if self.near_duplicates is None:
+            return [(None, None, 0.0, 0) for _ in texts]
+        checks = []
+        for text in texts:
+            signature = self.near_duplicates.signature(text)
+            checks.append((signature, *self.near_duplicates.best_match(collection_name, signature)))
+        return checks
+        
+    def _is_near_duplicate(self, jaccard: float) -> bool:
+        """Whether an estimated Jaccard similarity counts as a duplicate"""
+        return self.near_duplicates is not None and jaccard >= self.near_duplicate_threshold
+        
+    def _duplicate_metrics(
+        self,
+        section: Section,
+        model_name: str,
+        section_type: str,
+        duplicate_of: str,
+        jaccard: float
+    ) -> Dict[str, Any]:
+        """Metrics for a section rejected as a near duplicate"""
+        metrics = self._calculate_section_metrics(section, [], section_type, novelty_score=1.0 - jaccard)
+        logger.info(f"Skipped near-duplicate {section_type} section '{section.title}' "
+                    f"(jaccard {jaccard:.2f} with {duplicate_of})")
+        return {**metrics, "duplicate_of": duplicate_of, "jaccard": jaccard}
+        
     def _calculate_section_metrics(
         self,
         section: Section,
         similar_sections: List[Document],
-        section_type: str
+        section_type: str,
+        novelty_score: Optional[float] = None
     ) -> Dict[str, float]:
         """Calculate quality metrics for section
         
@@ -200,6 +977,7 @@ class VectorStore:
             section: Section to evaluate
             similar_sections: List of similar sections found
             section_type: Type of section being evaluated
+            novelty_score: Precomputed novelty, e.g. from a MinHash match
             
         Returns:
             Dictionary containing quality metrics
@@ -211,8 +989,10 @@ class VectorStore:
         }
         
         # Calculate novelty (difference from existing sections)
-        if similar_sections:
-            avg_similarity = sum(doc.metadata.get("similarity", 0) for doc in similar_sections) / len(similar_sections)
+        if novelty_score is not None:
+            metrics["novelty_score"] = novelty_score
+        elif similar_sections:
+            avg_similarity = sum(float(doc.metadata.get("similarity", 0)) for doc in similar_sections) / len(similar_sections)
             metrics["novelty_score"] = 1.0 - avg_similarity
         else:
             metrics["novelty_score"] = 1.0  # Completely novel
@@ -235,32 +1015,49 @@ class VectorStore:
         
         return metrics
         
-    def _update_metrics(self, section_type: str, quality_score: float):
-        """Update section performance tracking
+    def _update_metrics(self, scored: List[Tuple[str, Dict[str, float], str]]):
+        """Record scored sections in the persisted performance metrics
+        
+        Blocking SQLite write; async callers run it through _run_io.
         
         Args:
-            section_type: Type of section to update metrics for
-            quality_score: Quality score achieved
-        """
-        metrics = self.section_metrics[section_type]
-        metrics["total_attempts"] += 1
-        metrics["success_rate"] = (
-            (metrics["success_rate"] * (metrics["total_attempts"] - 1) + quality_score) /
-            metrics["total_attempts"]
+            scored: (section_type, metrics from _calculate_section_metrics,
+                model_name) tuples
+        """
+        self.metrics_store.record_many(
+            (section_type, model_name, metrics["quality_score"], metrics["novelty_score"])
+            for section_type, metrics, model_name in scored
         )
         
-    def get_section_performance(self, section_type: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    @property
+    def section_metrics(self) -> Dict[str, Dict[str, float]]:
+        """All-time success rate and attempt count per section type"""
+        return self.metrics_store.summary(SECTION_TYPES)
+        
+    def get_section_performance(
+        self,
+        section_type: Optional[str] = None,
+        window: Optional[timedelta] = None,
+        by_model: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
         """Get performance metrics for sections
         
+        Answered from the persisted metrics table; embeddings are not read.
+        
         Args:
             section_type: Optional specific section type to get metrics for
+            window: Only count sections stored within this period (resolved to whole hours)
+            by_model: Include a per-model breakdown under "models"
             
         Returns:
             Dictionary of section metrics
         """
-        if section_type:
-            return {section_type: self.section_metrics[section_type]}
-        return self.section_metrics.copy()
+        return self.metrics_store.summary(
+            SECTION_TYPES,
+            section_type=section_type,
+            window=window,
+            by_model=by_model
+        )
         
     async def similarity_search(
         self,
@@ -271,6 +1068,9 @@ class VectorStore:
     ) -> List[Document]:
         """Enhanced similarity search with filtering
         
+        Results are served from the query cache until the collection is next
+        written to.
+        
         Args:
             query: Search query
             k: Number of results to return
@@ -280,25 +1080,78 @@ class VectorStore:
         Returns:
             List of similar documents
         """
+        where = {"section_type": section_type} if section_type else None
+        key = self.query_cache.key(self.research_collection.name, query, k, where, "similarity", threshold)
+        cached = self.query_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        
         # Generate query embedding
-        query_embedding = self.embed(query)
+        query_embedding = await self.aembed(query, self._model_for(self.research_collection))
+        
+        documents = await self.similarity_search_by_vector(
+            query_embedding,
+            k=k,
+            threshold=threshold,
+            section_type=section_type
+        )
+        self.query_cache.put(key, documents)
+        return list(documents)
+        
+    async def similarity_search_by_vector(
+        self,
+        embedding: Union[np.ndarray, List[float]],
+        k: int = 5,
+        threshold: float = 0.7,
+        section_type: Optional[str] = None
+    ) -> List[Document]:
+        """Similarity search with a precomputed embedding
         
+        Args:
+            embedding: Query embedding from the store's embedding model
+            k: Number of results to return
+            threshold: Minimum similarity score
+            section_type: Optional section type to filter by
+            
+        Returns:
+            List of similar documents
+        """
         # Build search parameters
         where = {"section_type": section_type} if section_type else None
         
         # Perform search
-        results = self.research_collection.query(
-            query_embeddings=[query_embedding],
+        results = await self._run_io(
+            self.research_collection.query,
+            query_embeddings=[embedding],
             n_results=k,
             where=where
         )
         
-        # Filter and convert results
+        return self._results_to_documents(results, 0, threshold)
+        
+    def _results_to_documents(
+        self,
+        results: Dict[str, List[List[Any]]],
+        query_index: int,
+        threshold: float
+    ) -> List[Document]:
+        """Filter and convert one query's Chroma results to documents
+        
+        Args:
+            results: Raw Chroma query results
+            query_index: Index of the query embedding within the results
+            threshold: Minimum similarity score
+            
+        Returns:
+            List of similar documents
+        """
         documents = []
-        for i, (doc_id, score) in enumerate(zip(results['ids'][0], results['distances'][0])):
+        ids = results['ids'][query_index]
+        distances = results['distances'][query_index]
+        for i, (doc_id, score) in enumerate(zip(ids, distances)):
             if score >= threshold:
-                metadata = results['metadatas'][0][i]
-                content = results['documents'][0][i]
+                metadata = results['metadatas'][query_index][i] or {}
+                content = results['documents'][query_index][i]
                 documents.append(Document(
                     content=content,
                     metadata={**metadata, "similarity": score},
@@ -307,6 +1160,104 @@ class VectorStore:
                 
         return documents
 
+    async def hybrid_search(
+        self,
+        query: str,
+        k: int = 5,
+        collection_name: Optional[str] = None,
+        where: Optional[Dict[str, Any]] = None,
+        rrf_k: int = 60,
+        candidate_k: Optional[int] = None,
+        keyword_shortcut: bool = True
+    ) -> List[Document]:
+        """Fuse BM25 keyword and dense rankings with reciprocal rank fusion
+        
+        When the best keyword hit contains the whole query verbatim (a poem
+        title, a model name, an exact phrase) the keyword ranking is returned
+        directly and no embedding is computed.
+        
+        Args:
+            query: Search query
+            k: Number of results to return
+            collection_name: Collection to search, defaults to research_sections
+            where: Optional Chroma-style metadata filter applied to both rankings
+            rrf_k: Reciprocal rank fusion constant
+            candidate_k: Candidates taken from each ranking, defaults to 4 * k
+            keyword_shortcut: Allow skipping dense search on exact keyword hits
+            
+        Returns:
+            List of documents with rrf_score, keyword_rank and dense_rank metadata
+        """
+        if self.sparse_index is None:
+            raise RuntimeError("hybrid_search requires keyword_index=True")
+        collection = self._get_collection(collection_name)
+        candidate_k = candidate_k or k * 4
+        
+        allowed = None
+        if where:
+            allowed = set((await self._run_io(collection.get, where=where, include=[]))["ids"])
+        keyword_hits = await self._run_io(
+            self.sparse_index.search, collection.name, query, candidate_k, allowed
+        )
+        keyword_ranks = {doc_id: rank for rank, (doc_id, _) in enumerate(keyword_hits, 1)}
+        
+        records: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        if keyword_hits:
+            fetched = await self._run_io(
+                collection.get,
+                ids=[doc_id for doc_id, _ in keyword_hits[:k]],
+                include=["documents", "metadatas"]
+            )
+            for doc_id, content, metadata in zip(fetched["ids"], fetched["documents"], fetched["metadatas"]):
+                records[doc_id] = (content, metadata or {})
+            top_content = records.get(keyword_hits[0][0], ("", {}))[0] or ""
+            if keyword_shortcut and query.strip() and query.strip().lower() in top_content.lower():
+                return [
+                    Document(
+                        content=records[doc_id][0],
+                        metadata={**records[doc_id][1], "keyword_rank": rank, "dense_rank": -1,
+                                  "rrf_score": 1.0 / (rrf_k + rank)},
+                        id=doc_id
+                    )
+                    for rank, (doc_id, _) in enumerate(keyword_hits[:k], 1)
+                    if doc_id in records
+                ]
+        
+        query_embedding = await self.aembed(query, self._model_for(collection))
+        dense = await self._run_io(
+            collection.query,
+            query_embeddings=[query_embedding],
+            n_results=candidate_k,
+            where=where
+        )
+        dense_ranks = {doc_id: rank for rank, doc_id in enumerate(dense["ids"][0], 1)}
+        for doc_id, content, metadata in zip(dense["ids"][0], dense["documents"][0], dense["metadatas"][0]):
+            records[doc_id] = (content, metadata or {})
+        
+        fused = {
+            doc_id: sum(1.0 / (rrf_k + ranks[doc_id]) for ranks in (keyword_ranks, dense_ranks) if doc_id in ranks)
+            for doc_id in set(keyword_ranks) | set(dense_ranks)
+        }
+        best = sorted(fused, key=fused.get, reverse=True)[:k]
+        
+        missing = [doc_id for doc_id in best if doc_id not in records]
+        if missing:
+            fetched = await self._run_io(collection.get, ids=missing, include=["documents", "metadatas"])
+            for doc_id, content, metadata in zip(fetched["ids"], fetched["documents"], fetched["metadatas"]):
+                records[doc_id] = (content, metadata or {})
+        
+        return [
+            Document(
+                content=records[doc_id][0],
+                metadata={**records[doc_id][1], "rrf_score": fused[doc_id],
+                          "keyword_rank": keyword_ranks.get(doc_id, -1),
+                          "dense_rank": dense_ranks.get(doc_id, -1)},
+                id=doc_id
+            )
+            for doc_id in best
+            if doc_id in records
+        ]
+
     async def add_document(self, document: Document) -> None:
         """Add a document to the vector store
         
@@ -337,11 +1288,13 @@ class VectorStore:
             
             # Calculate embedding
             logger.debug("Calculating embedding...")
-            embedding = self.embed(document.content)
+            embedding = await self.aembed(document.content, self._model_for(self.research_collection))
             
             # Add to collection
             logger.debug("Adding to collection...")
-            self.research_collection.add(
+            await self._run_io(
+                self._add_records,
+                self.research_collection,
                 ids=[document.id or str(uuid.uuid4())],
                 embeddings=[embedding],
                 documents=[document.content],
@@ -373,14 +1326,7 @@ class VectorStore:
             self.client.create_collection(
                 name=name,
                 metadata={"schema": schema or {
-                    "section_types": [
-                        "core_analysis",
-                        "long_context",
-                        "subtextual",
-                        "technical",
-                        "emerging_trends",
-                        "recommendations"
-                    ],
+                    "section_types": list(SECTION_TYPES),
                     "embedding_model": self.model_name,
                     "config": self.embedding_config
                 }}
@@ -399,16 +1345,17 @@ class VectorStore:
             collection_name: Name of the collection to add to
             documents: List of Document objects to add
         """
-        collection = self.client.get_collection(collection_name)
+        collection = self._get_collection(collection_name)
         
         # Prepare documents for insertion
-        embeddings = self.embed([doc.content for doc in documents]).tolist()
+        embeddings = self.embed([doc.content for doc in documents], self._model_for(collection))
         ids = [doc.id or str(i) for i, doc in enumerate(documents)]
         metadatas = [doc.metadata for doc in documents]
         documents = [doc.content for doc in documents]
         
         # Add to collection
-        collection.add(
+        self._add_records(
+            collection,
             embeddings=embeddings,
             documents=documents,
             metadatas=metadatas,
@@ -416,6 +1363,116 @@ class VectorStore:
         )
         print(f"Added {len(documents)} documents to collection {collection_name}")
 
+    def add_documents_bulk(
+        self,
+        documents: Iterable[Document],
+        collection_name: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        write_batch_size: Optional[int] = None
+    ) -> Dict[str, float]:
+        """Add a large stream of documents with batched embedding and writes
+        
+        Args:
+            documents: Iterable of Document objects, consumed lazily
+            collection_name: Collection to add to, defaults to research_sections
+            batch_size: Texts per embedding call, defaults to embedding_batch_size
+            write_batch_size: Records per Chroma add call, defaults to write_batch_size
+            
+        Returns:
+            Dictionary with document count, elapsed seconds and docs_per_second
+        """
+        collection = self._get_collection(collection_name)
+        batch_size = batch_size or self._bulk_batch_size()
+        write_batch_size = write_batch_size or self.write_batch_size
+        model_name = self._model_for(collection)
+        
+        pending = {"ids": [], "embeddings": [], "documents": [], "metadatas": []}
+        total = 0
+        start = time.perf_counter()
+        
+        def flush(final: bool = False):
+            """Write pending records in write_batch_size slices, carrying the remainder over"""
+            nonlocal pending
+            if not pending["ids"]:
+                return
+            # Embedding blocks are joined once per flush instead of row by row
+            embeddings = np.concatenate(pending["embeddings"])
+            written = 0
+            while len(pending["ids"]) - written >= write_batch_size or (final and written < len(pending["ids"])):
+                end = written + write_batch_size
+                self._add_records(
+                    collection,
+                    ids=pending["ids"][written:end],
+                    embeddings=embeddings[written:end],
+                    documents=pending["documents"][written:end],
+                    metadatas=pending["metadatas"][written:end]
+                )
+                written = min(end, len(pending["ids"]))
+            pending = {
+                "ids": pending["ids"][written:],
+                "embeddings": [embeddings[written:]] if written < len(embeddings) else [],
+                "documents": pending["documents"][written:],
+                "metadatas": pending["metadatas"][written:]
+            }
+        
+        for batch in _batched(documents, batch_size):
+            pending["embeddings"].append(self.embed_batch([doc.content for doc in batch], model_name))
+            pending["ids"].extend(doc.id or str(uuid.uuid4()) for doc in batch)
+            pending["documents"].extend(doc.content for doc in batch)
+            pending["metadatas"].extend(doc.metadata or None for doc in batch)
+            total += len(batch)
+            if len(pending["ids"]) >= write_batch_size:
+                flush()
+        flush(final=True)
+        
+        elapsed = time.perf_counter() - start
+        rate = total / elapsed if elapsed > 0 else 0.0
+        logger.info(f"Bulk added {total} documents to collection {collection.name} in {elapsed:.2f}s ({rate:.1f} docs/sec)")
+        
+        return {
+            "documents": total,
+            "seconds": elapsed,
+            "docs_per_second": rate
+        }
+
+    def ingest_files(
+        self,
+        paths: Union[str, Path, Iterable[Union[str, Path]]],
+        collection_name: Optional[str] = None,
+        pattern: str = "*.md",
+        metadata: Optional[Dict[str, str]] = None
+    ) -> Dict[str, float]:
+        """Chunk files lazily and bulk-add the chunks with offset provenance
+        
+        Files are read block by block, so large transcripts are never fully
+        loaded. Chunk ids are "<source>#<chunk_index>".
+        
+        Args:
+            paths: A file, a directory searched with pattern, or an iterable of files
+            collection_name: Collection to add to, defaults to research_sections
+            pattern: Glob used when paths is a directory
+            metadata: Extra metadata stored on every chunk
+            
+        Returns:
+            Bulk ingest statistics from add_documents_bulk
+        """
+        if isinstance(paths, (str, Path)):
+            root = Path(paths)
+            chunks = (self.chunker.chunk_directory(root, pattern) if root.is_dir()
+                      else self.chunker.chunk_file(root))
+        else:
+            chunks = (chunk for path in paths for chunk in self.chunker.chunk_file(path))
+            
+        documents = (
+            Document(
+                content=chunk.text,
+                metadata={**(metadata or {}), **chunk.to_metadata()},
+                id=f"{chunk.source}#{chunk.index}"
+            )
+            for chunk in chunks
+        )
+        return self.add_documents_bulk(documents, collection_name=collection_name)
+
     def query_similar(
         self, 
         collection_name: str, 
@@ -434,27 +1491,108 @@ class VectorStore:
         Returns:
             List of dictionaries containing matched documents and their metadata
         """
-        collection = self.client.get_collection(collection_name)
-        query_embedding = self.embed([query]).tolist()
+        return self.query_many([query], k=n_results, where=where, collection_name=collection_name)[0]
         
-        # Perform query
-        results = collection.query(
-            query_embeddings=query_embedding,
-            n_results=n_results,
-            where=where
-        )
+    def query_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        where: Optional[Dict] = None,
+        collection_name: Optional[str] = None
+    ) -> List[List[Dict]]:
+        """Query many texts with one embedding batch and one collection query
         
-        # Format results
-        formatted_results = []
-        for i in range(len(results['ids'][0])):
-            formatted_results.append({
-                'id': results['ids'][0][i],
-                'content': results['documents'][0][i],
-                'metadata': results['metadatas'][0][i],
-                'distance': results['distances'][0][i]
-            })
-            
-        return formatted_results
+        Args:
+            queries: Query texts
+            k: Number of results per query
+            where: Optional filter criteria applied to every query
+            collection_name: Collection to query, defaults to research_sections
+            
+        Returns:
+            One result list per query, aligned with the input order, in the
+            query_similar format. Queries found in the result cache are not
+            embedded or sent to the collection.
+        """
+        if not queries:
+            return []
+        collection = self._get_collection(collection_name)
+        keys, found, missing = self._cached_queries(collection.name, queries, k, where)
+        if missing:
+            results = collection.query(
+                query_embeddings=self.embed([queries[i] for i in missing], self._model_for(collection)),
+                n_results=k,
+                where=where
+            )
+            self._fill_cached_queries(results, keys, found, missing)
+        return found
+        
+    async def aquery_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        where: Optional[Dict] = None,
+        collection_name: Optional[str] = None
+    ) -> List[List[Dict]]:
+        """Async query_many: embedding and the Chroma query run off the event loop"""
+        if not queries:
+            return []
+        collection = self._get_collection(collection_name)
+        keys, found, missing = self._cached_queries(collection.name, queries, k, where)
+        if missing:
+            embeddings = await self.aembed([queries[i] for i in missing], self._model_for(collection))
+            results = await self._run_io(
+                collection.query,
+                query_embeddings=embeddings,
+                n_results=k,
+                where=where
+            )
+            self._fill_cached_queries(results, keys, found, missing)
+        return found
+        
+    def _cached_queries(
+        self,
+        collection_name: str,
+        queries: List[str],
+        k: int,
+        where: Optional[Dict]
+    ) -> Tuple[List[Tuple], List[Optional[List[Dict]]], List[int]]:
+        """Look queries up in the result cache
+        
+        Returns:
+            (cache keys, cached result or None per query, indexes of misses)
+        """
+        keys = [self.query_cache.key(collection_name, query, k, where, "query") for query in queries]
+        found = []
+        for key in keys:
+            cached = self.query_cache.get(key)
+            found.append(list(cached) if cached is not None else None)
+        return keys, found, [i for i, cached in enumerate(found) if cached is None]
+        
+    def _fill_cached_queries(
+        self,
+        results: Dict[str, List[List[Any]]],
+        keys: List[Tuple],
+        found: List[Optional[List[Dict]]],
+        missing: List[int]
+    ) -> None:
+        """Format fresh results into their slots and cache them"""
+        for row, i in enumerate(missing):
+            found[i] = self._format_results(results, row)
+            self.query_cache.put(keys[i], found[i])
+            found[i] = list(found[i])
+        
+    @staticmethod
+    def _format_results(results: Dict[str, List[List[Any]]], query_index: int) -> List[Dict]:
+        """Format one query's Chroma results as id/content/metadata/distance dicts"""
+        return [
+            {
+                'id': doc_id,
+                'content': results['documents'][query_index][i],
+                'metadata': results['metadatas'][query_index][i],
+                'distance': results['distances'][query_index][i]
+            }
+            for i, doc_id in enumerate(results['ids'][query_index])
+        ]
     
     def get_collection_stats(self, collection_name: str) -> Dict:
         """Get statistics about a collection
@@ -465,7 +1603,7 @@ class VectorStore:
         Returns:
             Dictionary with collection statistics
         """
-        collection = self.client.get_collection(collection_name)
+        collection = self._get_collection(collection_name)
         return {
             'name': collection_name,
             'count': collection.count()
@@ -477,9 +1615,107 @@ class VectorStore:
         
     def delete_collection(self, collection_name: str) -> None:
         """Delete a collection from the database"""
+        collection_name = self.resolve_collection_name(collection_name)
         self.client.delete_collection(collection_name)
+        self.query_cache.invalidate(collection_name)
+        if self.sparse_index is not None:
+            self.sparse_index.delete_collection(collection_name)
+        if self.near_duplicates is not None:
+            self.near_duplicates.delete_collection(collection_name)
         print(f"Deleted collection: {collection_name}")
+        
+    def delete_documents(self, ids: List[str], collection_name: Optional[str] = None) -> None:
+        """Delete documents by id from a collection and the keyword index"""
+        if not ids:
+            return
+        with self._collection_lock:
+            collection = self._get_collection(collection_name)
+            collection.delete(ids=list(ids))
+            self.query_cache.invalidate(collection.name)
+            if self.sparse_index is not None:
+                self.sparse_index.delete(collection.name, list(ids))
+            if self.near_duplicates is not None:
+                self.near_duplicates.delete(collection.name, list(ids))
+            mirror = self._mirrors.get(collection.name)
+            if mirror is not None:
+                shadow = mirror[0]
+                shadow.delete(ids=list(ids))
+                self.query_cache.invalidate(shadow.name)
+                if self.sparse_index is not None:
+                    self.sparse_index.delete(shadow.name, list(ids))
+                if self.near_duplicates is not None:
+                    self.near_duplicates.delete(shadow.name, list(ids))
 
+    def export_snapshot(self, collection_name: str, path: Union[str, Path]) -> Dict[str, Any]:
+        """Write a collection to a columnar snapshot directory
+        
+        Args:
+            collection_name: Collection to export
+            path: Snapshot directory (embeddings.npy, records.arrow, snapshot.json)
+            
+        Returns:
+            Snapshot manifest
+        """
+        start = time.perf_counter()
+        collection = self._get_collection(collection_name)
+        records = collection.get(include=["embeddings", "documents", "metadatas"])
+        manifest = write_snapshot(
+            Path(path),
+            collection.name,
+            records["ids"],
+            records["embeddings"],
+            records["documents"],
+            records["metadatas"],
+            collection.metadata
+        )
+        logger.info(f"Exported {manifest['count']} records from {collection.name} to {path} "
+                    f"in {time.perf_counter() - start:.2f}s")
+        return manifest
+        
+    def load_snapshot(
+        self,
+        path: Union[str, Path],
+        collection_name: Optional[str] = None,
+        index_keywords: bool = False
+    ):
+        """Open a snapshot as a new collection
+        
+        On the numpy backend the snapshot is mounted in place: embeddings and
+        records stay memory-mapped, so opening is independent of corpus size.
+        Writes to a mounted collection stay in memory. On Chroma the records
+        are imported with write_batch_size add calls.
+        
+        Args:
+            path: Snapshot directory written by export_snapshot
+            collection_name: Name for the collection, defaults to the exported name
+            index_keywords: Also add the documents to the BM25 index (always done on Chroma)
+            
+        Returns:
+            The new collection
+        """
+        start = time.perf_counter()
+        snapshot = read_snapshot(Path(path))
+        name = collection_name or snapshot.name
+        if self.backend == "numpy":
+            collection = self.client.mount_snapshot(snapshot, name)
+            if index_keywords and self.sparse_index is not None:
+                self.sparse_index.add(name, snapshot.ids, list(snapshot.documents))
+            self.query_cache.invalidate(name)
+        else:
+            collection = self.client.create_collection(name=name, metadata=snapshot.metadata or None)
+            for begin in range(0, len(snapshot), self.write_batch_size):
+                end = begin + self.write_batch_size
+                self._add_records(
+                    collection,
+                    ids=snapshot.ids[begin:end],
+                    embeddings=np.asarray(snapshot.embeddings[begin:end]),
+                    documents=snapshot.documents[begin:end],
+                    metadatas=snapshot.metadatas[begin:end]
+                )
+        logger.info(f"Loaded snapshot {path} into {name} ({len(snapshot)} records) "
+                    f"in {time.perf_counter() - start:.3f}s")
+        return collection
+        
     def _sanitize_metadata(self, metadata: Dict) -> Dict:
         """
         Sanitize metadata to ensure it's compatible with ChromaDB.